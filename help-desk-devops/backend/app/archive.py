@@ -0,0 +1,246 @@
+"""
+Archivage des tickets clos et lecture des archives.
+
+Les tickets ``resolved`` ou ``closed`` sans modification depuis
+``ARCHIVE_AFTER_DAYS`` jours sont déplacés, avec leurs commentaires, de
+``tickets`` / ``comments`` vers ``tickets_archive`` / ``comments_archive`` :
+les index des tables actives (statut, priorité, dates), qui servent la liste
+et ses filtres, ne portent plus que les tickets vivants.
+
+Sous PostgreSQL, les archives sont partitionnées par mois de création du
+ticket ; les partitions manquantes sont créées avant chaque lot.
+
+Le déplacement se fait par lots de ``ARCHIVE_BATCH_SIZE`` tickets, chacun
+dans une transaction courte. ``FOR UPDATE SKIP LOCKED`` écarte les tickets
+en cours de modification (repris au passage suivant) au lieu de les attendre.
+
+Le détail et les commentaires d'un ticket archivé restent lisibles aux mêmes
+URLs, en lecture seule ; la liste, la recherche et l'export du fil ne
+portent que sur les tickets actifs. Les statistiques comptent les deux.
+
+    python -m app.archive                           # un passage complet
+    python -m app.archive --older-than 180 --dry-run
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, literal, select, text
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from starlette.concurrency import run_in_threadpool
+
+from app import queries
+from app.database import SessionLocal
+from app.events import publish, tickets_changed_event
+from app.models import ArchivedComment, ArchivedTicket, Comment, Ticket, TicketStatus
+from app.pagination import keyset_page
+from app.search import delete_ticket_comments
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+# Pause entre deux lots (secondes) : laisse passer les écritures concurrentes
+ARCHIVE_PAUSE = float(os.getenv("ARCHIVE_PAUSE", "0.1"))
+# Intervalle de l'archivage périodique dans les workers (secondes ; 0 = désactivé)
+ARCHIVE_INTERVAL = int(os.getenv("ARCHIVE_INTERVAL", "0"))
+
+ARCHIVED_STATUSES = (TicketStatus.RESOLVED, TicketStatus.CLOSED)
+
+TICKET_COLUMNS = (
+    "id", "created_at", "title", "description", "status", "priority",
+    "creator_id", "assigned_to_id", "updated_at", "resolved_at",
+)
+COMMENT_COLUMNS = ("id", "content", "ticket_id", "author_id", "created_at", "updated_at")
+
+
+# ============ Partitions (PostgreSQL) ============
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def ensure_partitions(db: Session, months: Iterable[datetime]) -> None:
+    """Créer les partitions mensuelles manquantes des deux tables d'archive."""
+    for start in sorted(set(months)):
+        end = month_start(start + timedelta(days=32))
+        for table in ("tickets_archive", "comments_archive"):
+            db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {table}_p{start:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+            ))
+
+
+# ============ Archivage ============
+
+def archivable(cutoff: datetime):
+    """Tickets clos inactifs depuis ``cutoff`` (index ``(status, updated_at, id)``)."""
+    return (
+        select(Ticket.id, Ticket.created_at)
+        .where(
+            Ticket.status.in_(ARCHIVED_STATUSES),
+            Ticket.updated_at < cutoff,
+            Ticket.created_at.isnot(None),
+        )
+    )
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Déplacer un lot de tickets clos et de leurs commentaires vers les
+    archives, dans une transaction. Retourne le nombre de tickets déplacés.
+    """
+    rows = db.execute(
+        archivable(cutoff).limit(batch_size).with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        db.rollback()
+        return 0
+    ids = [row.id for row in rows]
+
+    if db.get_bind().dialect.name == "postgresql":
+        ensure_partitions(db, (month_start(row.created_at) for row in rows))
+
+    db.execute(insert(ArchivedTicket).from_select(
+        [*TICKET_COLUMNS, "archived_at"],
+        select(*(getattr(Ticket, name) for name in TICKET_COLUMNS), literal(datetime.utcnow()))
+        .where(Ticket.id.in_(ids)),
+    ))
+    db.execute(insert(ArchivedComment).from_select(
+        [*COMMENT_COLUMNS, "ticket_created_at"],
+        select(*(getattr(Comment, name) for name in COMMENT_COLUMNS), Ticket.created_at)
+        .join(Ticket, Ticket.id == Comment.ticket_id)
+        .where(Comment.ticket_id.in_(ids)),
+    ))
+    # Hors flush : les compteurs de statistiques continuent de compter les tickets archivés
+    delete_ticket_comments(db, ids)
+    db.execute(
+        delete(Ticket).where(Ticket.id.in_(ids)),
+        execution_options={"synchronize_session": False},
+    )
+    db.commit()
+    # Listes et caches de réponses à relire
+    publish(db, tickets_changed_event(len(ids)))
+    return len(ids)
+
+
+def archive_closed_tickets(
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    pause: float = ARCHIVE_PAUSE,
+    max_batches: Optional[int] = None,
+) -> int:
+    """Archiver par lots tous les tickets éligibles ; retourne le nombre de tickets déplacés."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        db = SessionLocal()
+        try:
+            moved = archive_batch(db, cutoff, batch_size)
+        finally:
+            db.close()
+        archived += moved
+        batches += 1
+        if moved < batch_size:
+            break
+        time.sleep(pause)
+    if archived:
+        logger.info("archive: %d ticket(s) archivé(s) en %d lot(s)", archived, batches)
+    return archived
+
+
+async def archive_periodically(interval: float = ARCHIVE_INTERVAL) -> None:
+    """Archiver au démarrage puis toutes les ``interval`` secondes."""
+    while True:
+        try:
+            await run_in_threadpool(archive_closed_tickets)
+        except Exception:
+            logger.exception("archive: échec de l'archivage")
+        await asyncio.sleep(interval)
+
+
+# ============ Lecture ============
+
+def archived_ticket_version(
+    db: Session, ticket_id: int
+) -> Optional[Tuple[ArchivedTicket, int, Optional[datetime]]]:
+    """
+    Ticket archivé (prêt pour ``TicketResponse``) et version de ses
+    commentaires, comme ``ticket_with_version``.
+    """
+    ticket = (
+        db.query(ArchivedTicket)
+        .options(joinedload(ArchivedTicket.creator), joinedload(ArchivedTicket.assigned_to))
+        .filter(ArchivedTicket.id == ticket_id)
+        .first()
+    )
+    if ticket is None:
+        return None
+    comment_count, last_comment_at = (
+        db.query(func.count(ArchivedComment.id), func.max(ArchivedComment.updated_at))
+        .filter(
+            ArchivedComment.ticket_id == ticket.id,
+            ArchivedComment.ticket_created_at == ticket.created_at,
+        )
+        .one()
+    )
+    return ticket, comment_count, last_comment_at
+
+
+def archived_comment_page(db: Session, ticket: ArchivedTicket, cursor: Optional[str], limit: int):
+    """Page des commentaires d'un ticket archivé (partition du ticket seulement)."""
+    return keyset_page(
+        db.query(ArchivedComment)
+        .options(joinedload(ArchivedComment.author))
+        .filter(
+            ArchivedComment.ticket_id == ticket.id,
+            ArchivedComment.ticket_created_at == ticket.created_at,
+        ),
+        ArchivedComment.created_at, ArchivedComment.id, cursor, limit, descending=False,
+    )
+
+
+def archived_ticket_detail(db: Session, ticket_id: int):
+    """Équivalent de ``queries.ticket_detail`` pour un ticket archivé."""
+    row = archived_ticket_version(db, ticket_id)
+    if row is None:
+        return None
+    ticket, comment_count, last_comment_at = row
+    comments, next_cursor = archived_comment_page(db, ticket, None, queries.TICKET_COMMENTS_LIMIT)
+    set_committed_value(ticket, "comments", comments)
+    ticket.comment_count = comment_count
+    ticket.comments_next_cursor = next_cursor
+    return ticket, comment_count, last_comment_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archiver les tickets clos inactifs.")
+    parser.add_argument(
+        "--older-than", type=int, default=ARCHIVE_AFTER_DAYS, help="Jours sans modification"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="Tickets par transaction"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Compter les tickets éligibles sans les déplacer"
+    )
+    args = parser.parse_args()
+
+    if args.dry_run:
+        cutoff = datetime.utcnow() - timedelta(days=args.older_than)
+        with SessionLocal() as db:
+            count = db.scalar(select(func.count()).select_from(archivable(cutoff).subquery()))
+        print(f"{count} ticket(s) à archiver")
+        return
+    logging.basicConfig(level=logging.INFO)
+    print(f"{archive_closed_tickets(args.older_than, args.batch_size)} ticket(s) archivé(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,30 +2,79 @@
 Gestion de l'authentification JWT et des mots de passe.
 """
 import os
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from app.database import SessionLocal, get_db, get_async_db
 from app.models import User
+from app.hashing import pwd_context
+from app.cache import TTLCache
+from app.metrics import current_request_stats
+from app.profiling import PROFILE_HEADER
 
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Contexte de hachage des mots de passe
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Cache des utilisateurs authentifiés (par processus)
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
 
 # Schéma de sécurité HTTP Bearer
 security = HTTPBearer()
 
 
+@dataclass(frozen=True)
+class Principal:
+    """Données minimales de l'utilisateur authentifié, mises en cache."""
+    id: int
+    is_active: bool
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, is_active=bool(user.is_active), is_admin=bool(user.is_admin))
+
+
+# Utilisateur par id, et id utilisateur par token déjà vérifié (jusqu'à son exp)
+principal_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target: User) -> None:
+    """Retirer du cache un utilisateur modifié ou supprimé via l'ORM."""
+    principal_cache.invalidate(target.id)
+    # Au flush, une requête concurrente peut encore relire l'ancienne ligne :
+    # invalider de nouveau après le commit
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("invalidated_users", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for user_id in session.info.pop("invalidated_users", ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidated(session: Session) -> None:
+    session.info.pop("invalidated_users", None)
+
+
 def hash_password(password: str) -> str:
-    """Hacher un mot de passe."""
+    """Hacher un mot de passe (dans le thread courant, cf. app.hashing pour les routes)."""
     return pwd_context.hash(password)
 
 
@@ -60,44 +109,146 @@ def verify_token(token: str) -> dict:
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Obtenir l'utilisateur actuel à partir du token JWT."""
-    token = credentials.credentials
+def _user_id_from_token(token: str) -> int:
+    """
+    Extraire l'identifiant utilisateur d'un token JWT.
+
+    Le résultat de la vérification de signature est mémorisé par token
+    jusqu'à son expiration.
+    """
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+    
     payload = verify_token(token)
     
-    user_id: int = payload.get("sub")
-    if user_id is None:
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
         )
-    
-    user = db.query(User).filter(User.id == user_id).first()
+    expires_at = payload.get("exp")
+    # Sans exp, le token n'expire pas : durée par défaut du cache
+    ttl = expires_at - time.time() if expires_at is not None else None
+    token_cache.set(token, user_id, ttl=ttl)
+    return user_id
+
+
+def _principal_for(user: Optional[User]) -> Principal:
+    """Mettre en cache l'utilisateur chargé, ou refuser s'il n'existe pas."""
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
-    
-    if not user.is_active:
+    principal = Principal.from_user(user)
+    principal_cache.set(principal.id, principal)
+    return principal
+
+
+def _ensure_active(principal: Principal) -> Principal:
+    """Vérifier que l'utilisateur est actif."""
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User is inactive",
         )
-    
-    return user
+    return principal
 
 
-async def get_current_admin(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    """Obtenir l'utilisateur actuel et vérifier qu'il est administrateur."""
-    if not current_user.is_admin:
+def _ensure_admin(principal: Principal) -> Principal:
+    if not principal.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to access this resource",
         )
-    return current_user
+    return principal
+
+
+def _apply_sql_profile(request: Request, principal: Principal) -> None:
+    """Activer le profil SQL de la requête si un administrateur le demande."""
+    if principal.is_admin and request.headers.get(PROFILE_HEADER) == "1":
+        stats = current_request_stats()
+        if stats is not None:
+            stats.profiled = True
+
+
+def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Obtenir l'utilisateur actuel à partir du token JWT.
+
+    L'utilisateur est lu dans ``principal_cache`` ; la base n'est interrogée
+    qu'en cas d'absence ou d'expiration de l'entrée. Dépendance synchrone :
+    FastAPI l'exécute dans le pool de threads.
+    """
+    user_id = _user_id_from_token(credentials.credentials)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = _principal_for(db.query(User).filter(User.id == user_id).first())
+    principal = _ensure_active(principal)
+    _apply_sql_profile(request, principal)
+    # Auteur des écritures de la session de la route (lecture de ses écritures, cf. app.replicas)
+    db.info["principal_id"] = principal.id
+    return principal
+
+
+async def get_current_user_async(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Obtenir l'utilisateur actuel via la session asynchrone."""
+    user_id = _user_id_from_token(credentials.credentials)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = _principal_for(await db.get(User, user_id))
+    principal = _ensure_active(principal)
+    _apply_sql_profile(request, principal)
+    db.info["principal_id"] = principal.id
+    return principal
+
+
+def get_current_user_detached(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> Principal:
+    """
+    Obtenir l'utilisateur actuel sans retenir de session.
+
+    Pour les réponses longues (flux d'événements) : ``get_db`` garderait une
+    connexion du pool jusqu'à la fin de la réponse. En cas d'absence du cache,
+    une session est ouverte et refermée immédiatement.
+    """
+    user_id = _user_id_from_token(credentials.credentials)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        db = SessionLocal()
+        try:
+            principal = _principal_for(db.get(User, user_id))
+        finally:
+            db.close()
+    return _ensure_active(principal)
+
+
+async def get_current_admin(
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
+    """
+    Obtenir l'utilisateur actuel et vérifier qu'il est administrateur.
+
+    L'en-tête ``X-SQL-Profile`` est déjà pris en compte par
+    ``get_current_user`` : il ne l'est que pour un administrateur.
+    """
+    return _ensure_admin(current_user)
+
+
+async def get_current_admin_async(
+    current_user: Principal = Depends(get_current_user_async),
+) -> Principal:
+    """Équivalent de ``get_current_admin`` pour la pile asynchrone."""
+    return _ensure_admin(current_user)
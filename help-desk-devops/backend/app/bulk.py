@@ -0,0 +1,191 @@
+"""
+Opérations par lot sur les tickets (création, mise à jour, assignation).
+
+Chaque élément est validé séparément et reçoit son propre résultat ; les
+éléments valides sont écrits dans une seule transaction : un INSERT
+multi-lignes ... RETURNING pour la création, un UPDATE exécuté en
+executemany pour les mises à jour. Ces écritures ne passent pas par le flush
+de la session : les compteurs de statistiques sont ajustés explicitement.
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import status
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+from app.auth import Principal
+from app.events import publish, tickets_changed_event
+from app.models import Ticket, TicketPriority, TicketStatus, User
+from app.schemas import TicketBatchUpdateItem, TicketCreate
+from app.stats import adjust_counters, counter_key
+
+# Champs de TicketUpdate appliqués lorsqu'ils sont renseignés
+UPDATABLE_FIELDS = ("title", "description", "status", "priority", "assigned_to_id")
+
+
+def _result(index: int, code: int, ticket_id: Optional[int] = None, detail: Any = None) -> dict:
+    return {"index": index, "id": ticket_id, "status": code, "detail": detail}
+
+
+def _summary(results: List[dict]) -> dict:
+    succeeded = sum(1 for result in results if result["status"] < 400)
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+
+def _insert_returning_ids(db: Session, rows: List[dict]) -> List[int]:
+    """
+    Insérer des tickets en INSERT multi-lignes et retourner leurs ids dans
+    l'ordre des lignes.
+
+    PostgreSQL garantit l'ordre de RETURNING via la colonne auto-incrémentée
+    (``sort_by_parameter_order``). SQLite ne le permet pas et SQLAlchemy
+    reviendrait à un INSERT par ligne : l'INSERT multi-lignes est conservé et
+    les ids, alloués séquentiellement sous le verrou d'écriture, sont triés.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        returning = insert(Ticket).returning(Ticket.id, sort_by_parameter_order=True)
+        return db.scalars(returning, rows).all()
+    return sorted(db.scalars(insert(Ticket).returning(Ticket.id), rows).all())
+
+
+def create_tickets(db: Session, items: List[Dict[str, Any]], creator_id: int) -> dict:
+    """Créer un lot de tickets en un INSERT multi-lignes."""
+    results: List[Optional[dict]] = [None] * len(items)
+    now = datetime.utcnow()
+    rows, indexes = [], []
+    for index, item in enumerate(items):
+        try:
+            data = TicketCreate.model_validate(item)
+        except ValidationError as exc:
+            results[index] = _result(
+                index, status.HTTP_422_UNPROCESSABLE_ENTITY, detail=exc.errors(include_url=False)
+            )
+            continue
+        rows.append({
+            "title": data.title,
+            "description": data.description,
+            "priority": TicketPriority(data.priority),
+            "status": TicketStatus.OPEN,
+            "creator_id": creator_id,
+            "created_at": now,
+            "updated_at": now,
+        })
+        indexes.append(index)
+
+    if rows:
+        ids = _insert_returning_ids(db, rows)
+        adjust_counters(
+            db, Counter(counter_key(row["status"], row["priority"], None) for row in rows)
+        )
+        db.commit()
+        publish(db, tickets_changed_event(len(ids)))
+        for index, ticket_id in zip(indexes, ids):
+            results[index] = _result(index, status.HTTP_201_CREATED, ticket_id)
+    return _summary(results)
+
+
+def update_tickets(db: Session, items: List[Dict[str, Any]], current_user: Principal) -> dict:
+    """
+    Mettre à jour un lot de tickets en un UPDATE executemany.
+
+    Mêmes règles que la mise à jour unitaire : créateur ou administrateur,
+    ``resolved_at`` renseigné au passage à « resolved ».
+    """
+    results: List[Optional[dict]] = [None] * len(items)
+    updates: Dict[int, tuple] = {}
+    for index, item in enumerate(items):
+        try:
+            data = TicketBatchUpdateItem.model_validate(item)
+        except ValidationError as exc:
+            results[index] = _result(
+                index, status.HTTP_422_UNPROCESSABLE_ENTITY, detail=exc.errors(include_url=False)
+            )
+            continue
+        if data.id in updates:
+            results[index] = _result(
+                index, status.HTTP_422_UNPROCESSABLE_ENTITY, data.id, "Duplicate ticket id in batch"
+            )
+            continue
+        updates[data.id] = (index, data)
+
+    # Lignes verrouillées (PostgreSQL) : les compteurs partent d'un état stable
+    existing = {
+        row.id: row
+        for row in db.execute(
+            select(
+                Ticket.id, Ticket.creator_id, Ticket.status, Ticket.priority,
+                Ticket.assigned_to_id,
+            )
+            .where(Ticket.id.in_(list(updates)))
+            .with_for_update()
+        )
+    }
+    assignees = {
+        data.assigned_to_id for _, data in updates.values() if data.assigned_to_id is not None
+    }
+    known_assignees = set()
+    if assignees:
+        known_assignees = set(db.scalars(select(User.id).where(User.id.in_(assignees))))
+
+    now = datetime.utcnow()
+    params, deltas = [], Counter()
+    for ticket_id, (index, data) in updates.items():
+        row = existing.get(ticket_id)
+        if row is None:
+            results[index] = _result(
+                index, status.HTTP_404_NOT_FOUND, ticket_id, "Ticket not found"
+            )
+            continue
+        if row.creator_id != current_user.id and not current_user.is_admin:
+            results[index] = _result(
+                index, status.HTTP_403_FORBIDDEN, ticket_id,
+                "You do not have permission to update this ticket",
+            )
+            continue
+        if data.assigned_to_id is not None and data.assigned_to_id not in known_assignees:
+            results[index] = _result(
+                index, status.HTTP_422_UNPROCESSABLE_ENTITY, ticket_id, "Assignee not found"
+            )
+            continue
+
+        values = {
+            field: getattr(data, field)
+            for field in UPDATABLE_FIELDS
+            if getattr(data, field) is not None
+        }
+        if "status" in values:
+            values["status"] = TicketStatus(values["status"])
+            if values["status"] == TicketStatus.RESOLVED:
+                values["resolved_at"] = now
+        if "priority" in values:
+            values["priority"] = TicketPriority(values["priority"])
+        params.append({"id": ticket_id, "updated_at": now, **values})
+
+        before = counter_key(row.status, row.priority, row.assigned_to_id)
+        after = counter_key(
+            values.get("status", row.status),
+            values.get("priority", row.priority),
+            values.get("assigned_to_id", row.assigned_to_id),
+        )
+        if before != after:
+            deltas[before] -= 1
+            deltas[after] += 1
+        results[index] = _result(index, status.HTTP_200_OK, ticket_id)
+
+    if params:
+        db.execute(update(Ticket), params)
+        adjust_counters(db, deltas)
+        db.commit()
+        publish(db, tickets_changed_event(len(params)))
+    else:
+        db.rollback()
+    return _summary(results)
+
+
+def assign_tickets(
+    db: Session, ticket_ids: List[int], assigned_to_id: int, current_user: Principal
+) -> dict:
+    """Assigner un lot de tickets au même agent."""
+    items = [{"id": ticket_id, "assigned_to_id": assigned_to_id} for ticket_id in ticket_ids]
+    return update_tickets(db, items, current_user)
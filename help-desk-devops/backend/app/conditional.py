@@ -0,0 +1,113 @@
+"""
+Requêtes conditionnelles : ETag faibles et ``Last-Modified``.
+
+La version d'un ticket est dérivée de ``Ticket.updated_at`` et du nombre et
+de la date du dernier commentaire. Sur ``If-None-Match``, cette version est
+lue par une seule requête agrégée, sans charger les relations ni sérialiser
+la réponse ; sans en-tête conditionnel, elle est lue avec le ticket
+(``comment_version_columns``), les commentaires n'étant chargés que par page.
+
+Les changements d'un utilisateur lié (nom du créateur, de l'assigné...) ne
+modifient pas la version : les validateurs sont donc faibles.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Response, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models import Ticket, Comment
+
+# Le navigateur doit revalider à chaque lecture (réponse propre à l'utilisateur)
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts) -> str:
+    """ETag faible à partir de valeurs quelconques."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:24]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparaison faible d'``If-None-Match`` avec l'ETag courant."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def http_date(value: datetime) -> str:
+    """Date HTTP (RFC 9110) d'un horodatage UTC naïf."""
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def modified_since(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    """Indiquer si la ressource a changé depuis ``If-Modified-Since``."""
+    if not if_modified_since:
+        return True
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return True
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) > since
+
+
+def not_modified(headers: dict) -> Response:
+    """Réponse 304 portant les validateurs courants."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    """En-têtes de validation d'une réponse."""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def _ticket_version_etag(
+    resource: str, ticket_id: int, updated_at, comment_count: int, last_comment_at
+) -> str:
+    return weak_etag(resource, ticket_id, updated_at, comment_count, last_comment_at)
+
+
+def ticket_etag(db: Session, resource: str, ticket_id: int) -> Optional[str]:
+    """
+    ETag d'un ticket lu par une requête agrégée, sans charger ses relations.
+
+    Retourne ``None`` si le ticket n'existe pas.
+    """
+    row = db.execute(
+        select(Ticket.updated_at, func.count(Comment.id), func.max(Comment.updated_at))
+        .outerjoin(Comment, Comment.ticket_id == Ticket.id)
+        .where(Ticket.id == ticket_id)
+        .group_by(Ticket.id, Ticket.updated_at)
+    ).first()
+    if row is None:
+        return None
+    return _ticket_version_etag(resource, ticket_id, *row)
+
+
+def comment_version_columns() -> tuple:
+    """Nombre de commentaires et date du dernier, en sous-requêtes corrélées à ``Ticket``."""
+    return (
+        select(func.count(Comment.id)).where(Comment.ticket_id == Ticket.id)
+        .correlate(Ticket).scalar_subquery().label("comment_count"),
+        select(func.max(Comment.updated_at)).where(Comment.ticket_id == Ticket.id)
+        .correlate(Ticket).scalar_subquery().label("last_comment_at"),
+    )
+
+
+def loaded_ticket_etag(resource: str, ticket: Ticket, comment_count: int, last_comment_at) -> str:
+    """ETag d'un ticket dont la version des commentaires a été lue avec lui."""
+    return _ticket_version_etag(
+        resource, ticket.id, ticket.updated_at, comment_count, last_comment_at
+    )
@@ -0,0 +1,267 @@
+"""
+Flux des changements de tickets, diffusé en Server-Sent Events.
+
+Les routes d'écriture publient un événement compact après validation de la
+transaction. Sous PostgreSQL, l'événement passe par ``NOTIFY`` : chaque
+worker uvicorn écoute le canal (``LISTEN``) dans un thread dédié et relaie
+les notifications à ses propres abonnés, y compris celles qu'il a émises.
+Sur les autres bases (un seul processus), l'événement est diffusé
+directement aux abonnés du processus.
+
+Un abonné trop lent pour suivre le flux reçoit un événement ``resync`` et
+doit recharger la liste.
+"""
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from typing import AsyncIterator, Callable, List, Optional, Set
+from sqlalchemy import func
+from sqlalchemy.engine import make_url
+from sqlalchemy import select as sql_select
+from sqlalchemy.orm import Session
+from app.database import DATABASE_URL, get_engine
+from app.schemas import TicketListResponse
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "ticket_events")
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+STREAM_KEEPALIVE = float(os.getenv("STREAM_KEEPALIVE", "15"))
+# Délai de reconnexion suggéré au client (ms)
+STREAM_RETRY_MS = 3000
+# Limite de NOTIFY (8000 octets) moins une marge
+MAX_PAYLOAD_BYTES = 7900
+
+
+class Subscriber:
+    """File d'événements d'un client du flux, liée à sa boucle d'événements."""
+
+    def __init__(self, maxsize: int):
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def offer(self, payload: str) -> None:
+        """Ajouter un événement (dans la boucle de l'abonné)."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBroker:
+    """Diffusion des événements aux abonnés du processus."""
+
+    def __init__(self, queue_size: int = EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscriber] = set()
+        self._observers: List[Callable[[dict], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscriber:
+        """Créer un abonné (depuis la boucle d'événements de la requête)."""
+        subscriber = Subscriber(self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def observe(self, callback: Callable[[dict], None]) -> None:
+        """Appeler ``callback`` avec chaque événement diffusé, dans le thread de diffusion."""
+        self._observers.append(callback)
+
+    def dispatch(self, payload: str) -> None:
+        """Transmettre un événement à tous les abonnés ; appelable depuis tout thread."""
+        if self._observers:
+            event = json.loads(payload)
+            for observer in self._observers:
+                try:
+                    observer(event)
+                except Exception:
+                    logger.exception("events: observateur %r en échec", observer)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, payload)
+            except RuntimeError:
+                # Boucle fermée : le client est parti sans se désabonner
+                self.unsubscribe(subscriber)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+
+broker = EventBroker()
+
+
+# ============ Événements ============
+
+def ticket_event(kind: str, ticket) -> dict:
+    """Événement ``ticket.created`` / ``ticket.updated`` avec l'élément de liste."""
+    return {
+        "type": f"ticket.{kind}",
+        "ticket_id": ticket.id,
+        "ticket": TicketListResponse.model_validate(ticket).model_dump(mode="json"),
+    }
+
+
+def ticket_deleted_event(ticket_id: int) -> dict:
+    return {"type": "ticket.deleted", "ticket_id": ticket_id}
+
+
+def tickets_changed_event(count: int) -> dict:
+    """Événement ``tickets.changed`` d'une opération par lot (le client relit la liste)."""
+    return {"type": "tickets.changed", "count": count}
+
+
+def comment_event(comment) -> dict:
+    """Événement ``comment.created`` (sans le contenu, relu par le client)."""
+    return {
+        "type": "comment.created",
+        "ticket_id": comment.ticket_id,
+        "comment_id": comment.id,
+        "author_id": comment.author_id,
+    }
+
+
+def _encode(event: dict) -> str:
+    payload = json.dumps(event, separators=(",", ":"))
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        # Trop gros pour NOTIFY : le client relira le ticket
+        payload = json.dumps(
+            {k: v for k, v in event.items() if k != "ticket"}, separators=(",", ":")
+        )
+    return payload
+
+
+# Appelés par le worker qui publie, avant la diffusion (cf. app.response_cache)
+_publish_hooks: List[Callable[[Session, dict], None]] = []
+
+
+def on_publish(callback: Callable[[Session, dict], None]) -> None:
+    """Appeler ``callback(db, event)`` à chaque publication, dans le worker qui écrit."""
+    _publish_hooks.append(callback)
+
+
+def publish(db: Session, event: dict) -> None:
+    """
+    Publier un événement ; à appeler après le ``commit`` de l'écriture.
+
+    Sous PostgreSQL, ``pg_notify`` est validé dans sa propre transaction et
+    livré à tous les workers ; ailleurs, l'événement est diffusé localement.
+    """
+    for hook in _publish_hooks:
+        hook(db, event)
+    payload = _encode(event)
+    if db.get_bind().dialect.name != "postgresql":
+        broker.dispatch(payload)
+        return
+
+    # Les objets déjà chargés pour la réponse ne doivent pas être expirés
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.execute(sql_select(func.pg_notify(EVENTS_CHANNEL, payload)))
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+
+
+# ============ Flux SSE ============
+
+async def stream_events(
+    request, subscriber: Subscriber, keepalive: float = STREAM_KEEPALIVE
+) -> AsyncIterator[str]:
+    """Messages SSE d'un abonné, jusqu'à la déconnexion du client."""
+    try:
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        while not await request.is_disconnected():
+            if subscriber.overflowed:
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                subscriber.overflowed = False
+                yield 'data: {"type":"resync"}\n\n'
+                continue
+            try:
+                payload = await asyncio.wait_for(subscriber.queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                # Commentaire SSE : maintient la connexion à travers les proxys
+                yield ": keepalive\n\n"
+                continue
+            yield f"data: {payload}\n\n"
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+# ============ LISTEN PostgreSQL ============
+
+class PostgresListener(threading.Thread):
+    """Thread qui relaie au broker les notifications du canal des événements."""
+
+    def __init__(self, channel: str = EVENTS_CHANNEL, poll_interval: float = 1.0):
+        super().__init__(name="ticket-events-listener", daemon=True)
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._stopping = threading.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("events: écoute de %s interrompue, reconnexion", self.channel)
+                self._stopping.wait(STREAM_RETRY_MS / 1000)
+
+    def _listen(self) -> None:
+        # Connexion retirée du pool : elle reste ouverte tant que le thread écoute
+        connection = get_engine().raw_connection()
+        connection.detach()
+        try:
+            raw = connection.driver_connection
+            raw.rollback()
+            raw.autocommit = True
+            with raw.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            while not self._stopping.is_set():
+                if select.select([raw], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                raw.poll()
+                while raw.notifies:
+                    broker.dispatch(raw.notifies.pop(0).payload)
+        finally:
+            connection.close()
+
+
+_listener: Optional[PostgresListener] = None
+
+
+def start_listener() -> None:
+    """Démarrer l'écoute PostgreSQL du worker (sans effet sur les autres bases)."""
+    global _listener
+    # Dialecte lu dans l'URL : ne pas créer le moteur au démarrage
+    if make_url(DATABASE_URL).get_backend_name() != "postgresql" or _listener is not None:
+        return
+    _listener = PostgresListener()
+    _listener.start()
+
+
+def stop_listener() -> None:
+    """Arrêter l'écoute PostgreSQL du worker."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,185 @@
+"""
+Export en masse des tickets et de leurs commentaires (CSV ou NDJSON).
+
+Réservé aux administrateurs (``GET /api/tickets/export``), avec les filtres
+et le tri de la liste. Les tickets sont lus par un curseur serveur, par lots
+de ``EXPORT_BATCH_SIZE`` (``yield_per``), et les commentaires d'un lot en
+une requête : chaque lot est encodé et envoyé avant de lire le suivant, la
+mémoire ne dépend donc pas du nombre de tickets exportés.
+
+- NDJSON : un ticket par ligne, ses commentaires dans ``comments`` ;
+- CSV : une ligne par commentaire, précédée des colonnes du ticket (une
+  seule ligne, colonnes ``comment_*`` vides, pour un ticket sans
+  commentaire).
+
+Avec ``gzip=true``, le flux est compressé au fil de l'eau
+(``Content-Encoding: gzip``). Les tickets archivés (``app.archive``) ne sont
+pas exportés.
+
+Mesure : ``python -m benchmarks.export``.
+"""
+import csv
+import io
+import zlib
+from collections import defaultdict
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Literal, Sequence
+
+import orjson
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.filters import TicketFilters, apply_filters, sort_key
+from app.models import Comment, Ticket
+from app.queries import EXPORT_BATCH_SIZE
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+TICKET_COLUMNS = (
+    Ticket.id, Ticket.title, Ticket.description, Ticket.status, Ticket.priority,
+    Ticket.creator_id, Ticket.assigned_to_id, Ticket.created_at, Ticket.updated_at,
+    Ticket.resolved_at,
+)
+COMMENT_COLUMNS = (
+    Comment.id, Comment.author_id, Comment.content, Comment.created_at, Comment.updated_at,
+)
+
+TICKET_FIELDS = tuple(column.key for column in TICKET_COLUMNS)
+COMMENT_FIELDS = tuple(column.key for column in COMMENT_COLUMNS)
+CSV_HEADER = (*TICKET_FIELDS, *(f"comment_{name}" for name in COMMENT_FIELDS))
+
+
+def ticket_export_statement(filters: TicketFilters, dialect_name: str) -> Select:
+    """Tickets filtrés et triés comme la liste, lus par lots (curseur serveur)."""
+    key = sort_key(filters, dialect_name)
+    if filters.order == "desc":
+        order = (key.desc(), Ticket.id.desc())
+    else:
+        order = (key.asc(), Ticket.id.asc())
+    return (
+        apply_filters(select(*TICKET_COLUMNS), filters)
+        .order_by(*order)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def comments_statement(ticket_ids: Sequence[int]) -> Select:
+    """Commentaires d'un lot de tickets (index ``(ticket_id, created_at, id)``)."""
+    return (
+        select(Comment.ticket_id, *COMMENT_COLUMNS)
+        .where(Comment.ticket_id.in_(ticket_ids))
+        .order_by(Comment.ticket_id, Comment.created_at, Comment.id)
+    )
+
+
+def _by_ticket(rows: Iterable) -> Dict[int, List[tuple]]:
+    comments = defaultdict(list)
+    for row in rows:
+        comments[row[0]].append(row[1:])
+    return comments
+
+
+def _text(value):
+    """Valeur d'une cellule CSV (dates ISO 8601, énumérations par valeur)."""
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+def encode_ndjson(tickets: Sequence, comments: Dict[int, List[tuple]]) -> bytes:
+    """Un lot de tickets en NDJSON, commentaires imbriqués."""
+    return b"".join(
+        orjson.dumps({
+            **dict(zip(TICKET_FIELDS, ticket)),
+            "comments": [
+                dict(zip(COMMENT_FIELDS, comment)) for comment in comments.get(ticket.id, ())
+            ],
+        }) + b"\n"
+        for ticket in tickets
+    )
+
+
+def encode_csv(tickets: Sequence, comments: Dict[int, List[tuple]]) -> bytes:
+    """Un lot de tickets en CSV, une ligne par commentaire."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    empty = ("",) * len(COMMENT_FIELDS)
+    for ticket in tickets:
+        cells = [_text(value) for value in ticket]
+        for comment in comments.get(ticket.id) or (empty,):
+            writer.writerow([*cells, *(_text(value) for value in comment)])
+    return buffer.getvalue().encode()
+
+
+ENCODERS = {"ndjson": encode_ndjson, "csv": encode_csv}
+
+
+def _csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_HEADER)
+    return buffer.getvalue().encode()
+
+
+def export_tickets(
+    db: Session, filters: TicketFilters, fmt: ExportFormat, with_comments: bool = True
+) -> Iterator[bytes]:
+    """Export encodé, un lot de tickets à la fois."""
+    encode = ENCODERS[fmt]
+    if fmt == "csv":
+        yield _csv_header()
+    result = db.execute(ticket_export_statement(filters, db.get_bind().dialect.name))
+    for tickets in result.partitions():
+        comments = {}
+        if with_comments:
+            comments = _by_ticket(db.execute(comments_statement([ticket.id for ticket in tickets])))
+        yield encode(tickets, comments)
+
+
+async def export_tickets_async(
+    db: AsyncSession, filters: TicketFilters, fmt: ExportFormat, with_comments: bool = True
+) -> AsyncIterator[bytes]:
+    """Équivalent asynchrone de ``export_tickets``."""
+    encode = ENCODERS[fmt]
+    if fmt == "csv":
+        yield _csv_header()
+    result = await db.stream(ticket_export_statement(filters, db.get_bind().dialect.name))
+    async for tickets in result.partitions():
+        comments = {}
+        if with_comments:
+            statement = comments_statement([ticket.id for ticket in tickets])
+            comments = _by_ticket(await db.execute(statement))
+        yield encode(tickets, comments)
+
+
+# ============ Compression au fil de l'eau ============
+
+def _gzip():
+    # wbits=31 : en-tête et somme de contrôle gzip
+    return zlib.compressobj(6, zlib.DEFLATED, 31)
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compresser un flux, chaque lot étant envoyé dès qu'il est encodé."""
+    compressor = _gzip()
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def gzip_stream_async(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Équivalent asynchrone de ``gzip_stream``."""
+    compressor = _gzip()
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
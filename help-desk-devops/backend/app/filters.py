@@ -0,0 +1,117 @@
+"""
+Filtres et tri côté serveur pour la liste des tickets.
+
+Chaque combinaison de filtres supportée est servie par un index de
+``models.Ticket`` (voir ``__table_args__``) ; ``tests/test_filters.py``
+vérifie par EXPLAIN qu'aucune ne retombe sur un parcours séquentiel.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Integer, literal_column
+from sqlalchemy.orm import Query as OrmQuery
+from app.models import Ticket, TicketPriority, TicketStatus, PRIORITY_RANK_SQL
+
+SortField = Literal["created_at", "updated_at", "priority"]
+SortOrder = Literal["asc", "desc"]
+
+
+@dataclass(frozen=True)
+class TicketFilters:
+    """Critères de filtrage et de tri de la liste des tickets."""
+    status: Optional[TicketStatus] = None
+    priority: Optional[TicketPriority] = None
+    assigned_to_id: Optional[int] = None
+    creator_id: Optional[int] = None
+    unassigned: bool = False
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    sort: SortField = "created_at"
+    order: SortOrder = "desc"
+
+
+def ticket_filters(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    priority: Optional[TicketPriority] = Query(None),
+    assigned_to_id: Optional[int] = Query(None),
+    creator_id: Optional[int] = Query(None),
+    unassigned: bool = Query(False, description="Uniquement les tickets non assignés"),
+    created_after: Optional[datetime] = Query(None),
+    created_before: Optional[datetime] = Query(None),
+    updated_after: Optional[datetime] = Query(None),
+    updated_before: Optional[datetime] = Query(None),
+    sort: SortField = Query("created_at"),
+    order: SortOrder = Query("desc"),
+) -> TicketFilters:
+    """Dépendance : lire et valider les critères depuis la query string."""
+    status_enum = None
+    if status_filter:
+        try:
+            status_enum = TicketStatus(status_filter)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid status: {status_filter}"
+            )
+
+    if unassigned and assigned_to_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="unassigned and assigned_to_id are mutually exclusive"
+        )
+
+    return TicketFilters(
+        status=status_enum,
+        priority=priority,
+        assigned_to_id=assigned_to_id,
+        creator_id=creator_id,
+        unassigned=unassigned,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        sort=sort,
+        order=order,
+    )
+
+
+def apply_filters(query: OrmQuery, filters: TicketFilters) -> OrmQuery:
+    """Ajouter à une requête sur les tickets les conditions des filtres."""
+    if filters.status is not None:
+        query = query.filter(Ticket.status == filters.status)
+    if filters.priority is not None:
+        query = query.filter(Ticket.priority == filters.priority)
+    if filters.assigned_to_id is not None:
+        query = query.filter(Ticket.assigned_to_id == filters.assigned_to_id)
+    if filters.unassigned:
+        query = query.filter(Ticket.assigned_to_id.is_(None))
+    if filters.creator_id is not None:
+        query = query.filter(Ticket.creator_id == filters.creator_id)
+    if filters.created_after is not None:
+        query = query.filter(Ticket.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        query = query.filter(Ticket.created_at < filters.created_before)
+    if filters.updated_after is not None:
+        query = query.filter(Ticket.updated_at >= filters.updated_after)
+    if filters.updated_before is not None:
+        query = query.filter(Ticket.updated_at < filters.updated_before)
+    return query
+
+
+def sort_key(filters: TicketFilters, dialect_name: str):
+    """
+    Expression de tri des tickets.
+
+    Sous PostgreSQL, l'ENUM natif ``ticketpriority`` est ordonné dans l'ordre
+    de déclaration (low < ... < critical) et l'index sur ``priority`` sert le
+    tri. Ailleurs, la priorité est stockée en texte : l'expression indexée
+    ``PRIORITY_RANK_SQL`` rétablit l'ordre métier.
+    """
+    if filters.sort == "priority":
+        if dialect_name == "postgresql":
+            return Ticket.priority
+        return literal_column(PRIORITY_RANK_SQL.replace("priority", "tickets.priority", 1), Integer)
+    return getattr(Ticket, filters.sort)
@@ -0,0 +1,91 @@
+"""
+Hachage des mots de passe dans un pool de processus dédié.
+
+bcrypt coûte environ 250 ms de CPU au coût 12 : exécuté dans le pool de
+threads des requêtes, il occupe les workers et se dispute le GIL avec les
+autres routes. Les calculs sont confiés à un ``ProcessPoolExecutor`` borné ;
+lorsque la file est pleine, la requête est refusée (429) au lieu d'attendre.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+# Configuration
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "0")) or os.cpu_count() or 1
+HASH_QUEUE_SIZE = int(os.getenv("HASH_QUEUE_SIZE", "0")) or HASH_WORKERS * 4
+HASH_RETRY_AFTER = int(os.getenv("HASH_RETRY_AFTER", "1"))
+
+# Contexte de hachage des mots de passe ; un hachage de coût inférieur à
+# BCRYPT_ROUNDS est signalé par needs_update() et recalculé à la connexion
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Opérations en cours ou en attente dans le pool
+_slots = threading.BoundedSemaphore(HASH_QUEUE_SIZE)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Retourner le pool de processus (créé à la première utilisation)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+        return _executor
+
+
+def shutdown_executor() -> None:
+    """Arrêter le pool de processus (arrêt de l'application)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def _run(fn, *args):
+    """Exécuter un calcul bcrypt dans le pool, ou refuser si la file est pleine."""
+    if not _slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many authentication requests, please retry later",
+            headers={"Retry-After": str(HASH_RETRY_AFTER)},
+        )
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        _slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    """Hacher un mot de passe dans le pool de processus."""
+    return await _run(_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Vérifier un mot de passe dans le pool de processus."""
+    return await _run(_verify, plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Indiquer si un hachage utilise un coût obsolète (sans calcul bcrypt)."""
+    return pwd_context.needs_update(hashed_password)
@@ -0,0 +1,671 @@
+"""
+Import en masse depuis un système existant (utilisateurs, tickets, commentaires).
+
+    python -m app.importer --users users.csv --tickets tickets.ndjson --comments comments.csv
+    python -m app.importer ... --defer-indexes      # fenêtre de maintenance
+    python -m app.importer --reset                  # abandonner un import en cours
+
+Fichiers CSV (avec en-tête) ou NDJSON (``.ndjson`` / ``.jsonl``), champs :
+
+- utilisateurs : ``email``, ``username``, ``full_name``, ``hashed_password``
+  (bcrypt ; à défaut, mot de passe inutilisable), ``is_active``,
+  ``is_admin``, ``created_at`` ;
+- tickets : ``id`` (identifiant d'origine), ``title``, ``description``,
+  ``status``, ``priority``, ``creator``, ``assignee`` (email ou nom
+  d'utilisateur), ``created_at``, ``updated_at``, ``resolved_at`` ;
+- commentaires : ``ticket`` (identifiant d'origine du ticket), ``author``,
+  ``content``, ``created_at``, ``updated_at``.
+
+Déroulement, chaque étape enregistrée dans ``import_checkpoints`` :
+
+1. les enregistrements valides sont chargés dans des tables de transit
+   (``import_users``, ``import_tickets``, ``import_comments``) par
+   ``COPY ... FROM STDIN`` sous PostgreSQL (tables UNLOGGED), par INSERT
+   executemany sous SQLite ; les enregistrements invalides (champ manquant
+   ou trop long) et les doublons (email, nom d'utilisateur, identifiant
+   d'origine déjà lus) sont écartés et comptés (``*.rejected``) ;
+2. avec ``--defer-indexes``, les index non uniques de ``tickets`` et
+   ``comments`` et les triggers de recherche sont retirés, leur définition
+   conservée dans ``import_deferred`` ;
+3. les identifiants des tickets sont alloués en une fois : un bloc contigu
+   de la séquence, le décalage conservé dans ``import_checkpoints`` ;
+4. les lignes passent dans les tables de l'application par INSERT ... SELECT,
+   par tranches de ``IMPORT_BATCH_SIZE`` ; les références (créateur,
+   assigné, auteur) sont résolues par email puis par nom d'utilisateur, et
+   un ticket sans créateur connu ou un commentaire sans ticket ni auteur est
+   ignoré, un utilisateur déjà présent n'est pas recréé (``*.skipped``) ;
+5. les index et triggers sont rétablis, les vecteurs de recherche des
+   tickets importés recalculés, les compteurs de statistiques réconciliés.
+
+Chaque tranche est validée avec son point de reprise : relancée avec les
+mêmes fichiers, une exécution interrompue reprend où elle s'était arrêtée.
+Après un arrêt brutal de PostgreSQL, les tables UNLOGGED sont vidées mais
+pas ``import_checkpoints`` : une table de transit vide est rechargée, les
+identifiants des tickets réattribués à l'identique, et l'insertion reprend
+à la dernière tranche validée.
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import secrets
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Dict, Iterator, Optional
+
+from sqlalchemy import (
+    BigInteger, Boolean, Column, DateTime, Integer, MetaData, String, Table, Text, cast, false,
+    func, insert, literal, select, text, true, update,
+)
+from sqlalchemy.orm import Session
+
+from app.auth import hash_password
+from app.database import SessionLocal
+from app.events import publish, tickets_changed_event
+from app.models import Comment, Ticket, TicketPriority, TicketStatus, User
+from app.stats import reconcile_counters
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# Enregistrements par COPY et lignes par INSERT ... SELECT (une transaction chacun)
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "50000"))
+
+SOURCES = ("users", "tickets", "comments")
+DEFERRED_TABLES = ("tickets", "comments")
+SEARCH_TRIGGERS = {
+    "tickets": "tickets_search_vector_trigger",
+    "comments": "comments_search_vector_trigger",
+}
+
+
+def staging_metadata(unlogged: bool) -> MetaData:
+    """Tables de transit et de reprise (hors schéma de l'application)."""
+    metadata = MetaData()
+    prefixes = ["UNLOGGED"] if unlogged else []
+
+    def line():
+        # Rang de l'enregistrement dans son fichier
+        return Column("line", BigInteger, primary_key=True, autoincrement=False)
+
+    Table(
+        "import_users", metadata, line(),
+        Column("email", String(255), unique=True), Column("username", String(100), unique=True),
+        Column("full_name", String(255)), Column("hashed_password", String(255)),
+        Column("is_active", Boolean), Column("is_admin", Boolean), Column("created_at", DateTime),
+        prefixes=prefixes,
+    )
+    Table(
+        "import_tickets", metadata, line(),
+        Column("legacy_id", String(255), unique=True),
+        Column("title", String(255)), Column("description", Text),
+        Column("status", String(20)), Column("priority", String(20)),
+        Column("creator", String(255)), Column("assignee", String(255)),
+        Column("created_at", DateTime), Column("updated_at", DateTime),
+        Column("resolved_at", DateTime),
+        # Alloué avant l'insertion, pour relier les commentaires
+        Column("ticket_id", Integer),
+        prefixes=prefixes,
+    )
+    Table(
+        "import_comments", metadata, line(),
+        Column("ticket", String(255)), Column("author", String(255)), Column("content", Text),
+        Column("created_at", DateTime), Column("updated_at", DateTime),
+        prefixes=prefixes,
+    )
+    Table(
+        "import_checkpoints", metadata,
+        Column("step", String(50), primary_key=True),
+        Column("position", BigInteger, nullable=False),
+        Column("done", Boolean, nullable=False),
+        Column("source", String(1024)),
+    )
+    Table(
+        "import_deferred", metadata,
+        Column("name", String(255), primary_key=True),
+        Column("restore", Text, nullable=False),
+    )
+    return metadata
+
+
+# ============ Lecture et validation des fichiers ============
+
+def read_records(path: str) -> Iterator[Optional[dict]]:
+    """Enregistrements d'un fichier CSV ou NDJSON (``None`` : ligne JSON invalide)."""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as source:
+            yield from csv.DictReader(source)
+    elif path.endswith((".ndjson", ".jsonl")):
+        with open(path, encoding="utf-8") as source:
+            for line in source:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield None
+    else:
+        raise ValueError(f"Format inconnu (CSV ou NDJSON attendu) : {path}")
+
+
+def _text(
+    record: dict, name: str, required: bool = False, max_length: Optional[int] = 255
+) -> Optional[str]:
+    value = record.get(name)
+    value = str(value).strip() if value is not None else ""
+    if not value:
+        if required:
+            raise ValueError(f"{name} manquant")
+        return None
+    if max_length is not None and len(value) > max_length:
+        # Un dépassement ferait échouer tout le lot (COPY)
+        raise ValueError(f"{name} trop long ({len(value)} > {max_length})")
+    return value
+
+
+def _datetime(record: dict, name: str) -> Optional[datetime]:
+    value = _text(record, name)
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} invalide : {value!r}")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _boolean(record: dict, name: str) -> Optional[bool]:
+    value = record.get(name)
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "t", "yes", "y", "oui")
+
+
+def _enum(record: dict, name: str, enum, default):
+    """Nom du membre (stockage des ENUM), depuis sa valeur ou son nom."""
+    value = (_text(record, name) or default.value).lower()
+    try:
+        return enum(value).name
+    except ValueError:
+        raise ValueError(f"{name} invalide : {value!r}")
+
+
+def normalize_user(record: dict) -> dict:
+    return {
+        "email": _text(record, "email", required=True).lower(),
+        "username": _text(record, "username", required=True, max_length=100),
+        "full_name": _text(record, "full_name"),
+        "hashed_password": _text(record, "hashed_password"),
+        "is_active": _boolean(record, "is_active"),
+        "is_admin": _boolean(record, "is_admin"),
+        "created_at": _datetime(record, "created_at"),
+    }
+
+
+def normalize_ticket(record: dict) -> dict:
+    created_at = _datetime(record, "created_at")
+    return {
+        "legacy_id": _text(record, "id"),
+        "title": _text(record, "title", required=True, max_length=None)[:255],
+        "description": _text(record, "description", required=True, max_length=None),
+        "status": _enum(record, "status", TicketStatus, TicketStatus.OPEN),
+        "priority": _enum(record, "priority", TicketPriority, TicketPriority.MEDIUM),
+        "creator": _text(record, "creator", required=True),
+        "assignee": _text(record, "assignee"),
+        "created_at": created_at,
+        "updated_at": _datetime(record, "updated_at") or created_at,
+        "resolved_at": _datetime(record, "resolved_at"),
+    }
+
+
+def normalize_comment(record: dict) -> dict:
+    created_at = _datetime(record, "created_at")
+    return {
+        "ticket": _text(record, "ticket", required=True),
+        "author": _text(record, "author", required=True),
+        "content": _text(record, "content", required=True, max_length=None),
+        "created_at": created_at,
+        "updated_at": _datetime(record, "updated_at") or created_at,
+    }
+
+
+NORMALIZERS: Dict[str, Callable[[dict], dict]] = {
+    "users": normalize_user,
+    "tickets": normalize_ticket,
+    "comments": normalize_comment,
+}
+
+# Colonnes uniques des tables de transit : un doublon est écarté au chargement
+UNIQUE_KEYS = {
+    "users": ("email", "username"),
+    "tickets": ("legacy_id",),
+    "comments": (),
+}
+
+
+def _copy_value(value) -> str:
+    """Cellule CSV pour COPY (vide non quoté : NULL)."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def _user_ref(column):
+    """Identifiant de l'utilisateur désigné par son email, sinon son nom d'utilisateur."""
+    return func.coalesce(
+        select(User.id).where(User.email == func.lower(column)).scalar_subquery(),
+        select(User.id).where(User.username == column).scalar_subquery(),
+    )
+
+
+# ============ Import ============
+
+class Importer:
+    """Import repris à la dernière tranche validée (voir le docstring du module)."""
+
+    def __init__(self, db: Session, batch_size: int = IMPORT_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+        self.dialect = db.get_bind().dialect.name
+        self.tables = staging_metadata(unlogged=self.dialect == "postgresql").tables
+        self.counts: Counter = Counter()
+        self._unusable_password = None
+
+    def prepare(self) -> None:
+        """Créer les tables de transit et de reprise absentes."""
+        staging_metadata(unlogged=self.dialect == "postgresql").create_all(self.db.connection())
+        self.db.commit()
+
+    # ---- Points de reprise ----
+
+    def _checkpoint(self, step: str, source: Optional[str] = None):
+        """``(position, done)`` d'une étape ; vérifie que la source est la même."""
+        checkpoints = self.tables["import_checkpoints"]
+        row = self.db.execute(select(checkpoints).where(checkpoints.c.step == step)).first()
+        if row is None:
+            self.db.execute(
+                insert(checkpoints).values(step=step, position=0, done=False, source=source)
+            )
+            return 0, False
+        if source is not None and row.source != source:
+            raise ValueError(
+                f"{step} : import en cours depuis {row.source} ; "
+                "relancer avec ce fichier ou --reset"
+            )
+        return row.position, row.done
+
+    def _save(self, step: str, position: int, done: bool = False) -> None:
+        checkpoints = self.tables["import_checkpoints"]
+        self.db.execute(
+            update(checkpoints)
+            .where(checkpoints.c.step == step)
+            .values(position=position, done=done)
+        )
+
+    def _done(self, step: str) -> bool:
+        _, done = self._checkpoint(step)
+        self.db.commit()
+        return done
+
+    # ---- 1. Tables de transit ----
+
+    def _write_staging(self, table: Table, rows: list) -> None:
+        if self.dialect == "postgresql":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            names = [column.name for column in table.columns if column.name != "ticket_id"]
+            for row in rows:
+                writer.writerow([_copy_value(row.get(name)) for name in names])
+            buffer.seek(0)
+            cursor = self.db.connection().connection.cursor()
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(names)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        else:
+            self.db.execute(insert(table), rows)
+
+    def _duplicates(self, source: str, table: Table, rows: list) -> list:
+        """Écarter les enregistrements dont une clé unique est déjà chargée (lot ou table)."""
+        keys = UNIQUE_KEYS[source]
+        if not keys:
+            return rows
+        seen = {key: set() for key in keys}
+        for key in keys:
+            values = {row[key] for row in rows if row[key] is not None}
+            if values:
+                seen[key].update(
+                    self.db.scalars(select(table.c[key]).where(table.c[key].in_(values)))
+                )
+        kept = []
+        for row in rows:
+            duplicate = next(
+                (key for key in keys if row[key] is not None and row[key] in seen[key]), None
+            )
+            if duplicate:
+                self.counts[f"{source}.rejected"] += 1
+                logger.warning("import: %s ligne %d ignorée (%s en double : %r)",
+                               source, row["line"], duplicate, row[duplicate])
+                continue
+            for key in keys:
+                if row[key] is not None:
+                    seen[key].add(row[key])
+            kept.append(row)
+        return kept
+
+    def stage(self, source: str, path: str) -> None:
+        """Charger un fichier dans sa table de transit, par lots (reprise au dernier lot)."""
+        step = f"stage:{source}"
+        position, done = self._checkpoint(step, f"{os.path.abspath(path)}:{os.path.getsize(path)}")
+        table = self.tables[f"import_{source}"]
+        if position and self.db.scalar(select(table.c.line).limit(1)) is None:
+            # Tables UNLOGGED vidées par la reprise après un arrêt brutal, pas les points de reprise
+            logger.warning("import: %s, table de transit vide, relecture du fichier", source)
+            position, done = 0, False
+        if done:
+            self.db.commit()
+            return
+        normalize = NORMALIZERS[source]
+        records = islice(enumerate(read_records(path), start=1), position, None)
+        while True:
+            batch = list(islice(records, self.batch_size))
+            if not batch:
+                break
+            rows = []
+            for line, record in batch:
+                try:
+                    if not isinstance(record, dict):
+                        raise ValueError("enregistrement illisible")
+                    rows.append({"line": line, **normalize(record)})
+                except ValueError as exc:
+                    self.counts[f"{source}.rejected"] += 1
+                    logger.warning("import: %s ligne %d ignorée (%s)", source, line, exc)
+            rows = self._duplicates(source, table, rows)
+            if rows:
+                self._write_staging(table, rows)
+            position = batch[-1][0]
+            self._save(step, position)
+            self.db.commit()
+            self.counts[f"{source}.staged"] += len(rows)
+            logger.info("import: %s, %d enregistrement(s) lus", source, position)
+        self._save(step, position, done=True)
+        self.db.commit()
+
+    # ---- 2. Index et triggers différés ----
+
+    def _deferrable(self):
+        """``(nom, commande de retrait, commande de rétablissement)``."""
+        tables = ", ".join(f"'{table}'" for table in DEFERRED_TABLES)
+        if self.dialect == "postgresql":
+            rows = self.db.execute(text(
+                f"SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() "
+                f"AND tablename IN ({tables}) AND indexdef NOT LIKE 'CREATE UNIQUE%'"
+            )).all()
+            for table, trigger in SEARCH_TRIGGERS.items():
+                if self.db.scalar(text(
+                    "SELECT count(*) FROM pg_trigger WHERE tgname = :name AND tgenabled <> 'D'"
+                ), {"name": trigger}):
+                    yield (trigger, f"ALTER TABLE {table} DISABLE TRIGGER {trigger}",
+                           f"ALTER TABLE {table} ENABLE TRIGGER {trigger}")
+        else:
+            rows = self.db.execute(text(
+                f"SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                f"AND tbl_name IN ({tables}) AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%'"
+            )).all()
+        for name, definition in rows:
+            yield name, f"DROP INDEX {name}", definition
+
+    def defer_indexes(self) -> None:
+        """Retirer index et triggers de recherche le temps de l'insertion."""
+        if self._done("defer"):
+            return
+        deferred = self.tables["import_deferred"]
+        for name, drop, restore in list(self._deferrable()):
+            self.db.execute(insert(deferred).values(name=name, restore=restore))
+            self.db.execute(text(drop))
+            logger.info("import: %s différé", name)
+        self._save("defer", 0, done=True)
+        self.db.commit()
+
+    def restore_deferred(self) -> None:
+        """Reconstruire les index et réactiver les triggers, un par transaction."""
+        deferred = self.tables["import_deferred"]
+        for name, restore in self.db.execute(select(deferred.c.name, deferred.c.restore)).all():
+            self.db.execute(text(restore))
+            self.db.execute(deferred.delete().where(deferred.c.name == name))
+            self.db.commit()
+            logger.info("import: %s rétabli", name)
+
+    # ---- 3. Identifiants des tickets ----
+
+    def _reserve_ticket_ids(self, count: int) -> int:
+        """Réserver ``count`` identifiants contigus ; retourne celui qui précède le bloc."""
+        if self.dialect == "postgresql":
+            sequence = self.db.scalar(select(func.pg_get_serial_sequence("tickets", "id")))
+            # Les insertions concurrentes (nextval) attendent la fin de la réservation
+            self.db.execute(text("LOCK TABLE tickets IN SHARE ROW EXCLUSIVE MODE"))
+            offset = self.db.scalar(select(func.nextval(sequence))) - 1
+            self.db.execute(select(func.setval(sequence, offset + count)))
+            return offset
+        # Au-delà des identifiants déjà attribués, archives comprises (AUTOINCREMENT)
+        return max(
+            self.db.scalar(select(func.max(Ticket.id))) or 0,
+            self.db.scalar(text("SELECT max(id) FROM tickets_archive")) or 0,
+            self.db.scalar(text("SELECT seq FROM sqlite_sequence WHERE name = 'tickets'")) or 0,
+        )
+
+    def allocate_ticket_ids(self) -> None:
+        """Allouer les identifiants des tickets importés (rang dans le fichier + décalage).
+
+        Le décalage est conservé dans le point de reprise : après la perte des
+        tables de transit, les tickets déjà insérés retrouvent leur identifiant.
+        """
+        staged = self.tables["import_tickets"]
+        offset, done = self._checkpoint("ids:tickets")
+        if not done:
+            count = self.db.scalar(select(func.max(staged.c.line))) or 0
+            offset = self._reserve_ticket_ids(count) if count else 0
+            self._save("ids:tickets", offset, done=True)
+        self.db.execute(
+            update(staged)
+            .where(staged.c.ticket_id.is_(None))
+            .values(ticket_id=staged.c.line + offset)
+        )
+        self.db.commit()
+
+    # ---- 4. Insertion ----
+
+    def _move(self, source: str, statement: Callable[[int, int], object]) -> None:
+        """Exécuter ``statement(début, fin)`` par tranches de lignes de transit."""
+        step = f"move:{source}"
+        position, done = self._checkpoint(step)
+        staged = self.tables[f"import_{source}"]
+        last = self.db.scalar(select(func.max(staged.c.line))) or 0
+        while not done and position < last:
+            end = position + self.batch_size
+            rows = self.db.scalar(
+                select(func.count())
+                .select_from(staged)
+                .where(staged.c.line > position, staged.c.line <= end)
+            )
+            moved = self.db.execute(statement(position, end)).rowcount
+            self._save(step, end)
+            self.db.commit()
+            self.counts[f"{source}.imported"] += moved
+            # Utilisateur déjà présent, référence introuvable
+            self.counts[f"{source}.skipped"] += rows - moved
+            position = end
+            logger.info("import: %s, lignes %d/%d insérées", source, min(end, last), last)
+        self._save(step, position, done=True)
+        self.db.commit()
+
+    def _users(self, start: int, end: int):
+        staged = self.tables["import_users"]
+        if self._unusable_password is None:
+            # Secret jeté : les comptes sans mot de passe passent par une réinitialisation
+            self._unusable_password = hash_password(secrets.token_urlsafe(32))
+        now = datetime.utcnow()
+        known = select(User.id).where(
+            (User.email == staged.c.email) | (User.username == staged.c.username)
+        )
+        return insert(User).from_select(
+            ["email", "username", "full_name", "hashed_password", "is_active", "is_admin",
+             "created_at", "updated_at"],
+            select(
+                staged.c.email, staged.c.username, staged.c.full_name,
+                func.coalesce(staged.c.hashed_password, literal(self._unusable_password)),
+                func.coalesce(staged.c.is_active, true()),
+                func.coalesce(staged.c.is_admin, false()),
+                func.coalesce(staged.c.created_at, literal(now)),
+                func.coalesce(staged.c.created_at, literal(now)),
+            ).where(staged.c.line > start, staged.c.line <= end, ~known.exists()),
+        )
+
+    def _tickets(self, start: int, end: int):
+        staged = self.tables["import_tickets"]
+        now = datetime.utcnow()
+        resolved = select(
+            staged.c.ticket_id.label("id"), staged.c.title, staged.c.description,
+            cast(staged.c.status, Ticket.__table__.c.status.type).label("status"),
+            cast(staged.c.priority, Ticket.__table__.c.priority.type).label("priority"),
+            _user_ref(staged.c.creator).label("creator_id"),
+            _user_ref(staged.c.assignee).label("assigned_to_id"),
+            func.coalesce(staged.c.created_at, literal(now)).label("created_at"),
+            func.coalesce(staged.c.updated_at, literal(now)).label("updated_at"),
+            staged.c.resolved_at,
+        ).where(staged.c.line > start, staged.c.line <= end).subquery()
+        columns = ["id", "title", "description", "status", "priority", "creator_id",
+                   "assigned_to_id",
+                   "created_at", "updated_at", "resolved_at"]
+        return insert(Ticket).from_select(
+            columns,
+            select(*(resolved.c[name] for name in columns))
+            .where(resolved.c.creator_id.isnot(None)),
+        )
+
+    def _comments(self, start: int, end: int):
+        staged, tickets = self.tables["import_comments"], self.tables["import_tickets"]
+        now = datetime.utcnow()
+        # Ticket importé (et inséré) désigné par son identifiant d'origine
+        ticket_id = (
+            select(tickets.c.ticket_id)
+            .join(Ticket, Ticket.id == tickets.c.ticket_id)
+            .where(tickets.c.legacy_id == staged.c.ticket)
+            .scalar_subquery()
+        )
+        resolved = select(
+            staged.c.content, ticket_id.label("ticket_id"),
+            _user_ref(staged.c.author).label("author_id"),
+            func.coalesce(staged.c.created_at, literal(now)).label("created_at"),
+            func.coalesce(staged.c.updated_at, literal(now)).label("updated_at"),
+        ).where(staged.c.line > start, staged.c.line <= end).subquery()
+        columns = ["content", "ticket_id", "author_id", "created_at", "updated_at"]
+        return insert(Comment).from_select(
+            columns,
+            select(*(resolved.c[name] for name in columns))
+            .where(resolved.c.ticket_id.isnot(None), resolved.c.author_id.isnot(None)),
+        )
+
+    # ---- 5. Recherche, compteurs ----
+
+    def rebuild_search(self) -> None:
+        """Recalculer les vecteurs de recherche des tickets importés (triggers différés)."""
+        staged = self.tables["import_tickets"]
+        step = "search"
+        position, done = self._checkpoint(step)
+        last = self.db.scalar(select(func.max(staged.c.line))) or 0
+        while not done and position < last:
+            end = position + self.batch_size
+            self.db.execute(
+                update(Ticket)
+                .where(Ticket.id.in_(
+                    select(staged.c.ticket_id).where(staged.c.line > position, staged.c.line <= end)
+                ))
+                # title : déclenche le trigger ; updated_at explicite, sinon remplacé par onupdate
+                .values(title=Ticket.title, updated_at=Ticket.updated_at)
+            )
+            self._save(step, end)
+            self.db.commit()
+            position = end
+        self._save(step, position, done=True)
+        self.db.commit()
+
+    def run(self, paths: Dict[str, str], defer_indexes: bool = False) -> Counter:
+        """Exécuter (ou reprendre) l'import complet ; retourne les compteurs par table."""
+        self.prepare()
+        for source in SOURCES:
+            if paths.get(source):
+                self.stage(source, paths[source])
+        if defer_indexes:
+            self.defer_indexes()
+        self.allocate_ticket_ids()
+        self._move("users", self._users)
+        self._move("tickets", self._tickets)
+        self._move("comments", self._comments)
+
+        deferred = self._done("defer")
+        self.restore_deferred()
+        if deferred and self.dialect == "postgresql":
+            self.rebuild_search()
+
+        # Les INSERT ... SELECT ne passent pas par les compteurs incrémentaux
+        reconcile_counters(self.db)
+        publish(self.db, tickets_changed_event(self.counts["tickets.imported"]))
+        drop_staging(self.db)
+        return self.counts
+
+
+def drop_staging(db: Session) -> None:
+    """Supprimer les tables de transit et les points de reprise."""
+    staging_metadata(unlogged=False).drop_all(db.connection())
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Importer utilisateurs, tickets et commentaires en masse."
+    )
+    parser.add_argument("--users", help="Utilisateurs (CSV ou NDJSON)")
+    parser.add_argument("--tickets", help="Tickets (CSV ou NDJSON)")
+    parser.add_argument("--comments", help="Commentaires (CSV ou NDJSON)")
+    parser.add_argument(
+        "--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Lignes par transaction"
+    )
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="Reconstruire index et recherche après l'insertion "
+                             "(fenêtre de maintenance)")
+    parser.add_argument("--reset", action="store_true", help="Abandonner l'import en cours")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as db:
+        if args.reset:
+            importer = Importer(db)
+            importer.prepare()
+            importer.restore_deferred()
+            drop_staging(db)
+            print("Import abandonné")
+            return
+        paths = {source: getattr(args, source) for source in SOURCES}
+        if not any(paths.values()):
+            parser.error("au moins un fichier est requis")
+        try:
+            counts = Importer(db, args.batch_size).run(paths, defer_indexes=args.defer_indexes)
+        except ValueError as exc:
+            parser.error(str(exc))
+    for key, value in sorted(counts.items()):
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
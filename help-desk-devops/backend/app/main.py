@@ -1,16 +1,51 @@
 """
 Application FastAPI principale pour Help Desk.
 """
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST
 import os
 
-from app.database import Base, engine
-from app.routes import auth, tickets
+from app.database import USE_ASYNC_DB, get_engine, pool_status
+from app.routes import auth, tickets, auth_async, tickets_async, events
+from app.hashing import shutdown_executor
+from app.auth import principal_cache, token_cache
+from app.response_cache import response_cache
+from app.stats import STATS_RECONCILE_INTERVAL, reconcile_periodically
+from app.archive import ARCHIVE_INTERVAL, archive_periodically
+from app.events import start_listener, stop_listener
+from app.responses import DefaultJSONResponse
+from app.metrics import PrometheusMiddleware, mark_process_dead, render_metrics
+
+logger = logging.getLogger(__name__)
+
+# Le schéma n'est plus créé à l'import : il est géré par les migrations
+# (python -m app.migrate), exécutées avant le démarrage des workers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Démarrage et arrêt de l'application."""
+    reconciler = None
+    if STATS_RECONCILE_INTERVAL > 0:
+        reconciler = asyncio.create_task(reconcile_periodically(STATS_RECONCILE_INTERVAL))
+    archiver = None
+    if ARCHIVE_INTERVAL > 0:
+        archiver = asyncio.create_task(archive_periodically(ARCHIVE_INTERVAL))
+    start_listener()
+    yield
+    stop_listener()
+    if reconciler is not None:
+        reconciler.cancel()
+    if archiver is not None:
+        archiver.cancel()
+    shutdown_executor()
+    mark_process_dead()
 
-# Créer les tables
-Base.metadata.create_all(bind=engine)
 
 # Initialiser l'application FastAPI
 app = FastAPI(
@@ -19,7 +54,9 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan,
+    default_response_class=DefaultJSONResponse,
 )
 
 # Configuration CORS
@@ -31,11 +68,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Validateurs (requêtes conditionnelles) et profil SQL lisibles par le client
+    expose_headers=["ETag", "Last-Modified", "Server-Timing"],
 )
 
-# Inclure les routes
-app.include_router(auth.router)
-app.include_router(tickets.router)
+# Métriques par route (ajouté en dernier : enveloppe aussi CORS)
+app.add_middleware(PrometheusMiddleware)
+
+# Inclure les routes (pile asynchrone si USE_ASYNC_DB=true) ; le flux
+# d'événements précède /api/tickets/{ticket_id}
+app.include_router(events.router)
+if USE_ASYNC_DB:
+    app.include_router(auth_async.router)
+    app.include_router(tickets_async.router)
+else:
+    app.include_router(auth.router)
+    app.include_router(tickets.router)
 
 
 @app.get("/")
@@ -51,13 +99,66 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    """Vérification de la santé de l'application."""
+    """Vérification de la santé de l'application (processus vivant, sans accès DB)."""
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def readiness():
+    """Prêt à recevoir du trafic : base joignable et schéma à la dernière migration."""
+    # Alembic n'est chargé qu'à la première vérification, pas au démarrage
+    from app.migrate import current_revision, head_revision
+
+    expected = head_revision()
+    try:
+        with get_engine().connect() as connection:
+            revision = current_revision(connection)
+    except Exception as exc:
+        logger.warning("readiness: base injoignable (%s)", exc.__class__.__name__)
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "unavailable", "database": "unreachable",
+                "expected_migration": expected,
+            },
+        )
+    if revision != expected:
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "unavailable", "migration": revision, "expected_migration": expected,
+            },
+        )
+    return {"status": "ready", "migration": revision}
+
+
+@app.get("/health/db")
+def health_db():
+    """Métriques du pool de connexions pour dimensionner DB_POOL_SIZE."""
+    return {"status": "ok", "pool": pool_status()}
+
+
+@app.get("/health/cache")
+def health_cache():
+    """Compteurs des caches en mémoire du processus."""
+    return {
+        "status": "ok",
+        "principals": principal_cache.stats(),
+        "tokens": token_cache.stats(),
+        "responses": response_cache.stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Métriques Prometheus (format texte)."""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.exception_handler(Exception)
-async def global_exception_handler(request, exc):
-    """Gestionnaire global d'exceptions."""
+async def global_exception_handler(request: Request, exc: Exception):
+    """Gestionnaire global d'exceptions : journaliser, puis répondre 500."""
+    logger.exception("Unhandled error on %s %s", request.method, request.url.path)
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
@@ -0,0 +1,186 @@
+"""
+Métriques Prometheus par route : latence, taille de réponse, requêtes SQL
+(nombre et durée) et requêtes en cours.
+
+Le middleware est un middleware ASGI pur (pas de ``BaseHTTPMiddleware``) :
+il n'ajoute qu'une mesure de temps et quelques compteurs par requête, et ne
+perturbe pas les réponses en flux. Les routes sont étiquetées par leur
+gabarit (``/api/tickets/{ticket_id}``), jamais par le chemin brut.
+
+Les mêmes mesures alimentent le journal des requêtes lentes et le profil SQL
+à la demande (``app.profiling``).
+
+Avec plusieurs workers, définir ``PROMETHEUS_MULTIPROC_DIR`` (répertoire vide
+au démarrage) : chaque processus y écrit ses valeurs et ``/metrics`` les
+agrège.
+"""
+import os
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+    generate_latest, multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app import profiling
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+# Étiquette des requêtes qui ne correspondent à aucune route
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+SQL_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+REQUESTS = Counter(
+    "http_requests_total", "Requêtes HTTP traitées", ["method", "route", "status"]
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds", "Durée des requêtes HTTP",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Taille du corps des réponses HTTP",
+    ["method", "route"], buckets=SIZE_BUCKETS,
+)
+SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements", "Requêtes SQL exécutées par requête HTTP",
+    ["method", "route"], buckets=STATEMENT_BUCKETS,
+)
+SQL_DURATION = Histogram(
+    "http_request_sql_duration_seconds", "Temps passé en SQL par requête HTTP",
+    ["method", "route"], buckets=SQL_TIME_BUCKETS,
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requêtes HTTP en cours",
+    ["method"], multiprocess_mode="livesum",
+)
+SLOW_QUERIES = Counter(
+    "sql_slow_queries_total", "Requêtes SQL au-delà de SLOW_QUERY_MS", ["route"]
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "response_cache_lookups_total", "Consultations du cache des réponses (hit, shared_hit, miss)",
+    ["resource", "result"],
+)
+RATE_LIMITED = Counter(
+    "http_rate_limited_total", "Requêtes refusées par la limitation de débit", ["route", "key"]
+)
+
+
+class RequestStats:
+    """Compteurs SQL de la requête HTTP en cours."""
+    __slots__ = ("scope", "statements", "sql_seconds", "queries", "profiled")
+
+    def __init__(self, scope=None):
+        self.scope = scope
+        self.statements = 0
+        self.sql_seconds = 0.0
+        # (requête, durée) de chaque requête SQL, pour le profil à la demande
+        self.queries: List[Tuple[str, float]] = []
+        self.profiled = False
+
+    @property
+    def route(self) -> str:
+        return _route_template(self.scope or {})
+
+
+# Partagé avec le thread ou le greenlet qui exécute la route (contexte copié)
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Compteurs SQL de la requête HTTP en cours, s'il y en a une."""
+    return _current_request.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    duration = time.perf_counter() - starts.pop()
+    stats = _current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.sql_seconds += duration
+        stats.queries.append((statement, duration))
+    if profiling.SLOW_QUERY_SECONDS and duration >= profiling.SLOW_QUERY_SECONDS:
+        route = stats.route if stats is not None else None
+        SLOW_QUERIES.labels(route or "-").inc()
+        profiling.log_slow_query(conn, statement, parameters, executemany, duration, route)
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class PrometheusMiddleware:
+    """Middleware ASGI qui mesure chaque requête HTTP."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats(scope)
+        token = _current_request.set(stats)
+        status_code = 500
+        size = 0
+
+        async def send_with_metrics(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if stats.profiled:
+                    timing = profiling.server_timing(stats.queries, time.perf_counter() - start)
+                    message["headers"] = [
+                        *message.get("headers", []), (b"server-timing", timing.encode())
+                    ]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            duration = time.perf_counter() - start
+            in_progress.dec()
+            _current_request.reset(token)
+
+            route = _route_template(scope)
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            LATENCY.labels(method, route).observe(duration)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+            SQL_STATEMENTS.labels(method, route).observe(stats.statements)
+            SQL_DURATION.labels(method, route).observe(stats.sql_seconds)
+
+
+def render_metrics() -> bytes:
+    """Métriques au format texte Prometheus (agrégées entre workers si multiprocess)."""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead() -> None:
+    """Retirer les jauges du processus courant (arrêt du worker, mode multiprocess)."""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,83 @@
+"""
+Migrations du schéma (Alembic) : étape explicite, hors du démarrage des
+workers.
+
+    python -m app.migrate            # alembic upgrade head
+    python -m app.migrate --check    # code 1 si la base n'est pas à jour
+"""
+import argparse
+import os
+import sys
+from functools import lru_cache
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+# alembic.ini et migrations/ sont à la racine du backend
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(BACKEND_DIR, "alembic.ini")
+
+
+def alembic_config(connection=None) -> Config:
+    """Configuration Alembic ; ``connection`` réutilise une connexion existante."""
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    # Ne pas reconfigurer la journalisation de l'application
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def include_for_dialect(dialect_name: str):
+    """
+    Filtre ``include_object`` de l'autogénération : ignorer les index
+    réservés à un autre dialecte (``Index.ddl_if``).
+    """
+    def include_object(obj, name, type_, reflected, compare_to):
+        ddl_if = getattr(obj, "_ddl_if", None)
+        if type_ != "index" or ddl_if is None or ddl_if.dialect is None:
+            return True
+        dialects = (ddl_if.dialect,) if isinstance(ddl_if.dialect, str) else ddl_if.dialect
+        return dialect_name in dialects
+    return include_object
+
+
+def upgrade(revision: str = "head") -> None:
+    """Amener la base de DATABASE_URL à ``revision``."""
+    command.upgrade(alembic_config(), revision)
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> Optional[str]:
+    """Dernière révision connue du code."""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(connection) -> Optional[str]:
+    """Révision appliquée à la base (None si aucune)."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrations du schéma Help Desk")
+    parser.add_argument("--check", action="store_true", help="Vérifier sans migrer")
+    args = parser.parse_args()
+
+    if not args.check:
+        upgrade()
+        return
+
+    from app.database import get_engine
+
+    with get_engine().connect() as connection:
+        revision = current_revision(connection)
+    print(f"base : {revision or '-'} ; code : {head_revision()}")
+    if revision != head_revision():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,27 @@
 """
 Modèles de données SQLAlchemy pour l'application Help Desk.
 """
+import os
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    DDL, BigInteger, Column, Integer, Float, LargeBinary, String, Text, DateTime, Enum, ForeignKey,
+    Boolean, Index, event, text
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, foreign, relationship
 import enum
 from app.database import Base
 
+# Configuration de recherche plein texte PostgreSQL (langue des tickets)
+SEARCH_CONFIG = os.getenv("SEARCH_CONFIG", "french")
+
+# Rang métier de la priorité, pour trier sur les bases sans ENUM natif ordonné
+# (SQLite) ; indexé tel quel pour que l'index serve le tri
+PRIORITY_RANK_SQL = (
+    "CASE priority WHEN 'LOW' THEN 0 WHEN 'MEDIUM' THEN 1 "
+    "WHEN 'HIGH' THEN 2 WHEN 'CRITICAL' THEN 3 END"
+)
+
 
 class TicketStatus(str, enum.Enum):
     """Énumération des statuts de ticket."""
@@ -61,12 +76,39 @@ class Ticket(Base):
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     resolved_at = Column(DateTime, nullable=True)
+    # Vecteur de recherche (titre, description, commentaires), maintenu par
+    # des triggers PostgreSQL ; différé pour ne pas être chargé avec le ticket
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True))
 
     # Relations
     creator = relationship("User", back_populates="tickets_created", foreign_keys=[creator_id])
     assigned_to = relationship("User", back_populates="tickets_assigned", foreign_keys=[assigned_to_id])
     comments = relationship("Comment", back_populates="ticket", cascade="all, delete-orphan")
 
+    # Index des filtres et tris de la liste (chacun se termine par la clé de
+    # pagination par curseur : colonne de tri puis id) et de la recherche
+    __table_args__ = (
+        Index("ix_tickets_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        Index("ix_tickets_updated_at_id", "updated_at", "id"),
+        Index("ix_tickets_status_updated_at_id", "status", "updated_at", "id"),
+        Index("ix_tickets_priority_id", "priority", "id"),
+        Index("ix_tickets_priority_rank_id", text(PRIORITY_RANK_SQL), "id").ddl_if(
+            dialect="sqlite"
+        ),
+        Index("ix_tickets_status_priority_created_at_id", "status", "priority", "created_at", "id"),
+        Index(
+            "ix_tickets_assigned_status_created_at_id",
+            "assigned_to_id", "status", "created_at", "id",
+        ),
+        Index("ix_tickets_creator_created_at_id", "creator_id", "created_at", "id"),
+        Index("ix_tickets_search_vector", "search_vector", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+        # SQLite : pas de réutilisation des identifiants des tickets archivés
+        {"sqlite_autoincrement": True},
+    )
+
     def __repr__(self):
         return f"<Ticket(id={self.id}, title={self.title}, status={self.status})>"
 
@@ -86,5 +128,220 @@ class Comment(Base):
     ticket = relationship("Ticket", back_populates="comments")
     author = relationship("User", back_populates="comments")
 
+    # Fil d'un ticket dans l'ordre chronologique (pagination par curseur, export)
+    __table_args__ = (
+        Index("ix_comments_ticket_created_at_id", "ticket_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<Comment(id={self.id}, ticket_id={self.ticket_id}, author_id={self.author_id})>"
+
+
+# ============ Archives (tickets clos, voir app.archive) ============
+
+class ArchivedTicket(Base):
+    """
+    Ticket clos déplacé hors de ``tickets`` par l'archivage. Mêmes colonnes,
+    sans vecteur de recherche ; sous PostgreSQL, la table est partitionnée
+    par mois de ``created_at`` (d'où la clé primaire ``(id, created_at)``).
+    """
+    __tablename__ = "tickets_archive"
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, primary_key=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=False)
+    status = Column(Enum(TicketStatus), nullable=False)
+    priority = Column(Enum(TicketPriority), nullable=False)
+    creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    assigned_to_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    updated_at = Column(DateTime)
+    resolved_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    creator = relationship("User", foreign_keys=[creator_id])
+    assigned_to = relationship("User", foreign_keys=[assigned_to_id])
+    comments = relationship(
+        "ArchivedComment",
+        primaryjoin=lambda: (ArchivedTicket.id == foreign(ArchivedComment.ticket_id))
+        & (ArchivedTicket.created_at == foreign(ArchivedComment.ticket_created_at)),
+        viewonly=True,
+    )
+
+    # Lecture par id seul (détail d'un ticket archivé) : un index par partition
+    __table_args__ = (
+        Index("ix_tickets_archive_id", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    def __repr__(self):
+        return f"<ArchivedTicket(id={self.id}, title={self.title}, status={self.status})>"
+
+
+class ArchivedComment(Base):
+    """
+    Commentaire d'un ticket archivé. ``ticket_created_at`` range le fil dans
+    la même partition mensuelle que son ticket.
+    """
+    __tablename__ = "comments_archive"
+
+    id = Column(Integer, primary_key=True)
+    ticket_created_at = Column(DateTime, primary_key=True)
+    content = Column(Text, nullable=False)
+    ticket_id = Column(Integer, nullable=False)
+    author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+
+    author = relationship("User")
+
+    __table_args__ = (
+        Index("ix_comments_archive_ticket_created_at_id", "ticket_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (ticket_created_at)"},
+    )
+
+    def __repr__(self):
+        return (
+            f"<ArchivedComment(id={self.id}, ticket_id={self.ticket_id}, "
+            f"author_id={self.author_id})>"
+        )
+
+
+class TicketCounter(Base):
+    """
+    Compteur de tickets par (statut, priorité, agent assigné), maintenu dans
+    la transaction de chaque écriture (voir ``app.stats``).
+
+    ``assigned_to_id`` vaut 0 pour les tickets non assignés, afin de pouvoir
+    faire partie de la clé primaire.
+    """
+    __tablename__ = "ticket_counters"
+
+    status = Column(Enum(TicketStatus), primary_key=True)
+    priority = Column(Enum(TicketPriority), primary_key=True)
+    assigned_to_id = Column(Integer, primary_key=True, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (
+            f"<TicketCounter(status={self.status}, priority={self.priority}, "
+            f"assigned_to_id={self.assigned_to_id}, count={self.count})>"
+        )
+
+
+class RateLimitBucket(Base):
+    """
+    Seau de jetons partagé entre workers (``RATE_LIMIT_BACKEND=database``,
+    voir ``app.ratelimit``). ``updated_at`` est un horodatage Unix : le
+    calcul du remplissage reste le même que pour les seaux en mémoire.
+    """
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RateLimitBucket(key={self.key}, tokens={self.tokens})>"
+
+
+class CachedResponseEntry(Base):
+    """
+    Réponse mise en cache, partagée entre workers (``RESPONSE_CACHE_SHARED=database``,
+    voir ``app.response_cache``). La clé inclut les versions des données
+    servies : une entrée n'est jamais modifiée, seulement remplacée ou purgée.
+    Table ``UNLOGGED`` sous PostgreSQL (cf. migration 0005).
+    """
+    __tablename__ = "response_cache_entries"
+
+    key = Column(String(64), primary_key=True)
+    body = Column(LargeBinary, nullable=False)
+    headers = Column(Text, nullable=False)
+    expires_at = Column(Float, nullable=False, index=True)
+
+
+class CacheVersion(Base):
+    """Compteur de version partagé d'un ensemble de réponses (``list``, ``ticket:<id>``...)."""
+    __tablename__ = "response_cache_versions"
+
+    name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+# ============ Recherche plein texte (PostgreSQL) ============
+# Le vecteur d'un ticket est recalculé quand son titre ou sa description
+# change ; un nouveau commentaire y est ajouté de façon incrémentale. Une
+# modification ou suppression de commentaires déclenche un recalcul complet,
+# une fois par ticket touché et par requête (trigger FOR EACH STATEMENT),
+# sauf pour les tickets supprimés dans la même transaction
+# (``helpdesk.deleting_tickets``, voir ``app.search.delete_ticket_comments``).
+
+TICKET_SEARCH_TRIGGER = DDL(f"""
+CREATE OR REPLACE FUNCTION tickets_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'B') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+            (SELECT string_agg(content, ' ') FROM comments WHERE ticket_id = NEW.id), ''
+        )), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tickets_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON tickets
+    FOR EACH ROW EXECUTE FUNCTION tickets_search_vector_update();
+""")
+
+COMMENT_SEARCH_TRIGGER = DDL(f"""
+CREATE OR REPLACE FUNCTION comments_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    UPDATE tickets
+    SET search_vector = coalesce(search_vector, ''::tsvector) ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', NEW.content), 'C')
+    WHERE id = NEW.ticket_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION comments_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    -- Recalcul complet via le trigger des tickets, une fois par ticket
+    IF TG_OP = 'DELETE' THEN
+        UPDATE tickets SET title = title
+        WHERE id IN (SELECT ticket_id FROM old_comments)
+        AND id <> ALL (string_to_array(
+            coalesce(current_setting('helpdesk.deleting_tickets', true), ''), ','
+        )::integer[]);
+    ELSE
+        UPDATE tickets SET title = title
+        WHERE id IN (
+            SELECT unnest(ARRAY[o.ticket_id, n.ticket_id])
+            FROM old_comments o JOIN new_comments n USING (id)
+            WHERE o.content IS DISTINCT FROM n.content OR o.ticket_id <> n.ticket_id
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER comments_search_vector_trigger
+    AFTER INSERT ON comments
+    FOR EACH ROW EXECUTE FUNCTION comments_search_vector_update();
+
+CREATE TRIGGER comments_search_vector_delete_trigger
+    AFTER DELETE ON comments REFERENCING OLD TABLE AS old_comments
+    FOR EACH STATEMENT EXECUTE FUNCTION comments_search_vector_refresh();
+
+CREATE TRIGGER comments_search_vector_change_trigger
+    AFTER UPDATE ON comments REFERENCING OLD TABLE AS old_comments NEW TABLE AS new_comments
+    FOR EACH STATEMENT EXECUTE FUNCTION comments_search_vector_refresh();
+""")
+
+event.listen(
+    Ticket.__table__, "after_create", TICKET_SEARCH_TRIGGER.execute_if(dialect="postgresql")
+)
+event.listen(
+    Comment.__table__, "after_create", COMMENT_SEARCH_TRIGGER.execute_if(dialect="postgresql")
+)
@@ -0,0 +1,115 @@
+"""
+Pagination par curseur (keyset) sur ``(clé de tri, id)``.
+
+Le curseur est opaque pour le client : il encode en base64 la position du
+dernier élément de la page. La page suivante se lit avec une comparaison de
+tuples servie par un index composite se terminant par ``(clé de tri, id)``,
+donc à coût constant quelle que soit la profondeur.
+"""
+import base64
+import binascii
+import enum
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import literal, tuple_
+from sqlalchemy.orm import Query
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor",
+    )
+
+
+def encode_key(*values) -> str:
+    """Encoder une clé de tri (valeurs sérialisables en JSON) en curseur opaque."""
+    raw = json.dumps(list(values)).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_key(cursor: str, size: int) -> list:
+    """Décoder une clé de tri de ``size`` valeurs ; lève une erreur 400 si invalide."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise _invalid_cursor()
+    return values
+
+
+def encode_position(value: Any, item_id: int) -> str:
+    """Encoder la position ``(valeur de tri, id)`` d'un élément."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, enum.Enum):
+        value = value.name
+    return encode_key(value, item_id)
+
+
+def decode_position(cursor: str, python_type: type) -> Tuple[Any, int]:
+    """Décoder une position dont la valeur de tri est de type ``python_type``."""
+    value, item_id = decode_key(cursor, 2)
+    try:
+        if python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif issubclass(python_type, enum.Enum):
+            value = python_type[value]
+        else:
+            value = python_type(value)
+        return value, int(item_id)
+    except (KeyError, TypeError, ValueError):
+        raise _invalid_cursor()
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Encoder la position d'un élément trié par date de création."""
+    return encode_position(created_at, item_id)
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Décoder un curseur de date de création ; lève une erreur 400 s'il est invalide."""
+    return decode_position(cursor, datetime)
+
+
+def keyset_page(
+    query: Query,
+    sort_key,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True,
+) -> Tuple[List, Optional[str]]:
+    """
+    Lire une page triée par ``(sort_key, id_column)``.
+
+    Retourne les éléments de la page et le curseur de la page suivante
+    (``None`` s'il n'y en a pas). Pour une requête sur une entité, les
+    éléments sont les objets ; pour une projection (plusieurs colonnes, dont
+    ``id``), ce sont les lignes.
+    """
+    projection = len(query.column_descriptions) > 1
+    if cursor:
+        value, item_id = decode_position(cursor, sort_key.type.python_type)
+        position = tuple_(sort_key, id_column)
+        bound = tuple_(literal(value, sort_key.type), literal(item_id, id_column.type))
+        query = query.filter(position < bound if descending else position > bound)
+
+    if descending:
+        query = query.order_by(sort_key.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_key.asc(), id_column.asc())
+    rows = query.add_columns(sort_key.label("sort_key")).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_position(last.sort_key, last.id if projection else last[0].id)
+    if projection:
+        return rows, next_cursor
+    return [row[0] for row in rows], next_cursor
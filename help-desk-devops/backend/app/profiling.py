@@ -0,0 +1,145 @@
+"""
+Journal des requêtes SQL lentes et profil SQL à la demande.
+
+Chaque requête SQL dépassant ``SLOW_QUERY_MS`` est journalisée (logger
+``app.sql.slow``) avec la route HTTP en cours, la forme de ses paramètres
+(types, jamais les valeurs) et son plan d'exécution. ``SLOW_QUERY_EXPLAIN``
+vaut ``off``, ``plan`` (``EXPLAIN``) ou ``analyze`` (``EXPLAIN ANALYZE``,
+PostgreSQL, limité aux SELECT puisqu'il exécute la requête).
+
+Un administrateur peut demander le profil SQL d'une requête avec l'en-tête
+``X-SQL-Profile: 1`` : la réponse porte alors un en-tête ``Server-Timing``
+avec le temps SQL total et sa répartition par type de requête et table.
+"""
+import logging
+import os
+import re
+from collections import defaultdict
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger("app.sql.slow")
+
+# Configuration (0 désactive le journal)
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_MS", "500")) / 1000
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "plan").lower()
+# En-tête de demande du profil (réservé aux administrateurs)
+PROFILE_HEADER = "x-sql-profile"
+# Entrées de répartition au plus dans Server-Timing
+SERVER_TIMING_MAX_ENTRIES = 10
+# Longueur maximale d'une requête dans le journal
+MAX_LOGGED_STATEMENT = 2000
+
+# Requêtes dont le plan est demandé (pas de DDL ni de PRAGMA)
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|TABLE)\s+\"?(\w+)", re.IGNORECASE)
+_PARENTHESIZED = re.compile(r"\([^()]*\)")
+
+
+def _outer_statement(statement: str) -> str:
+    """Requête sans ses groupes parenthésés (sous-requêtes de la liste de colonnes...)."""
+    previous = None
+    while previous != statement:
+        previous, statement = statement, _PARENTHESIZED.sub(" ... ", statement)
+    return statement
+
+
+def statement_label(statement: str) -> str:
+    """
+    Étiquette courte d'une requête : verbe et première table de la requête
+    principale (``select-tickets``), à défaut celle d'une sous-requête.
+    """
+    verb = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else "sql"
+    table = _TABLE.search(_outer_statement(statement)) or _TABLE.search(statement)
+    return f"{verb}-{table.group(1).lower()}" if table else verb
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> str:
+    """Forme des paramètres (types seulement) pour le journal."""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {parameter_shape(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        fields = ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items())
+        return "{" + fields + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return "()"
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[str]:
+    """
+    Plan d'exécution d'une requête, sur un curseur DBAPI distinct (le curseur
+    de la requête n'a pas encore été lu). Sous PostgreSQL, un point de
+    sauvegarde protège la transaction en cours d'une erreur de l'EXPLAIN.
+    """
+    dialect = conn.dialect.name
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    if dialect == "postgresql":
+        # ANALYZE exécute la requête : jamais pour une écriture
+        analyze = SLOW_QUERY_EXPLAIN == "analyze" and statement.lstrip()[:6].upper() == "SELECT"
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    elif dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        return None
+
+    cursor = conn.connection.cursor()
+    try:
+        if dialect == "postgresql":
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception:
+            if dialect == "postgresql":
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        if dialect == "postgresql":
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def log_slow_query(conn, statement: str, parameters: Any, executemany: bool,
+                   duration: float, route: Optional[str]) -> None:
+    """Journaliser une requête lente avec sa route, ses paramètres et son plan."""
+    plan = None
+    explain = SLOW_QUERY_EXPLAIN in ("plan", "analyze") and not executemany
+    if explain and not conn.info.get("explaining"):
+        conn.info["explaining"] = True
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as exc:
+            plan = f"(EXPLAIN indisponible : {exc.__class__.__name__})"
+        finally:
+            conn.info["explaining"] = False
+    logger.warning(
+        "Slow query %.1f ms route=%s params=%s\n%s%s",
+        duration * 1000,
+        route or "-",
+        parameter_shape(parameters, executemany),
+        statement[:MAX_LOGGED_STATEMENT],
+        f"\nPlan:\n{plan}" if plan else "",
+    )
+
+
+def server_timing(queries: List[Tuple[str, float]], app_seconds: float) -> str:
+    """
+    Valeur de l'en-tête ``Server-Timing`` : temps SQL total, répartition par
+    étiquette (les plus coûteuses d'abord) et temps de la route.
+    """
+    totals = defaultdict(lambda: [0, 0.0])
+    for statement, seconds in queries:
+        label = statement_label(statement)
+        totals[label][0] += 1
+        totals[label][1] += seconds
+    sql_seconds = sum(seconds for _, seconds in queries)
+    entries = [f'db;dur={sql_seconds * 1000:.2f};desc="{len(queries)} queries"']
+    ranked = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+    for label, (count, seconds) in ranked[:SERVER_TIMING_MAX_ENTRIES]:
+        entries.append(f'sql-{label};dur={seconds * 1000:.2f};desc="{count}x"')
+    entries.append(f"app;dur={app_seconds * 1000:.2f}")
+    return ", ".join(entries)
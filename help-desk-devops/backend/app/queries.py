@@ -0,0 +1,197 @@
+"""
+Stratégies de chargement des relations par schéma de réponse.
+
+Chaque schéma Pydantic qui sérialise des relations possède ses options de
+chargement : les relations N:1 sont jointes (``joinedload``) et les
+collections sont chargées en une requête groupée (``selectinload``). Le
+nombre de requêtes SQL d'un endpoint reste ainsi constant, quel que soit le
+nombre de lignes retournées.
+
+La liste des tickets, l'endpoint le plus sollicité, ne charge pas d'objets
+ORM : une projection sélectionne les seules colonnes de la vue liste et les
+lignes sont converties directement en éléments JSON.
+
+Les commentaires d'un ticket ne sont jamais chargés en entier : le détail en
+intègre les premiers, la suite se lit par pages (index
+``(ticket_id, created_at, id)``) et l'export du fil complet est lu par lots.
+"""
+import os
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session, aliased, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.interfaces import LoaderOption
+from app.conditional import comment_version_columns
+from app.models import Ticket, Comment, User
+from app.pagination import keyset_page
+from app.schemas import TicketResponse, TicketListResponse, CommentResponse
+
+# Commentaires intégrés au détail d'un ticket
+TICKET_COMMENTS_LIMIT = int(os.getenv("TICKET_COMMENTS_LIMIT", "50"))
+# Lignes lues par lot lors des exports (fil de commentaires, export des tickets)
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+
+LOADER_OPTIONS: Dict[Type[BaseModel], Tuple[LoaderOption, ...]] = {
+    TicketListResponse: (
+        joinedload(Ticket.creator),
+        joinedload(Ticket.assigned_to),
+    ),
+    # Les commentaires sont lus à part, par page (ticket_detail)
+    TicketResponse: (
+        joinedload(Ticket.creator),
+        joinedload(Ticket.assigned_to),
+    ),
+    CommentResponse: (
+        joinedload(Comment.author),
+    ),
+}
+
+
+def load_for(query: Query, schema: Type[BaseModel]) -> Query:
+    """Appliquer à une requête les options de chargement d'un schéma."""
+    return query.options(*LOADER_OPTIONS[schema])
+
+
+def ticket_query(db: Session, schema: Type[BaseModel]) -> Query:
+    """Requête sur les tickets préparée pour un schéma de réponse."""
+    return load_for(db.query(Ticket), schema)
+
+
+def comment_query(db: Session) -> Query:
+    """Requête sur les commentaires préparée pour ``CommentResponse``."""
+    return load_for(db.query(Comment), CommentResponse)
+
+
+def comment_page(
+    db: Session, ticket_id: int, cursor: Optional[str], limit: int
+) -> Tuple[List[Comment], Optional[str]]:
+    """Page des commentaires d'un ticket, du plus ancien au plus récent."""
+    return keyset_page(
+        comment_query(db).filter(Comment.ticket_id == ticket_id),
+        Comment.created_at, Comment.id, cursor, limit, descending=False,
+    )
+
+
+def ticket_with_version(db: Session, ticket_id: int, schema: Optional[Type[BaseModel]] = None):
+    """
+    Ticket (préparé pour ``schema``, s'il est donné), nombre de commentaires
+    et date du dernier, en une requête ; ``None`` si le ticket n'existe pas.
+    """
+    query = ticket_query(db, schema) if schema is not None else db.query(Ticket)
+    return (
+        query
+        .add_columns(*comment_version_columns())
+        .filter(Ticket.id == ticket_id)
+        .first()
+    )
+
+
+def ticket_detail(db: Session, ticket_id: int):
+    """
+    Ticket prêt pour ``TicketResponse`` et version de ses commentaires
+    (``(ticket, comment_count, last_comment_at)``, ``None`` si absent).
+
+    Seuls les ``TICKET_COMMENTS_LIMIT`` premiers commentaires sont chargés ;
+    ``comment_count`` et ``comments_next_cursor`` sont renseignés sur le ticket.
+    """
+    row = ticket_with_version(db, ticket_id, TicketResponse)
+    if row is None:
+        return None
+    ticket, comment_count, last_comment_at = row
+    comments, next_cursor = comment_page(db, ticket_id, None, TICKET_COMMENTS_LIMIT)
+    # Collection partielle, sans marquer le ticket comme modifié
+    set_committed_value(ticket, "comments", comments)
+    ticket.comment_count = comment_count
+    ticket.comments_next_cursor = next_cursor
+    return ticket, comment_count, last_comment_at
+
+
+# ============ Export du fil de commentaires (NDJSON) ============
+
+def comment_thread_statement(ticket_id: int) -> Select:
+    """Fil complet d'un ticket, lu par lots de ``EXPORT_BATCH_SIZE`` (curseur serveur)."""
+    return (
+        select(Comment)
+        .options(*LOADER_OPTIONS[CommentResponse])
+        .where(Comment.ticket_id == ticket_id)
+        .order_by(Comment.created_at, Comment.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def _ndjson(comments: Iterable[Comment]) -> bytes:
+    return b"".join(
+        CommentResponse.model_validate(comment).model_dump_json().encode() + b"\n"
+        for comment in comments
+    )
+
+
+def comment_thread(db: Session, ticket_id: int) -> Iterator[bytes]:
+    """Fil en NDJSON, un lot à la fois : la mémoire ne dépend pas de la longueur du fil."""
+    for comments in db.scalars(comment_thread_statement(ticket_id)).partitions():
+        yield _ndjson(comments)
+
+
+async def comment_thread_async(db: AsyncSession, ticket_id: int) -> AsyncIterator[bytes]:
+    """Équivalent asynchrone de ``comment_thread``."""
+    result = await db.stream_scalars(comment_thread_statement(ticket_id))
+    async for comments in result.partitions():
+        yield _ndjson(comments)
+
+
+# ============ Vue liste (projection) ============
+
+_creator = aliased(User, name="creator")
+_assignee = aliased(User, name="assignee")
+
+# Colonnes de TicketListResponse : ni description, ni colonnes des
+# utilisateurs au-delà de leur résumé
+LIST_COLUMNS = (
+    Ticket.id,
+    Ticket.title,
+    Ticket.status,
+    Ticket.priority,
+    Ticket.creator_id,
+    Ticket.assigned_to_id,
+    Ticket.created_at,
+    Ticket.updated_at,
+    _creator.username.label("creator_username"),
+    _creator.full_name.label("creator_full_name"),
+    _assignee.username.label("assignee_username"),
+    _assignee.full_name.label("assignee_full_name"),
+)
+
+
+def ticket_list_query(db: Session) -> Query:
+    """Projection de la liste des tickets : des lignes, sans identity map."""
+    return (
+        db.query(*LIST_COLUMNS)
+        .join(_creator, _creator.id == Ticket.creator_id)
+        .outerjoin(_assignee, _assignee.id == Ticket.assigned_to_id)
+    )
+
+
+def ticket_list_item(row) -> dict:
+    """Élément JSON de ``TicketListResponse`` à partir d'une ligne de la projection."""
+    return {
+        "id": row.id,
+        "title": row.title,
+        "status": row.status.value,
+        "priority": row.priority.value,
+        "creator_id": row.creator_id,
+        "assigned_to_id": row.assigned_to_id,
+        "created_at": row.created_at.isoformat(),
+        "updated_at": row.updated_at.isoformat(),
+        "creator": {
+            "id": row.creator_id,
+            "username": row.creator_username,
+            "full_name": row.creator_full_name,
+        },
+        "assigned_to": None if row.assigned_to_id is None else {
+            "id": row.assigned_to_id,
+            "username": row.assignee_username,
+            "full_name": row.assignee_full_name,
+        },
+    }
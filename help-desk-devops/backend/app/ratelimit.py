@@ -0,0 +1,273 @@
+"""
+Limitation de débit par seaux de jetons (token bucket).
+
+Une limite ``"5/minute"`` est un seau de 5 jetons rempli à raison de 5 par
+minute : une rafale de 5 requêtes passe, puis une requête toutes les 12
+secondes. Une requête refusée reçoit 429 avec ``Retry-After`` avant toute
+lecture de la base ou tout calcul bcrypt.
+
+Les seaux sont propres à une route et à une clé :
+
+- ``ip`` : adresse du client (derrière un proxy, lancer uvicorn avec
+  ``--proxy-headers`` pour qu'il s'agisse de l'adresse d'origine) ;
+- ``account`` : compte visé, lu dans le corps de la requête (l'email des
+  routes d'authentification), pour freiner une attaque répartie sur
+  plusieurs adresses.
+
+Les limites sont nommées ``<routeur>.<route>:<clé>`` (``auth.login:ip``) ;
+``RATE_LIMITS`` complète ou remplace les limites par défaut :
+``RATE_LIMITS="auth.login:ip=50/minute,tickets.create_ticket:ip=30/minute"``
+(``off`` désactive une limite).
+
+Stockage des seaux (``RATE_LIMIT_BACKEND``) :
+
+- ``memory`` (défaut) : seaux du processus, bornés en nombre (LRU) ; avec
+  plusieurs workers, chacun applique la limite de son côté ;
+- ``database`` : table ``rate_limit_buckets`` partagée par les workers
+  (PostgreSQL en production, SQLite en développement et en test).
+"""
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.database import get_engine
+from app.metrics import RATE_LIMITED
+from app.models import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+# Seaux conservés par le stockage en mémoire (les plus anciens sont oubliés)
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+# Seaux inactifs supprimés de la table partagée (secondes, au moins la plus longue période)
+RATE_LIMIT_PURGE_AFTER = float(os.getenv("RATE_LIMIT_PURGE_AFTER", "86400"))
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Le hachage bcrypt rend la connexion et l'inscription coûteuses : limitées par défaut
+DEFAULT_LIMITS = {
+    "auth.login:ip": "20/minute",
+    "auth.login:account": "5/minute",
+    "auth.register:ip": "5/minute",
+}
+
+
+@dataclass(frozen=True)
+class Rate:
+    """Capacité d'un seau et période de son remplissage complet."""
+    capacity: int
+    period: float
+
+    @property
+    def per_second(self) -> float:
+        return self.capacity / self.period
+
+
+def parse_rate(spec: str) -> Optional[Rate]:
+    """Lire ``"N/période"`` (``second``, ``minute``, ``hour``, ``day``) ; ``None`` pour ``off``."""
+    spec = spec.strip().lower()
+    if spec in ("off", "0", ""):
+        return None
+    try:
+        count, period = spec.split("/")
+        rate = Rate(int(count), PERIODS[period.strip()])
+    except (KeyError, ValueError):
+        raise ValueError(
+            f"Limite de débit invalide : {spec!r} (attendu : N/second|minute|hour|day)"
+        )
+    if rate.capacity < 1:
+        raise ValueError(f"Limite de débit invalide : {spec!r}")
+    return rate
+
+
+def parse_limits(value: str) -> Dict[str, Optional[Rate]]:
+    """Lire ``RATE_LIMITS`` : ``nom=N/période`` séparés par des virgules."""
+    limits = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        name, _, spec = entry.partition("=")
+        limits[name.strip()] = parse_rate(spec)
+    return limits
+
+
+LIMITS: Dict[str, Optional[Rate]] = {
+    **parse_limits(",".join(f"{name}={spec}" for name, spec in DEFAULT_LIMITS.items())),
+    **parse_limits(os.getenv("RATE_LIMITS", "")),
+}
+
+
+def consume(
+    state: Optional[Tuple[float, float]], rate: Rate, now: float
+) -> Tuple[Tuple[float, float], float]:
+    """
+    Prendre un jeton d'un seau ``(jetons, date)`` (``None`` : seau plein).
+
+    Retourne le nouvel état et le délai avant le prochain jeton (0 si la
+    requête est acceptée). Une requête refusée ne consomme rien.
+    """
+    tokens = rate.capacity
+    if state is not None:
+        tokens = min(rate.capacity, state[0] + max(0.0, now - state[1]) * rate.per_second)
+    if tokens >= 1:
+        return (tokens - 1, now), 0.0
+    return (tokens, now), (1 - tokens) / rate.per_second
+
+
+class MemoryBackend:
+    """Seaux du processus, dans un dictionnaire borné (LRU)."""
+    blocking = False
+
+    def __init__(self, maxsize: int = RATE_LIMIT_MAX_KEYS):
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: Rate, now: float) -> float:
+        """Prendre un jeton ; retourne 0 ou le délai avant le prochain jeton."""
+        with self._lock:
+            state, wait = consume(self._buckets.get(key), rate, now)
+            self._buckets[key] = state
+            self._buckets.move_to_end(key)
+            # Un seau oublié repart plein : borne la mémoire au prix d'un peu de tolérance
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class DatabaseBackend:
+    """
+    Seaux partagés dans ``rate_limit_buckets`` : lecture verrouillée
+    (``SELECT ... FOR UPDATE`` sous PostgreSQL) puis upsert, dans une
+    transaction courte sur une connexion dédiée.
+    """
+    blocking = True
+
+    def __init__(self, engine=None, purge_after: float = RATE_LIMIT_PURGE_AFTER):
+        self._engine = engine
+        self.purge_after = purge_after
+        self._next_purge = 0.0
+
+    def take(self, key: str, rate: Rate, now: float) -> float:
+        """Prendre un jeton ; retourne 0 ou le délai avant le prochain jeton."""
+        table = RateLimitBucket.__table__
+        with (self._engine or get_engine()).begin() as connection:
+            row = connection.execute(
+                select(table.c.tokens, table.c.updated_at)
+                .where(table.c.key == key)
+                .with_for_update()
+            ).first()
+            (tokens, updated_at), wait = consume(tuple(row) if row else None, rate, now)
+            dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+            upsert = dialect.insert(table).values(key=key, tokens=tokens, updated_at=updated_at)
+            connection.execute(upsert.on_conflict_do_update(
+                index_elements=[table.c.key],
+                set_={"tokens": upsert.excluded.tokens, "updated_at": upsert.excluded.updated_at},
+            ))
+            if now >= self._next_purge:
+                # Seaux inactifs : pleins depuis longtemps, inutile de les garder
+                self._next_purge = now + 60
+                connection.execute(delete(table).where(table.c.updated_at < now - self.purge_after))
+        return wait
+
+
+BACKENDS = {"memory": MemoryBackend, "database": DatabaseBackend}
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Stockage des seaux choisi par ``RATE_LIMIT_BACKEND`` (créé à la première utilisation)."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if RATE_LIMIT_BACKEND not in BACKENDS:
+                    raise ValueError(f"RATE_LIMIT_BACKEND inconnu : {RATE_LIMIT_BACKEND!r}")
+                _backend = BACKENDS[RATE_LIMIT_BACKEND]()
+    return _backend
+
+
+def bucket_key(name: str, value: str) -> str:
+    """Clé d'un seau ; la valeur (adresse, email) n'est conservée que hachée."""
+    return f"{name}:{hashlib.sha256(value.encode()).hexdigest()[:32]}"
+
+
+async def _account(request: Request, field: str) -> Optional[str]:
+    # Corps déjà lu et mis en cache par FastAPI ; invalide : la route répondra 422
+    try:
+        body = await request.json()
+    except ValueError:
+        return None
+    value = body.get(field) if isinstance(body, dict) else None
+    return value.strip().lower() if isinstance(value, str) and value.strip() else None
+
+
+class RateLimit:
+    """
+    Dépendance appliquant, à chaque route d'un routeur, les limites
+    ``<prefix>.<nom de la route>:ip`` et ``:account`` configurées.
+    """
+
+    def __init__(self, prefix: str, account_field: Optional[str] = None):
+        self.prefix = prefix
+        self.account_field = account_field
+
+    async def __call__(self, request: Request) -> None:
+        if not RATE_LIMIT_ENABLED:
+            return
+        route = f"{self.prefix}.{getattr(request.scope.get('route'), 'name', '')}"
+        checks = []
+        rate = LIMITS.get(f"{route}:ip")
+        if rate is not None and request.client is not None:
+            checks.append(("ip", request.client.host, rate))
+        rate = LIMITS.get(f"{route}:account")
+        if rate is not None and self.account_field:
+            account = await _account(request, self.account_field)
+            if account:
+                checks.append(("account", account, rate))
+        for kind, value, rate in checks:
+            await _take(route, kind, value, rate)
+
+
+async def _take(route: str, kind: str, value: str, rate: Rate) -> None:
+    """Prendre un jeton du seau ``route:kind`` ; 429 s'il est vide."""
+    backend = get_backend()
+    key = bucket_key(f"{route}:{kind}", value)
+    try:
+        if backend.blocking:
+            wait = await run_in_threadpool(backend.take, key, rate, time.time())
+        else:
+            wait = backend.take(key, rate, time.time())
+    except Exception:
+        # Stockage indisponible : ne pas bloquer tout le trafic
+        logger.exception("ratelimit: seau %s illisible, requête acceptée", key)
+        return
+    if wait > 0:
+        RATE_LIMITED.labels(route, kind).inc()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+
+
+def rate_limit_dependencies(prefix: str, account_field: Optional[str] = None) -> List:
+    """
+    Dépendances de routeur pour ``prefix`` : aucune si aucune limite n'est
+    configurée pour ses routes (pas de surcoût).
+    """
+    if not any(name.startswith(f"{prefix}.") and rate for name, rate in LIMITS.items()):
+        return []
+    return [Depends(RateLimit(prefix, account_field))]
@@ -0,0 +1,212 @@
+"""
+Lectures sur réplicas, avec lecture de ses propres écritures.
+
+Avec ``DATABASE_REPLICA_URLS`` (URLs séparées par des virgules), les routes
+en lecture seule reçoivent, via ``get_read_db`` / ``get_async_read_db``, une
+session sur un réplica choisi à tour de rôle ; les écritures restent sur le
+primaire (``get_db``). Sans réplica, ces dépendances renvoient une session
+sur le primaire.
+
+Le primaire est préféré :
+
+- pour l'utilisateur qui vient d'écrire : toute transaction validée avec des
+  écritures par une session portant son identifiant (posé par
+  ``get_current_user``) le rend « collant » au primaire pendant
+  ``READ_YOUR_WRITES_SECONDS`` ; l'état est propre au processus, le délai
+  doit donc couvrir le retard toléré des réplicas ;
+- lorsqu'aucun réplica n'est à jour : le retard de chaque réplica est mesuré
+  au plus toutes les ``REPLICA_LAG_CHECK_INTERVAL`` secondes, et un réplica
+  en retard de plus de ``REPLICA_MAX_LAG`` secondes (ou injoignable) est
+  écarté jusqu'à la mesure suivante.
+"""
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+from typing import List, Optional
+
+from fastapi import Depends
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.auth import Principal, get_current_user, get_current_user_async
+from app.cache import TTLCache
+from app.database import (
+    POOL_OPTIONS, InstrumentedQueuePool, SessionLocal, _async_url, get_async_sessionmaker,
+)
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "5"))
+REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "5"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+
+# Retard de réplication (secondes) ; nul si le réplica a rejoué tout ce qu'il a reçu
+PG_REPLICATION_LAG = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+# Utilisateurs ayant récemment écrit : leurs lectures restent sur le primaire
+recent_writers = TTLCache(maxsize=100000, ttl=READ_YOUR_WRITES_SECONDS)
+
+
+class Replica:
+    """Réplica en lecture : moteurs créés à la demande et dernier retard mesuré."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.lag = 0.0
+        self._checked_at = -math.inf
+        self._lock = threading.Lock()
+        self._sessionmaker: Optional[sessionmaker] = None
+        self._async_sessionmaker: Optional[async_sessionmaker] = None
+
+    @property
+    def sessionmaker(self) -> sessionmaker:
+        if self._sessionmaker is None:
+            with self._lock:
+                if self._sessionmaker is None:
+                    engine = create_engine(
+                        self.url, poolclass=InstrumentedQueuePool, **POOL_OPTIONS
+                    )
+                    self._sessionmaker = sessionmaker(
+                        bind=engine, autocommit=False, autoflush=False
+                    )
+        return self._sessionmaker
+
+    @property
+    def async_sessionmaker(self) -> async_sessionmaker:
+        if self._async_sessionmaker is None:
+            url = _async_url(self.url)
+            engine = create_async_engine(url, **({} if url.startswith("sqlite") else POOL_OPTIONS))
+            self._async_sessionmaker = async_sessionmaker(
+                engine, class_=AsyncSession, autoflush=False
+            )
+        return self._async_sessionmaker
+
+    def _due(self) -> bool:
+        """Réserver la prochaine mesure du retard (un seul appelant par intervalle)."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at < REPLICA_LAG_CHECK_INTERVAL:
+                return False
+            self._checked_at = now
+            return True
+
+    def _record(self, lag: Optional[float], error: Optional[Exception] = None) -> None:
+        if error is not None:
+            logger.warning("réplica %s injoignable, écarté : %s", self.url, error)
+            lag = math.inf
+        self.lag = float(lag or 0)
+
+    def refresh_lag(self) -> None:
+        """Mesurer le retard si l'intervalle est écoulé (session synchrone)."""
+        if not self._due():
+            return
+        try:
+            with self.sessionmaker() as session:
+                self._record(_measure(session))
+        except Exception as exc:
+            self._record(None, exc)
+
+    async def refresh_lag_async(self) -> None:
+        """Mesurer le retard si l'intervalle est écoulé (session asynchrone)."""
+        if not self._due():
+            return
+        try:
+            async with self.async_sessionmaker() as session:
+                self._record(await session.run_sync(_measure))
+        except Exception as exc:
+            self._record(None, exc)
+
+    @property
+    def available(self) -> bool:
+        return self.lag <= REPLICA_MAX_LAG
+
+
+def _measure(session: Session) -> float:
+    """Retard de réplication du serveur de la session (0 hors PostgreSQL)."""
+    if session.get_bind().dialect.name != "postgresql":
+        return 0.0
+    return session.execute(PG_REPLICATION_LAG).scalar()
+
+
+REPLICAS: List[Replica] = [Replica(url) for url in DATABASE_REPLICA_URLS]
+_turn = itertools.count()
+
+
+def _candidates(principal: Principal) -> List[Replica]:
+    """Réplicas utilisables pour ``principal``, dans l'ordre du tour de rôle."""
+    if not REPLICAS or recent_writers.get(principal.id):
+        return []
+    start = next(_turn)
+    return [REPLICAS[(start + i) % len(REPLICAS)] for i in range(len(REPLICAS))]
+
+
+def read_sessionmaker(principal: Principal):
+    """Fabrique de sessions pour les lectures de ``principal`` : réplica à jour, sinon primaire."""
+    for replica in _candidates(principal):
+        replica.refresh_lag()
+        if replica.available:
+            return replica.sessionmaker
+    return SessionLocal
+
+
+async def async_read_sessionmaker(principal: Principal):
+    """Équivalent asynchrone de ``read_sessionmaker``."""
+    for replica in _candidates(principal):
+        await replica.refresh_lag_async()
+        if replica.available:
+            return replica.async_sessionmaker
+    return get_async_sessionmaker()
+
+
+def get_read_db(principal: Principal = Depends(get_current_user)):
+    """
+    Dépendance pour obtenir une session de lecture (réplica ou primaire).
+    """
+    db = read_sessionmaker(principal)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(principal: Principal = Depends(get_current_user_async)):
+    """
+    Dépendance pour obtenir une session de lecture asynchrone (réplica ou primaire).
+    """
+    async with (await async_read_sessionmaker(principal))() as db:
+        yield db
+
+
+@event.listens_for(Session, "after_flush")
+def _flushed(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _executed(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _track_writer(session: Session) -> None:
+    """Rendre l'auteur d'une transaction avec écritures collant au primaire."""
+    if session.info.pop("wrote", False) and "principal_id" in session.info:
+        recent_writers.set(session.info["principal_id"], True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_writes(session: Session) -> None:
+    session.info.pop("wrote", None)
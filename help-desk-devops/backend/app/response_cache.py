@@ -0,0 +1,285 @@
+"""
+Cache versionné des réponses de lecture des tickets (optionnel, ``RESPONSE_CACHE=true``).
+
+La liste (``GET /api/tickets/``) et le détail (``GET /api/tickets/{id}``)
+sont mis en cache une fois encodés, corps et validateurs (ETag,
+Last-Modified) compris. La clé d'une entrée réunit les paramètres normalisés
+de la requête et les versions des données servies :
+
+- ``all`` : toutes les réponses (opérations par lot) ;
+- ``list`` : les pages de la liste ;
+- ``ticket:<id>`` : le détail d'un ticket.
+
+Une écriture n'efface rien : elle incrémente les versions concernées, à la
+publication de son événement (``app.events``), et les anciennes entrées ne
+sont plus jamais lues avant d'expirer (invalidation en O(1), sans parcours
+des clés). Les versions sont lues avant la requête SQL : une entrée calculée
+pendant une écriture est rangée sous l'ancienne version.
+
+Deux niveaux :
+
+- en mémoire du processus (``TTLCache``, LRU borné) ; les versions sont
+  propres au processus et incrémentées par chaque événement reçu, y compris
+  ceux relayés par ``LISTEN`` depuis les autres workers ;
+- partagé (``RESPONSE_CACHE_SHARED=database``) : entrées et versions dans
+  les tables ``response_cache_entries`` et ``response_cache_versions``, les
+  versions n'étant incrémentées que par le worker qui écrit.
+
+Les entrées expirent après ``RESPONSE_CACHE_TTL`` secondes, ce qui borne
+aussi l'écart possible avec un réplica en retard (cf. ``app.replicas``).
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+from fastapi import Response
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.cache import TTLCache
+from app.conditional import etag_matches, modified_since, not_modified
+from app.database import get_engine
+from app.events import broker, on_publish
+from app.metrics import RESPONSE_CACHE_LOOKUPS
+from app.models import CachedResponseEntry, CacheVersion
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "false").lower() == "true"
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1000"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_SHARED = os.getenv("RESPONSE_CACHE_SHARED", "").lower()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """Réponse JSON encodée et ses en-têtes de validation."""
+    body: bytes
+    headers: Dict[str, str]
+
+    def respond(
+        self, if_none_match: Optional[str] = None, if_modified_since: Optional[str] = None
+    ) -> Response:
+        """Réponse complète, ou 304 si les validateurs du client correspondent."""
+        # If-None-Match prime sur If-Modified-Since (RFC 9110, 13.2.2)
+        if if_none_match is not None:
+            if etag_matches(if_none_match, self.headers["ETag"]):
+                return not_modified(self.headers)
+        elif if_modified_since and "Last-Modified" in self.headers:
+            last_modified = parsedate_to_datetime(self.headers["Last-Modified"])
+            if not modified_since(if_modified_since, last_modified):
+                return not_modified(self.headers)
+        return Response(self.body, headers=self.headers, media_type="application/json")
+
+
+@dataclass(frozen=True)
+class Slot:
+    """Emplacement d'une réponse : clé en mémoire et clé partagée, versions comprises."""
+    resource: str
+    local_key: Hashable
+    shared_key: str
+
+
+class LocalVersions:
+    """
+    Versions du processus. Chaque incrément prend une valeur jamais utilisée
+    (compteur global) : une version oubliée retombe à 0 sans jamais
+    ressusciter d'anciennes entrées, d'où la purge des versions plus
+    anciennes que la durée de vie des entrées.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._versions: Dict[str, Tuple[int, float]] = {}
+        self._counter = 0
+        self._next_purge = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, names: Sequence[str]) -> Tuple[int, ...]:
+        versions = self._versions
+        return tuple(versions.get(name, (0, 0.0))[0] for name in names)
+
+    def bump(self, names: Sequence[str]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for name in names:
+                self._counter += 1
+                self._versions[name] = (self._counter, now)
+            if now >= self._next_purge:
+                self._next_purge = now + self.ttl
+                self._versions = {
+                    name: value
+                    for name, value in self._versions.items()
+                    if value[1] >= now - self.ttl
+                }
+
+
+class DatabaseTier:
+    """Niveau partagé : entrées et versions en base (PostgreSQL, ou SQLite en test)."""
+
+    def __init__(self, engine=None):
+        self._engine = engine
+        self._next_purge = 0.0
+
+    @property
+    def engine(self):
+        return self._engine or get_engine()
+
+    def versions(self, names: Sequence[str]) -> Tuple[int, ...]:
+        with self.engine.connect() as connection:
+            rows = dict(connection.execute(
+                select(CacheVersion.name, CacheVersion.version).where(CacheVersion.name.in_(names))
+            ).all())
+        return tuple(rows.get(name, 0) for name in names)
+
+    def bump(self, names: Sequence[str]) -> None:
+        table = CacheVersion.__table__
+        with self.engine.begin() as connection:
+            dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+            for name in names:
+                upsert = dialect.insert(table).values(name=name, version=1)
+                connection.execute(upsert.on_conflict_do_update(
+                    index_elements=[table.c.name], set_={"version": table.c.version + 1}
+                ))
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        table = CachedResponseEntry.__table__
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                select(table.c.body, table.c.headers)
+                .where(table.c.key == key, table.c.expires_at > time.time())
+            ).first()
+        return CachedResponse(row.body, json.loads(row.headers)) if row else None
+
+    def set(self, key: str, entry: CachedResponse, ttl: float) -> None:
+        table = CachedResponseEntry.__table__
+        now = time.time()
+        with self.engine.begin() as connection:
+            dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+            upsert = dialect.insert(table).values(
+                key=key, body=entry.body, headers=json.dumps(entry.headers), expires_at=now + ttl
+            )
+            connection.execute(upsert.on_conflict_do_update(
+                index_elements=[table.c.key],
+                set_={"body": upsert.excluded.body, "headers": upsert.excluded.headers,
+                      "expires_at": upsert.excluded.expires_at},
+            ))
+            if now >= self._next_purge:
+                self._next_purge = now + ttl
+                connection.execute(delete(table).where(table.c.expires_at <= now))
+
+
+def event_versions(event: dict) -> Tuple[str, ...]:
+    """Versions rendues obsolètes par un événement de ``app.events``."""
+    kind = event.get("type", "")
+    if kind.startswith("ticket.") and "ticket_id" in event:
+        return ("list", f"ticket:{event['ticket_id']}")
+    if kind == "comment.created" and "ticket_id" in event:
+        return (f"ticket:{event['ticket_id']}",)
+    return ("all",)
+
+
+class ResponseCache:
+    """Cache des réponses, en mémoire et éventuellement partagé."""
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL,
+                 shared: Optional[DatabaseTier] = None):
+        self.ttl = ttl
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.local_versions = LocalVersions(ttl)
+        self.shared = shared
+        self.shared_hits = 0
+
+    def lookup(
+        self, resource: str, params: tuple, *names: str
+    ) -> Tuple[Optional[CachedResponse], Optional[Slot]]:
+        """
+        Chercher la réponse de ``resource`` pour ``params`` (valeurs
+        normalisées, hachables) aux versions courantes de ``names``.
+
+        Retourne l'entrée trouvée et l'emplacement où ranger la réponse
+        calculée ; ``(None, None)`` si le cache est désactivé.
+        """
+        if not RESPONSE_CACHE:
+            return None, None
+        names = ("all", *names)
+        if self.shared is not None:
+            try:
+                versions = self.shared.versions(names)
+            except Exception:
+                logger.exception("response_cache: versions partagées illisibles, cache ignoré")
+                return None, None
+        else:
+            versions = self.local_versions.get(names)
+        local_key = (resource, params, versions)
+        slot = Slot(resource, local_key, hashlib.sha256(repr(local_key).encode()).hexdigest())
+
+        entry = self.local.get(local_key)
+        if entry is not None:
+            RESPONSE_CACHE_LOOKUPS.labels(resource, "hit").inc()
+            return entry, slot
+        if self.shared is not None:
+            try:
+                entry = self.shared.get(slot.shared_key)
+            except Exception:
+                logger.exception("response_cache: entrée partagée illisible, traitée comme absente")
+                entry = None
+            if entry is not None:
+                self.shared_hits += 1
+                self.local.set(local_key, entry)
+                RESPONSE_CACHE_LOOKUPS.labels(resource, "shared_hit").inc()
+                return entry, slot
+        RESPONSE_CACHE_LOOKUPS.labels(resource, "miss").inc()
+        return None, slot
+
+    def store(self, slot: Optional[Slot], entry: CachedResponse) -> None:
+        """Ranger une réponse calculée à l'emplacement retourné par ``lookup``."""
+        if slot is None:
+            return
+        self.local.set(slot.local_key, entry)
+        if self.shared is not None:
+            try:
+                self.shared.set(slot.shared_key, entry, self.ttl)
+            except Exception:
+                logger.exception("response_cache: écriture partagée impossible")
+
+    def published(self, db, event: dict) -> None:
+        """Écriture dans ce worker : incrémenter les versions avant la diffusion."""
+        if not RESPONSE_CACHE:
+            return
+        names = event_versions(event)
+        self.local_versions.bump(names)
+        if self.shared is not None:
+            try:
+                self.shared.bump(names)
+            except Exception:
+                # L'écriture est validée : les entrées périmées expireront après RESPONSE_CACHE_TTL
+                logger.exception("response_cache: versions partagées non incrémentées %s", names)
+
+    def dispatched(self, event: dict) -> None:
+        """Événement reçu (y compris d'un autre worker) : versions du processus."""
+        if RESPONSE_CACHE and self.shared is None:
+            self.local_versions.bump(event_versions(event))
+
+    def stats(self) -> dict:
+        return {
+            **self.local.stats(), "shared": self.shared is not None,
+            "shared_hits": self.shared_hits,
+        }
+
+
+if RESPONSE_CACHE_SHARED not in ("", "database"):
+    raise ValueError(f"RESPONSE_CACHE_SHARED inconnu : {RESPONSE_CACHE_SHARED!r}")
+
+response_cache = ResponseCache(
+    shared=DatabaseTier() if RESPONSE_CACHE_SHARED == "database" else None
+)
+on_publish(lambda db, event: response_cache.published(db, event))
+broker.observe(lambda event: response_cache.dispatched(event))
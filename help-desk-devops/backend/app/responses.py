@@ -0,0 +1,130 @@
+"""
+Encodage JSON rapide des réponses (optionnel, ``FAST_JSON=true``).
+
+Par défaut, FastAPI valide l'objet renvoyé par une route contre son
+``response_model`` (dans un second passage par le pool de threads pour les
+routes synchrones), le convertit en dictionnaires puis l'encode avec le
+module ``json`` de la bibliothèque standard.
+
+Avec ``FAST_JSON=true`` :
+
+- les routes déclarées avec ``FastJSONRoute`` valident leur résultat une
+  seule fois (``TypeAdapter`` du ``response_model``) et l'encodent
+  directement en octets par pydantic-core, dans le thread de la route ;
+- les autres réponses JSON (dictionnaires, ``DefaultJSONResponse``) sont
+  encodées par orjson.
+
+Le contenu des réponses est identique dans les deux modes ; seul le coût de
+sérialisation change (``python -m benchmarks.serialization``).
+"""
+import asyncio
+import functools
+import inspect
+import os
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter, ValidationError
+
+FAST_JSON = os.getenv("FAST_JSON", "false").lower() == "true"
+
+# Classe des réponses JSON construites hors response_model
+DefaultJSONResponse = ORJSONResponse if FAST_JSON else JSONResponse
+
+# Paramètre ajouté aux routes qui ne déclarent pas déjà la réponse partielle
+_SUB_RESPONSE = "fast_json_response"
+
+
+def _sub_response_parameter(signature: inspect.Signature):
+    """Nom du paramètre ``Response`` de la route, s'il existe."""
+    for parameter in signature.parameters.values():
+        if isinstance(parameter.annotation, type) and issubclass(parameter.annotation, Response):
+            return parameter.name
+    return None
+
+
+def _render(
+    adapter: TypeAdapter, content: Any, status_code: int, sub_response: Response
+) -> Response:
+    """Valider une fois et encoder le résultat d'une route, en-têtes de la route compris."""
+    if isinstance(content, Response):
+        return content
+    try:
+        value = adapter.validate_python(content)
+    except ValidationError as exc:
+        raise ResponseValidationError(errors=exc.errors(), body=content)
+    response = Response(
+        adapter.dump_json(value, by_alias=True),
+        status_code=sub_response.status_code or status_code,
+        media_type="application/json",
+    )
+    response.headers.raw.extend(sub_response.headers.raw)
+    return response
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def dump_json(model: Any, content: Any) -> bytes:
+    """Valider ``content`` contre ``model`` et l'encoder comme le ferait la route."""
+    adapter = _adapter(model)
+    return adapter.dump_json(adapter.validate_python(content), by_alias=True)
+
+
+def fast_json_endpoint(endpoint: Callable, response_model: Any, status_code: int) -> Callable:
+    """
+    Envelopper une route pour qu'elle renvoie directement une réponse encodée :
+    FastAPI ne repasse alors ni par la validation ni par ``jsonable_encoder``.
+    """
+    adapter = TypeAdapter(response_model)
+    signature = inspect.signature(endpoint)
+    declared = _sub_response_parameter(signature)
+    name = declared or _SUB_RESPONSE
+    if declared is None:
+        signature = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+        ])
+
+    def arguments(kwargs: dict):
+        sub_response = kwargs[name] if declared else kwargs.pop(name)
+        return kwargs, sub_response
+
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            kwargs, sub_response = arguments(kwargs)
+            return _render(adapter, await endpoint(**kwargs), status_code, sub_response)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(**kwargs):
+            kwargs, sub_response = arguments(kwargs)
+            return _render(adapter, endpoint(**kwargs), status_code, sub_response)
+
+    wrapper.__signature__ = signature
+    # include_router recrée la route à partir de cette fonction : ne pas l'envelopper deux fois
+    wrapper.fast_json = True
+    return wrapper
+
+
+class FastJSONRoute(APIRoute):
+    """Route dont le résultat est encodé par ``fast_json_endpoint`` si ``FAST_JSON`` est actif."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        response_model = kwargs.get("response_model")
+        if (
+            FAST_JSON
+            and response_model is not None
+            and not isinstance(response_model, DefaultPlaceholder)
+            and not getattr(endpoint, "fast_json", False)
+        ):
+            endpoint = fast_json_endpoint(
+                endpoint, response_model, kwargs.get("status_code") or 200
+            )
+        super().__init__(path, endpoint, **kwargs)
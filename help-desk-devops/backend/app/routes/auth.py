@@ -1,21 +1,45 @@
-"""Routes d'authentification."""
+"""
+Routes d'authentification.
+
+Ces routes sont asynchrones : le calcul bcrypt est attendu sur la boucle
+d'événements pendant qu'il s'exécute dans le pool de processus de
+``app.hashing``, et seuls les accès à la base passent par le pool de threads.
+"""
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
 from app.schemas import LoginRequest, TokenResponse, UserCreate, UserResponse
-from app.auth import hash_password, verify_password, create_access_token
+from app.auth import create_access_token
+from app.ratelimit import rate_limit_dependencies
+from app.responses import FastJSONRoute
+from app.hashing import hash_password_async, verify_password_async, needs_rehash
+
+router = APIRouter(
+    prefix="/api/auth", tags=["auth"], route_class=FastJSONRoute,
+    dependencies=rate_limit_dependencies("auth", account_field="email"),
+)
+
 
-router = APIRouter(prefix="/api/auth", tags=["auth"])
+def _find_user(db: Session, *criteria) -> Optional[User]:
+    return db.query(User).filter(*criteria).first()
+
+
+def _save(db: Session, user: User) -> None:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Enregistrer un nouvel utilisateur."""
     # Vérifier si l'utilisateur existe déjà
-    existing_user = db.query(User).filter(
-        (User.email == user_data.email) | (User.username == user_data.username)
-    ).first()
+    existing_user = await run_in_threadpool(
+        _find_user, db, (User.email == user_data.email) | (User.username == user_data.username)
+    )
     
     if existing_user:
         raise HTTPException(
@@ -28,25 +52,23 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         email=user_data.email,
         username=user_data.username,
         full_name=user_data.full_name,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await hash_password_async(user_data.password),
         is_active=True,
         is_admin=False
     )
     
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(_save, db, new_user)
     
     return new_user
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: LoginRequest, db: Session = Depends(get_db)):
+async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
     """Connexion utilisateur."""
     # Rechercher l'utilisateur par email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await run_in_threadpool(_find_user, db, User.email == credentials.email)
     
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await verify_password_async(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -58,8 +80,16 @@ def login(credentials: LoginRequest, db: Session = Depends(get_db)):
             detail="User account is inactive"
         )
     
+    # Recalculer un hachage de coût obsolète tant que le mot de passe est connu
+    if needs_rehash(user.hashed_password):
+        try:
+            user.hashed_password = await hash_password_async(credentials.password)
+            await run_in_threadpool(_save, db, user)
+        except HTTPException:
+            pass  # Pool saturé : le recalcul sera retenté à la prochaine connexion
+    
     # Créer le token JWT
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_access_token(data={"sub": str(user.id)})
     
     return TokenResponse(
         access_token=access_token,
@@ -0,0 +1,87 @@
+"""Routes d'authentification (pile asynchrone)."""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.models import User
+from app.schemas import LoginRequest, TokenResponse, UserCreate, UserResponse
+from app.auth import create_access_token
+from app.ratelimit import rate_limit_dependencies
+from app.responses import FastJSONRoute
+from app.hashing import hash_password_async, verify_password_async, needs_rehash
+
+router = APIRouter(
+    prefix="/api/auth", tags=["auth"], route_class=FastJSONRoute,
+    dependencies=rate_limit_dependencies("auth", account_field="email"),
+)
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """Enregistrer un nouvel utilisateur."""
+    # Vérifier si l'utilisateur existe déjà
+    existing_user = (await db.execute(
+        select(User).filter(
+            (User.email == user_data.email) | (User.username == user_data.username)
+        ).limit(1)
+    )).scalar_one_or_none()
+    
+    if existing_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email or username already registered"
+        )
+    
+    new_user = User(
+        email=user_data.email,
+        username=user_data.username,
+        full_name=user_data.full_name,
+        hashed_password=await hash_password_async(user_data.password),
+        is_active=True,
+        is_admin=False
+    )
+    
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    
+    return new_user
+
+
+@router.post("/login", response_model=TokenResponse)
+async def login(credentials: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    """Connexion utilisateur."""
+    # Rechercher l'utilisateur par email
+    user = (await db.execute(
+        select(User).filter(User.email == credentials.email)
+    )).scalar_one_or_none()
+    
+    if not user or not await verify_password_async(credentials.password, user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password"
+        )
+    
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+    
+    # Recalculer un hachage de coût obsolète tant que le mot de passe est connu
+    if needs_rehash(user.hashed_password):
+        try:
+            user.hashed_password = await hash_password_async(credentials.password)
+            await db.commit()
+            await db.refresh(user)
+        except HTTPException:
+            pass  # Pool saturé : le recalcul sera retenté à la prochaine connexion
+    
+    # Créer le token JWT
+    access_token = create_access_token(data={"sub": str(user.id)})
+    
+    return TokenResponse(
+        access_token=access_token,
+        token_type="bearer",
+        user=user
+    )
@@ -0,0 +1,26 @@
+"""Flux des changements de tickets (Server-Sent Events)."""
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from app.auth import Principal, get_current_user_detached
+from app.events import broker, stream_events
+
+router = APIRouter(prefix="/api/tickets", tags=["tickets"])
+
+
+@router.get("/stream")
+async def stream(
+    request: Request,
+    current_user: Principal = Depends(get_current_user_detached)
+):
+    """
+    S'abonner aux changements des tickets.
+
+    Chaque message ``data:`` est un événement JSON : ``ticket.created``,
+    ``ticket.updated``, ``ticket.deleted``, ``comment.created`` ou ``resync``.
+    """
+    subscriber = broker.subscribe()
+    return StreamingResponse(
+        stream_events(request, subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
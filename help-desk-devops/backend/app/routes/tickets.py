@@ -1,23 +1,52 @@
 """Routes pour la gestion des tickets."""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Header, Response, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 from datetime import datetime
 from app.database import get_db
-from app.models import User, Ticket, TicketStatus
+from app.models import Ticket, Comment, TicketStatus
 from app.schemas import (
-    TicketCreate, TicketUpdate, TicketResponse, TicketListResponse, CommentCreate, CommentResponse
+    TicketCreate, TicketUpdate, TicketResponse, TicketListResponse, TicketPage,
+    TicketSearchPage, TicketStats, CommentCreate, CommentResponse, CommentPage,
+    TicketBatchCreate, TicketBatchUpdate, TicketBatchAssign, BatchResult
+)
+from app.auth import Principal, get_current_admin, get_current_user
+from app.queries import (
+    comment_query, comment_page, comment_thread, ticket_detail, ticket_with_version,
+    ticket_list_query, ticket_list_item
+)
+from app.pagination import keyset_page
+from app.filters import TicketFilters, ticket_filters, apply_filters, sort_key
+from app.search import delete_ticket_comments, search_tickets
+from app.stats import read_stats
+from app.export import ExportFormat, MEDIA_TYPES, export_tickets, gzip_stream
+from app.archive import archived_comment_page, archived_ticket_detail, archived_ticket_version
+from app.bulk import create_tickets, update_tickets, assign_tickets
+from app.events import publish, ticket_event, ticket_deleted_event, comment_event
+from app.replicas import get_read_db
+from app.ratelimit import rate_limit_dependencies
+from app.responses import DefaultJSONResponse, FastJSONRoute, dump_json
+from app.response_cache import CachedResponse, response_cache
+from app.conditional import (
+    etag_matches, not_modified, validator_headers,
+    ticket_etag, loaded_ticket_etag, weak_etag
 )
-from app.auth import get_current_user
 
-router = APIRouter(prefix="/api/tickets", tags=["tickets"])
+# Type des exports en flux (une ligne JSON par élément)
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+router = APIRouter(
+    prefix="/api/tickets", tags=["tickets"], route_class=FastJSONRoute,
+    dependencies=rate_limit_dependencies("tickets"),
+)
 
 
 @router.post("/", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
 def create_ticket(
     ticket_data: TicketCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Créer un nouveau ticket."""
     new_ticket = Ticket(
@@ -30,51 +59,211 @@ def create_ticket(
     
     db.add(new_ticket)
     db.commit()
-    db.refresh(new_ticket)
     
-    return new_ticket
+    ticket, _, _ = ticket_detail(db, new_ticket.id)
+    publish(db, ticket_event("created", ticket))
+    return ticket
+
+
+@router.post("/batch", response_model=BatchResult)
+def create_tickets_batch(
+    batch: TicketBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Créer des tickets par lot ; chaque élément reçoit son propre statut."""
+    return create_tickets(db, batch.items, current_user.id)
+
+
+@router.patch("/batch", response_model=BatchResult)
+def update_tickets_batch(
+    batch: TicketBatchUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Mettre à jour des tickets par lot (champs de TicketUpdate et ``id``)."""
+    return update_tickets(db, batch.items, current_user)
+
+
+@router.post("/batch/assign", response_model=BatchResult)
+def assign_tickets_batch(
+    batch: TicketBatchAssign,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Assigner des tickets par lot au même agent."""
+    return assign_tickets(db, batch.ticket_ids, batch.assigned_to_id, current_user)
 
 
-@router.get("/", response_model=List[TicketListResponse])
+@router.get("/", response_model=Union[TicketPage, List[TicketListResponse]])
 def list_tickets(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    status: str = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(
+        None, description="Curseur de pagination ; vide pour la première page"
+    ),
+    filters: TicketFilters = Depends(ticket_filters),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Lister tous les tickets."""
-    query = db.query(Ticket)
+    """
+    Lister les tickets, filtrés et triés côté serveur (par défaut, du plus
+    récent au plus ancien).
+
+    Avec ``cursor`` (vide pour la première page), la réponse est une page
+    ``{items, next_cursor}`` paginée par curseur. Sans ``cursor``, le mode
+    historique ``skip``/``limit`` retourne une simple liste.
+
+    La page porte un ETag (ids et ``updated_at`` des tickets) et un
+    ``Last-Modified`` ; une page inchangée (``If-None-Match``) est répondue
+    en 304 sans sérialisation. ``If-Modified-Since`` n'est pas honoré : le
+    plus récent ``updated_at`` de la page ne change ni à la suppression ou
+    à l'archivage d'un ticket, ni quand un ticket sort du filtre. Les lignes
+    de la projection sont sérialisées directement, sans objets ORM ni
+    validation du schéma de réponse.
+
+    Avec ``RESPONSE_CACHE``, la page encodée est servie depuis le cache tant
+    qu'aucune écriture n'a modifié la liste.
+    """
+    cached, slot = response_cache.lookup("tickets", (skip, limit, cursor, filters), "list")
+    if cached is not None:
+        return cached.respond(if_none_match)
     
-    if status:
-        try:
-            status_enum = TicketStatus(status)
-            query = query.filter(Ticket.status == status_enum)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid status: {status}"
-            )
+    query = apply_filters(ticket_list_query(db), filters)
+    key = sort_key(filters, db.get_bind().dialect.name)
+    descending = filters.order == "desc"
     
-    tickets = query.offset(skip).limit(limit).all()
-    return tickets
+    next_cursor = None
+    if cursor is not None:
+        tickets, next_cursor = keyset_page(query, key, Ticket.id, cursor, limit, descending)
+    else:
+        if descending:
+            query = query.order_by(key.desc(), Ticket.id.desc())
+        else:
+            query = query.order_by(key.asc(), Ticket.id.asc())
+        tickets = query.offset(skip).limit(limit).all()
+    
+    etag = weak_etag(
+        "tickets", next_cursor, *((ticket.id, ticket.updated_at) for ticket in tickets)
+    )
+    last_modified = max(
+        (ticket.updated_at for ticket in tickets if ticket.updated_at), default=None
+    )
+    headers = validator_headers(etag, last_modified)
+    if slot is not None:
+        items = [ticket_list_item(ticket) for ticket in tickets]
+        content = {"items": items, "next_cursor": next_cursor} if cursor is not None else items
+        cached = CachedResponse(DefaultJSONResponse(content).body, headers)
+        response_cache.store(slot, cached)
+        return cached.respond(if_none_match)
+    if etag_matches(if_none_match, etag):
+        return not_modified(headers)
+    
+    items = [ticket_list_item(ticket) for ticket in tickets]
+    if cursor is not None:
+        return DefaultJSONResponse({"items": items, "next_cursor": next_cursor}, headers=headers)
+    return DefaultJSONResponse(items, headers=headers)
+
+
+@router.get("/search", response_model=TicketSearchPage)
+def search(
+    q: str = Query(..., min_length=2, max_length=200, description="Termes recherchés"),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Rechercher dans les titres, descriptions et commentaires des tickets."""
+    hits, next_cursor = search_tickets(db, q, cursor, limit)
+    return TicketSearchPage(items=hits, next_cursor=next_cursor)
+
+
+@router.get("/stats", response_model=TicketStats)
+def stats(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Statistiques des tickets par statut et priorité, et charge par agent."""
+    return read_stats(db)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export(
+    format: ExportFormat = Query("ndjson", description="ndjson ou csv"),
+    comments: bool = Query(True, description="Inclure les commentaires"),
+    gzip: bool = Query(False, description="Compresser le flux (Content-Encoding: gzip)"),
+    filters: TicketFilters = Depends(ticket_filters),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_admin)
+):
+    """
+    Exporter les tickets (filtres et tri de la liste) et leurs commentaires
+    en NDJSON ou CSV, lus et envoyés par lots : la mémoire reste constante
+    quel que soit le nombre de tickets. Réservé aux administrateurs.
+    """
+    body = export_tickets(db, filters, format, with_comments=comments)
+    headers = {"Content-Disposition": f'attachment; filename="tickets.{format}"'}
+    if gzip:
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=MEDIA_TYPES[format], headers=headers)
+
+
+def _ticket_not_modified(db: Session, resource: str, ticket_id: int, if_none_match: Optional[str]):
+    """Réponse 304 si ``If-None-Match`` correspond à la version du ticket, sinon ``None``."""
+    if not if_none_match:
+        return None
+    etag = ticket_etag(db, resource, ticket_id)
+    # Ticket absent ou archivé : validé après chargement
+    if etag is None:
+        return None
+    if etag_matches(if_none_match, etag):
+        return not_modified(validator_headers(etag))
+    return None
 
 
 @router.get("/{ticket_id}", response_model=TicketResponse)
 def get_ticket(
     ticket_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Obtenir les détails d'un ticket."""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    """
+    Obtenir les détails d'un ticket (304 si la version est inchangée).
+
+    Seuls les premiers commentaires sont intégrés (``TICKET_COMMENTS_LIMIT``) ;
+    ``comment_count`` donne le total et ``comments_next_cursor`` la suite.
+    """
+    cached, slot = response_cache.lookup("ticket", (ticket_id,), f"ticket:{ticket_id}")
+    if cached is not None:
+        return cached.respond(if_none_match)
     
-    if not ticket:
+    unchanged = _ticket_not_modified(db, "ticket", ticket_id, if_none_match)
+    if unchanged is not None:
+        return unchanged
+    
+    detail = ticket_detail(db, ticket_id) or archived_ticket_detail(db, ticket_id)
+    
+    if not detail:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket not found"
         )
     
+    ticket, comment_count, last_comment_at = detail
+    headers = validator_headers(
+        loaded_ticket_etag("ticket", ticket, comment_count, last_comment_at)
+    )
+    if etag_matches(if_none_match, headers["ETag"]):
+        return not_modified(headers)
+    if slot is not None:
+        cached = CachedResponse(dump_json(TicketResponse, ticket), headers)
+        response_cache.store(slot, cached)
+        return cached.respond()
+    response.headers.update(headers)
     return ticket
 
 
@@ -83,7 +272,7 @@ def update_ticket(
     ticket_id: int,
     ticket_data: TicketUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Mettre à jour un ticket."""
     ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
@@ -118,8 +307,9 @@ def update_ticket(
     ticket.updated_at = datetime.utcnow()
     
     db.commit()
-    db.refresh(ticket)
     
+    ticket, _, _ = ticket_detail(db, ticket_id)
+    publish(db, ticket_event("updated", ticket))
     return ticket
 
 
@@ -127,7 +317,7 @@ def update_ticket(
 def delete_ticket(
     ticket_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Supprimer un ticket."""
     ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
@@ -145,8 +335,11 @@ def delete_ticket(
             detail="You do not have permission to delete this ticket"
         )
     
+    # Une requête pour les commentaires, plutôt qu'une par commentaire (cascade)
+    delete_ticket_comments(db, [ticket.id])
     db.delete(ticket)
     db.commit()
+    publish(db, ticket_deleted_event(ticket_id))
 
 
 @router.post("/{ticket_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
@@ -154,11 +347,9 @@ def add_comment(
     ticket_id: int,
     comment_data: CommentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Ajouter un commentaire à un ticket."""
-    from app.models import Comment
-    
     ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
     
     if not ticket:
@@ -175,27 +366,84 @@ def add_comment(
     
     db.add(new_comment)
     db.commit()
-    db.refresh(new_comment)
     
-    return new_comment
+    comment = comment_query(db).filter(Comment.id == new_comment.id).one()
+    publish(db, comment_event(comment))
+    return comment
 
 
-@router.get("/{ticket_id}/comments", response_model=List[CommentResponse])
+@router.get("/{ticket_id}/comments", response_model=Union[CommentPage, List[CommentResponse]])
 def get_comments(
     ticket_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        None, description="Curseur de pagination ; vide pour la première page"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Obtenir les commentaires d'un ticket."""
-    from app.models import Comment
+    """
+    Obtenir les commentaires d'un ticket, du plus ancien au plus récent (304
+    si la version est inchangée).
+
+    Avec ``cursor`` (vide pour la première page), la réponse est une page
+    ``{items, next_cursor}`` ; sans ``cursor``, une liste des ``limit``
+    premiers commentaires. Le fil complet s'exporte par ``/comments/export``.
+    """
+    # La page fait partie de la version : chaque URL a son propre ETag
+    resource = f"comments:{limit}:{cursor}"
+    unchanged = _ticket_not_modified(db, resource, ticket_id, if_none_match)
+    if unchanged is not None:
+        return unchanged
     
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    row = ticket_with_version(db, ticket_id)
+    archived = row is None
+    if archived:
+        row = archived_ticket_version(db, ticket_id)
     
-    if not ticket:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket not found"
         )
     
-    comments = db.query(Comment).filter(Comment.ticket_id == ticket_id).all()
+    ticket, comment_count, last_comment_at = row
+    headers = validator_headers(
+        loaded_ticket_etag(resource, ticket, comment_count, last_comment_at)
+    )
+    if etag_matches(if_none_match, headers["ETag"]):
+        return not_modified(headers)
+    if archived:
+        comments, next_cursor = archived_comment_page(db, ticket, cursor, limit)
+    else:
+        comments, next_cursor = comment_page(db, ticket_id, cursor, limit)
+    response.headers.update(headers)
+    if cursor is not None:
+        return CommentPage(items=comments, next_cursor=next_cursor)
     return comments
+
+
+def require_ticket(db: Session, ticket_id: int) -> None:
+    """Lever une erreur 404 si le ticket n'existe pas."""
+    if db.query(Ticket.id).filter(Ticket.id == ticket_id).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ticket not found"
+        )
+
+
+@router.get("/{ticket_id}/comments/export", response_class=StreamingResponse)
+def export_comments(
+    ticket_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Exporter le fil complet des commentaires en NDJSON (un ``CommentResponse``
+    par ligne), lu et envoyé par lots : la mémoire reste constante quelle que
+    soit la longueur du fil.
+    """
+    require_ticket(db, ticket_id)
+    return StreamingResponse(comment_thread(db, ticket_id), media_type=NDJSON_MEDIA_TYPE)
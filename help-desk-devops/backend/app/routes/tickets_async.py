@@ -0,0 +1,240 @@
+"""
+Routes pour la gestion des tickets (pile asynchrone).
+
+Chaque route délègue à son équivalent synchrone via ``AsyncSession.run_sync`` :
+le code ORM s'exécute dans un greenlet qui rend la main à la boucle
+d'événements à chaque attente réseau, sans occuper de thread du pool. La
+logique métier reste ainsi définie une seule fois, dans ``routes/tickets.py``.
+"""
+from fastapi import APIRouter, Depends, Header, Response, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+from app.database import get_async_db
+from app.schemas import (
+    TicketCreate, TicketUpdate, TicketResponse, TicketListResponse, TicketPage,
+    TicketSearchPage, TicketStats, CommentCreate, CommentResponse, CommentPage,
+    TicketBatchCreate, TicketBatchUpdate, TicketBatchAssign, BatchResult
+)
+from app.auth import Principal, get_current_admin_async, get_current_user_async
+from app.export import ExportFormat, MEDIA_TYPES, export_tickets_async, gzip_stream_async
+from app.filters import TicketFilters, ticket_filters
+from app.queries import comment_thread_async
+from app.replicas import get_async_read_db
+from app.ratelimit import rate_limit_dependencies
+from app.responses import FastJSONRoute
+from app.routes import tickets
+
+router = APIRouter(
+    prefix="/api/tickets", tags=["tickets"], route_class=FastJSONRoute,
+    dependencies=rate_limit_dependencies("tickets"),
+)
+
+
+@router.post("/", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
+async def create_ticket(
+    ticket_data: TicketCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Créer un nouveau ticket."""
+    return await db.run_sync(
+        lambda session: tickets.create_ticket(ticket_data, db=session, current_user=current_user)
+    )
+
+
+@router.post("/batch", response_model=BatchResult)
+async def create_tickets_batch(
+    batch: TicketBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Créer des tickets par lot ; chaque élément reçoit son propre statut."""
+    return await db.run_sync(
+        lambda session: tickets.create_tickets_batch(batch, db=session, current_user=current_user)
+    )
+
+
+@router.patch("/batch", response_model=BatchResult)
+async def update_tickets_batch(
+    batch: TicketBatchUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Mettre à jour des tickets par lot (champs de TicketUpdate et ``id``)."""
+    return await db.run_sync(
+        lambda session: tickets.update_tickets_batch(batch, db=session, current_user=current_user)
+    )
+
+
+@router.post("/batch/assign", response_model=BatchResult)
+async def assign_tickets_batch(
+    batch: TicketBatchAssign,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Assigner des tickets par lot au même agent."""
+    return await db.run_sync(
+        lambda session: tickets.assign_tickets_batch(batch, db=session, current_user=current_user)
+    )
+
+
+@router.get("/", response_model=Union[TicketPage, List[TicketListResponse]])
+async def list_tickets(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="Curseur de pagination ; vide pour la première page"
+    ),
+    filters: TicketFilters = Depends(ticket_filters),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Lister les tickets, filtrés et triés côté serveur."""
+    return await db.run_sync(
+        lambda session: tickets.list_tickets(
+            skip=skip, limit=limit, cursor=cursor, filters=filters,
+            if_none_match=if_none_match, db=session, current_user=current_user,
+        )
+    )
+
+
+@router.get("/search", response_model=TicketSearchPage)
+async def search(
+    q: str = Query(..., min_length=2, max_length=200, description="Termes recherchés"),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Rechercher dans les titres, descriptions et commentaires des tickets."""
+    return await db.run_sync(
+        lambda session: tickets.search(
+            q, limit=limit, cursor=cursor, db=session, current_user=current_user
+        )
+    )
+
+
+@router.get("/stats", response_model=TicketStats)
+async def stats(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Statistiques des tickets par statut et priorité, et charge par agent."""
+    return await db.run_sync(lambda session: tickets.stats(db=session, current_user=current_user))
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export(
+    format: ExportFormat = Query("ndjson", description="ndjson ou csv"),
+    comments: bool = Query(True, description="Inclure les commentaires"),
+    gzip: bool = Query(False, description="Compresser le flux (Content-Encoding: gzip)"),
+    filters: TicketFilters = Depends(ticket_filters),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_admin_async)
+):
+    """Exporter les tickets en NDJSON ou CSV, lus par ``AsyncSession.stream``."""
+    body = export_tickets_async(db, filters, format, with_comments=comments)
+    headers = {"Content-Disposition": f'attachment; filename="tickets.{format}"'}
+    if gzip:
+        body = gzip_stream_async(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=MEDIA_TYPES[format], headers=headers)
+
+
+@router.get("/{ticket_id}", response_model=TicketResponse)
+async def get_ticket(
+    ticket_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Obtenir les détails d'un ticket (304 si la version est inchangée)."""
+    return await db.run_sync(
+        lambda session: tickets.get_ticket(
+            ticket_id, response, if_none_match=if_none_match, db=session, current_user=current_user
+        )
+    )
+
+
+@router.put("/{ticket_id}", response_model=TicketResponse)
+async def update_ticket(
+    ticket_id: int,
+    ticket_data: TicketUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Mettre à jour un ticket."""
+    return await db.run_sync(
+        lambda session: tickets.update_ticket(
+            ticket_id, ticket_data, db=session, current_user=current_user
+        )
+    )
+
+
+@router.delete("/{ticket_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_ticket(
+    ticket_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Supprimer un ticket."""
+    await db.run_sync(
+        lambda session: tickets.delete_ticket(ticket_id, db=session, current_user=current_user)
+    )
+
+
+@router.post(
+    "/{ticket_id}/comments", response_model=CommentResponse, status_code=status.HTTP_201_CREATED
+)
+async def add_comment(
+    ticket_id: int,
+    comment_data: CommentCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Ajouter un commentaire à un ticket."""
+    return await db.run_sync(
+        lambda session: tickets.add_comment(
+            ticket_id, comment_data, db=session, current_user=current_user
+        )
+    )
+
+
+@router.get("/{ticket_id}/comments", response_model=Union[CommentPage, List[CommentResponse]])
+async def get_comments(
+    ticket_id: int,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        None, description="Curseur de pagination ; vide pour la première page"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """Obtenir les commentaires d'un ticket, par page (304 si la version est inchangée)."""
+    return await db.run_sync(
+        lambda session: tickets.get_comments(
+            ticket_id, response, limit=limit, cursor=cursor, if_none_match=if_none_match,
+            db=session, current_user=current_user,
+        )
+    )
+
+
+@router.get("/{ticket_id}/comments/export", response_class=StreamingResponse)
+async def export_comments(
+    ticket_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Principal = Depends(get_current_user_async)
+):
+    """
+    Exporter le fil complet des commentaires en NDJSON. Le flux est lu par
+    ``AsyncSession.stream`` : il ne peut pas passer par ``run_sync``.
+    """
+    await db.run_sync(lambda session: tickets.require_ticket(session, ticket_id))
+    return StreamingResponse(
+        comment_thread_async(db, ticket_id), media_type=tickets.NDJSON_MEDIA_TYPE
+    )
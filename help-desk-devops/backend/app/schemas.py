@@ -1,9 +1,10 @@
 """
 Schémas Pydantic pour la validation des données.
 """
+import os
 from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from enum import Enum
 
 
@@ -45,6 +46,9 @@ class UserUpdate(BaseModel):
 
 class UserResponse(UserBase):
     """Schéma de réponse pour un utilisateur."""
+    # Adresse déjà validée à l'inscription : pas de revalidation (email_validator)
+    # pour chaque utilisateur sérialisé
+    email: str = Field(..., json_schema_extra={"format": "email"})
     id: int
     is_active: bool
     is_admin: bool
@@ -55,11 +59,22 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class UserSummary(BaseModel):
+    """Résumé d'un utilisateur dans les listes (créateur, agent assigné)."""
+    id: int
+    username: str
+    full_name: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
 # ============ Schémas d'Authentification ============
 
 class LoginRequest(BaseModel):
     """Schéma pour la demande de connexion."""
-    email: EmailStr
+    # Pas d'EmailStr : les comptes de démonstration utilisent le domaine réservé .local
+    email: str = Field(..., max_length=255)
     password: str
 
 
@@ -95,6 +110,12 @@ class CommentResponse(CommentBase):
         from_attributes = True
 
 
+class CommentPage(BaseModel):
+    """Schéma pour une page de commentaires paginée par curseur."""
+    items: List[CommentResponse]
+    next_cursor: Optional[str] = None
+
+
 # ============ Schémas Ticket ============
 
 class TicketBase(BaseModel):
@@ -129,14 +150,24 @@ class TicketResponse(TicketBase):
     resolved_at: Optional[datetime]
     creator: UserResponse
     assigned_to: Optional[UserResponse]
+    # Premiers commentaires du fil seulement ; la suite via
+    # GET /api/tickets/{id}/comments?cursor=<comments_next_cursor>
     comments: List[CommentResponse] = []
+    comment_count: int = 0
+    comments_next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
 class TicketListResponse(BaseModel):
-    """Schéma pour la liste des tickets."""
+    """
+    Schéma pour la liste des tickets (sans description, utilisateurs résumés).
+
+    La liste est sérialisée directement depuis la projection de
+    ``queries.ticket_list_query`` ; ce schéma la documente et sert aux
+    événements et à la recherche.
+    """
     id: int
     title: str
     status: TicketStatus
@@ -145,13 +176,90 @@ class TicketListResponse(BaseModel):
     assigned_to_id: Optional[int]
     created_at: datetime
     updated_at: datetime
-    creator: UserResponse
-    assigned_to: Optional[UserResponse]
+    creator: UserSummary
+    assigned_to: Optional[UserSummary]
 
     class Config:
         from_attributes = True
 
 
+class TicketPage(BaseModel):
+    """Schéma pour une page de tickets paginée par curseur."""
+    items: List[TicketListResponse]
+    next_cursor: Optional[str] = None
+
+
+class TicketSearchHit(BaseModel):
+    """Schéma pour un résultat de recherche de tickets."""
+    ticket: TicketListResponse
+    rank: float
+    headline: Optional[str] = None
+
+
+class TicketSearchPage(BaseModel):
+    """Schéma pour une page de résultats de recherche."""
+    items: List[TicketSearchHit]
+    next_cursor: Optional[str] = None
+
+
+# ============ Schémas des Opérations par Lot ============
+# Les éléments des lots sont validés un par un (TicketCreate, TicketBatchUpdateItem)
+# afin qu'un élément invalide n'empêche pas l'écriture des autres.
+
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "1000"))
+
+
+class TicketBatchCreate(BaseModel):
+    """Schéma pour la création de tickets par lot."""
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=BATCH_MAX_SIZE)
+
+
+class TicketBatchUpdateItem(TicketUpdate):
+    """Schéma pour un élément d'une mise à jour par lot."""
+    id: int
+
+
+class TicketBatchUpdate(BaseModel):
+    """Schéma pour la mise à jour de tickets par lot."""
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=BATCH_MAX_SIZE)
+
+
+class TicketBatchAssign(BaseModel):
+    """Schéma pour l'assignation de tickets par lot."""
+    ticket_ids: List[int] = Field(..., min_length=1, max_length=BATCH_MAX_SIZE)
+    assigned_to_id: int
+
+
+class BatchItemResult(BaseModel):
+    """Schéma pour le résultat d'un élément d'un lot."""
+    index: int
+    id: Optional[int] = None
+    status: int
+    detail: Optional[Any] = None
+
+
+class BatchResult(BaseModel):
+    """Schéma pour le résultat d'une opération par lot."""
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
+
+
+class AssigneeOpenCount(BaseModel):
+    """Schéma pour le nombre de tickets ouverts d'un agent."""
+    assigned_to_id: Optional[int] = None
+    count: int
+
+
+class TicketStats(BaseModel):
+    """Schéma pour les statistiques agrégées des tickets."""
+    total: int
+    by_status: Dict[TicketStatus, int]
+    by_priority: Dict[TicketPriority, int]
+    by_status_priority: Dict[TicketStatus, Dict[TicketPriority, int]]
+    open_by_assignee: List[AssigneeOpenCount]
+
+
 # ============ Schémas de Réponse Générale ============
 
 class ErrorResponse(BaseModel):
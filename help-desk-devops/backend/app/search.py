@@ -0,0 +1,168 @@
+"""
+Recherche plein texte dans les tickets et leurs commentaires.
+
+Sur PostgreSQL, la recherche s'appuie sur ``tickets.search_vector`` (index
+GIN, maintenu par trigger) : correspondance ``@@`` avec
+``websearch_to_tsquery``, classement ``ts_rank_cd`` et extraits
+``ts_headline`` (HTML : texte échappé, termes entourés de ``<b>``). Sur les
+autres bases (SQLite pour les tests), un repli ``LIKE`` respecte le même
+contrat : tous les termes doivent apparaître et le classement pondère
+titre > description > commentaires.
+
+Les résultats sont paginés par curseur sur ``(rank, id)``.
+"""
+import html
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Float, and_, case, cast, delete, exists, func, or_, select, tuple_
+from sqlalchemy.orm import Session
+from app.models import Ticket, Comment, SEARCH_CONFIG
+from app.pagination import encode_key, decode_key
+from app.queries import ticket_query
+from app.schemas import TicketListResponse
+
+# Délimiteurs provisoires, remplacés par <b> une fois le texte échappé
+START_SEL, STOP_SEL = "\x02", "\x03"
+HEADLINE_OPTIONS = (
+    f'StartSel="{START_SEL}", StopSel="{STOP_SEL}", MaxWords=25, MinWords=10, MaxFragments=2'
+)
+# Repli SQLite : nombre de termes retenus et largeur de l'extrait
+MAX_TERMS = 8
+HEADLINE_WIDTH = 160
+
+
+def _terms(q: str) -> List[str]:
+    return re.findall(r"\w+", q.lower())[:MAX_TERMS]
+
+
+def _decode_position(cursor: str) -> Tuple[float, int]:
+    rank, ticket_id = decode_key(cursor, 2)
+    try:
+        return float(rank), int(ticket_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _postgres_match(q: str):
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = cast(func.ts_rank_cd(Ticket.search_vector, tsquery), Float)
+    return Ticket.search_vector.op("@@")(tsquery), rank
+
+
+def _fallback_match(terms: List[str]):
+    conditions, weights = [], []
+    for term in terms:
+        pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        in_title = Ticket.title.ilike(pattern, escape="\\")
+        in_description = Ticket.description.ilike(pattern, escape="\\")
+        in_comments = exists().where(
+            Comment.ticket_id == Ticket.id, Comment.content.ilike(pattern, escape="\\")
+        )
+        conditions.append(or_(in_title, in_description, in_comments))
+        weights += [
+            case((in_title, 1.0), else_=0.0),
+            case((in_description, 0.4), else_=0.0),
+            case((in_comments, 0.1), else_=0.0),
+        ]
+    return and_(*conditions), cast(sum(weights), Float)
+
+
+def _markup(headline: Optional[str]) -> Optional[str]:
+    """Extrait en HTML : texte échappé, délimiteurs provisoires remplacés par <b>."""
+    if headline is None:
+        return None
+    return html.escape(headline).replace(START_SEL, "<b>").replace(STOP_SEL, "</b>")
+
+
+def _fallback_headline(text: str, terms: List[str]) -> Optional[str]:
+    """Extrait de ``text`` autour du premier terme trouvé, termes entourés de <b>."""
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    match = pattern.search(text)
+    if match is None:
+        return None
+    start = max(0, match.start() - HEADLINE_WIDTH // 4)
+    excerpt = text[start:start + HEADLINE_WIDTH].replace(START_SEL, "").replace(STOP_SEL, "")
+    return _markup(pattern.sub(lambda m: f"{START_SEL}{m.group(0)}{STOP_SEL}", excerpt))
+
+
+def _headlines(db: Session, q: str, ids: List[int], postgres: bool) -> Dict[int, Optional[str]]:
+    """Extraits surlignés des descriptions, calculés pour la seule page retournée."""
+    if postgres:
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        # Délimiteurs éventuellement présents dans le texte retirés
+        description = func.translate(Ticket.description, START_SEL + STOP_SEL, "")
+        headline = func.ts_headline(SEARCH_CONFIG, description, tsquery, HEADLINE_OPTIONS)
+        rows = db.execute(select(Ticket.id, headline).where(Ticket.id.in_(ids))).all()
+        return {ticket_id: _markup(text) for ticket_id, text in rows}
+
+    terms = _terms(q)
+    rows = db.execute(select(Ticket.id, Ticket.description).where(Ticket.id.in_(ids))).all()
+    return {ticket_id: _fallback_headline(description, terms) for ticket_id, description in rows}
+
+
+def delete_ticket_comments(db: Session, ticket_ids: Iterable[int]) -> None:
+    """
+    Supprimer en une requête les commentaires de tickets supprimés ensuite
+    dans la même transaction, sans recalculer leur vecteur de recherche.
+    """
+    ticket_ids = list(ticket_ids)
+    if db.get_bind().dialect.name == "postgresql":
+        # Lu par le trigger des commentaires, remis à zéro en fin de transaction
+        db.execute(select(func.set_config(
+            "helpdesk.deleting_tickets", ",".join(str(ticket_id) for ticket_id in ticket_ids), True
+        )))
+    db.execute(
+        delete(Comment).where(Comment.ticket_id.in_(ticket_ids)),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def search_tickets(
+    db: Session, q: str, cursor: Optional[str], limit: int
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Rechercher les tickets correspondant à ``q``, du plus au moins pertinent.
+
+    Retourne les résultats de la page (``ticket``, ``rank``, ``headline``) et
+    le curseur de la page suivante (``None`` s'il n'y en a pas).
+    """
+    postgres = db.get_bind().dialect.name == "postgresql"
+    if postgres:
+        match, rank = _postgres_match(q)
+    else:
+        terms = _terms(q)
+        if not terms:
+            return [], None
+        match, rank = _fallback_match(terms)
+
+    query = select(Ticket.id, rank.label("rank")).where(match)
+    if cursor:
+        last_rank, last_id = _decode_position(cursor)
+        query = query.where(tuple_(rank, Ticket.id) < tuple_(last_rank, last_id))
+
+    rows = db.execute(query.order_by(rank.desc(), Ticket.id.desc()).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_key(rows[-1].rank, rows[-1].id)
+
+    ids = [row.id for row in rows]
+    if not ids:
+        return [], None
+
+    tickets = {
+        ticket.id: ticket
+        for ticket in ticket_query(db, TicketListResponse).filter(Ticket.id.in_(ids))
+    }
+    headlines = _headlines(db, q, ids, postgres)
+    hits = [
+        {"ticket": tickets[row.id], "rank": row.rank, "headline": headlines.get(row.id)}
+        for row in rows
+        if row.id in tickets
+    ]
+    return hits, next_cursor
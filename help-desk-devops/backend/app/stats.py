@@ -0,0 +1,207 @@
+"""
+Statistiques agrégées des tickets, maintenues de façon incrémentale.
+
+Chaque flush de la session qui crée, modifie (statut, priorité, assignation)
+ou supprime un ticket ajuste ``ticket_counters`` dans la même transaction :
+la lecture des statistiques ne parcourt que les compteurs, quelle que soit
+la taille de ``tickets``. Les écritures qui contournent l'ORM (SQL brut,
+imports) sont rattrapées par ``reconcile_counters``, exécutée périodiquement.
+"""
+import asyncio
+import logging
+import os
+from collections import Counter
+from typing import Dict, Tuple
+from sqlalchemy import event, func, inspect, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.database import SessionLocal
+from app.models import ArchivedTicket, Ticket, TicketCounter, TicketPriority, TicketStatus
+
+logger = logging.getLogger(__name__)
+
+# Intervalle de réconciliation des compteurs en secondes (0 : désactivée)
+STATS_RECONCILE_INTERVAL = int(os.getenv("STATS_RECONCILE_INTERVAL", "3600"))
+
+# Statuts comptés comme « ouverts » dans la charge des agents
+OPEN_STATUSES = (TicketStatus.OPEN, TicketStatus.IN_PROGRESS)
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+Bucket = Tuple[TicketStatus, TicketPriority, int]
+
+
+def counter_key(status, priority, assigned_to_id) -> Bucket:
+    """Clé de compteur, avec les valeurs par défaut des colonnes de ``tickets``."""
+    return (
+        TicketStatus(status) if status is not None else TicketStatus.OPEN,
+        TicketPriority(priority) if priority is not None else TicketPriority.MEDIUM,
+        assigned_to_id or 0,
+    )
+
+
+def _committed_value(ticket: Ticket, attribute: str):
+    """Valeur d'un attribut telle qu'en base, avant les modifications en attente."""
+    history = inspect(ticket).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(ticket, attribute)
+
+
+def _committed_key(ticket: Ticket) -> Bucket:
+    return counter_key(*(
+        _committed_value(ticket, attribute)
+        for attribute in ("status", "priority", "assigned_to_id")
+    ))
+
+
+def adjust_counters(session: Session, deltas: Dict[Bucket, int]) -> None:
+    """Appliquer des variations aux compteurs, en un seul upsert atomique."""
+    rows = [
+        {"status": status, "priority": priority, "assigned_to_id": assigned_to_id, "count": delta}
+        for (status, priority, assigned_to_id), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+
+    upsert = _UPSERTS.get(session.get_bind().dialect.name)
+    if upsert is not None:
+        statement = upsert(TicketCounter).values(rows)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=["status", "priority", "assigned_to_id"],
+            set_={"count": TicketCounter.count + statement.excluded.count},
+        ))
+        return
+
+    for row in rows:
+        delta = row.pop("count")
+        updated = session.execute(
+            update(TicketCounter).filter_by(**row).values(count=TicketCounter.count + delta)
+        )
+        if updated.rowcount == 0:
+            session.add(TicketCounter(**row, count=delta))
+
+
+@event.listens_for(Session, "before_flush")
+def _track_ticket_changes(session: Session, flush_context, instances) -> None:
+    """Reporter dans les compteurs les tickets créés, modifiés et supprimés."""
+    deltas: Counter = Counter()
+    for obj in session.new:
+        if isinstance(obj, Ticket):
+            deltas[counter_key(obj.status, obj.priority, obj.assigned_to_id)] += 1
+    for obj in session.dirty:
+        if isinstance(obj, Ticket) and session.is_modified(obj):
+            before = _committed_key(obj)
+            after = counter_key(obj.status, obj.priority, obj.assigned_to_id)
+            if before != after:
+                deltas[before] -= 1
+                deltas[after] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Ticket):
+            deltas[_committed_key(obj)] -= 1
+    if deltas:
+        adjust_counters(session, deltas)
+
+
+def read_stats(db: Session) -> dict:
+    """Statistiques agrégées, lues dans les seuls compteurs."""
+    by_status_priority = {
+        status: {priority: 0 for priority in TicketPriority} for status in TicketStatus
+    }
+    open_by_assignee: Counter = Counter()
+
+    counters = db.query(TicketCounter).filter(TicketCounter.count != 0)
+    for counter in counters:
+        by_status_priority[counter.status][counter.priority] += counter.count
+        if counter.status in OPEN_STATUSES:
+            open_by_assignee[counter.assigned_to_id] += counter.count
+
+    by_status = {status: sum(counts.values()) for status, counts in by_status_priority.items()}
+    by_priority = {
+        priority: sum(counts[priority] for counts in by_status_priority.values())
+        for priority in TicketPriority
+    }
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "by_status_priority": by_status_priority,
+        "open_by_assignee": [
+            {"assigned_to_id": assigned_to_id or None, "count": count}
+            for assigned_to_id, count in open_by_assignee.most_common()
+            if count
+        ],
+    }
+
+
+def reconcile_counters(db: Session) -> int:
+    """
+    Recalculer les compteurs depuis ``tickets`` et ``tickets_archive`` (les
+    tickets archivés restent comptés) et corriger les écarts.
+
+    Sous PostgreSQL, la table des compteurs est verrouillée pendant le
+    recomptage : les écritures en cours se terminent avant, les suivantes
+    attendent la fin de la réconciliation. Retourne le nombre de compteurs
+    corrigés.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE ticket_counters IN EXCLUSIVE MODE"))
+
+    actual: Counter = Counter()
+    for model in (Ticket, ArchivedTicket):
+        assigned = func.coalesce(model.assigned_to_id, 0)
+        rows = db.execute(
+            select(model.status, model.priority, assigned, func.count())
+            .group_by(model.status, model.priority, assigned)
+        )
+        for status, priority, assigned_to_id, count in rows:
+            actual[counter_key(status, priority, assigned_to_id)] += count
+
+    stored = {
+        (counter.status, counter.priority, counter.assigned_to_id): counter
+        for counter in db.query(TicketCounter)
+    }
+
+    corrected = 0
+    for bucket in set(actual) | set(stored):
+        counter = stored.get(bucket)
+        expected = actual.get(bucket, 0)
+        if counter is None:
+            status, priority, assigned_to_id = bucket
+            db.add(TicketCounter(
+                status=status, priority=priority, assigned_to_id=assigned_to_id, count=expected
+            ))
+        elif counter.count == expected:
+            continue
+        elif expected == 0:
+            db.delete(counter)
+        else:
+            counter.count = expected
+        corrected += 1
+
+    db.commit()
+    if corrected:
+        logger.warning("ticket_counters: %d compteur(s) corrigé(s)", corrected)
+    return corrected
+
+
+def _reconcile_once() -> int:
+    db = SessionLocal()
+    try:
+        return reconcile_counters(db)
+    finally:
+        db.close()
+
+
+async def reconcile_periodically(interval: float = STATS_RECONCILE_INTERVAL) -> None:
+    """Réconcilier les compteurs au démarrage puis toutes les ``interval`` secondes."""
+    while True:
+        try:
+            await run_in_threadpool(_reconcile_once)
+        except Exception:
+            logger.exception("ticket_counters: échec de la réconciliation")
+        await asyncio.sleep(interval)
@@ -0,0 +1 @@
+"""Benchmarks de l'API Help Desk."""
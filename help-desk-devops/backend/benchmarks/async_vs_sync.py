@@ -0,0 +1,95 @@
+"""
+Comparer la pile synchrone et la pile asynchrone sous charge concurrente.
+
+Lance deux serveurs uvicorn successifs (``USE_ASYNC_DB=false`` puis ``true``)
+sur la même base, puis mesure requêtes/seconde et latences p50/p99 sur la
+liste et le détail des tickets.
+
+Usage (depuis ``backend/``) :
+
+    DATABASE_URL=postgresql://... python -m benchmarks.async_vs_sync \\
+        --concurrency 64 --duration 15
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import httpx
+
+from benchmarks.common import start_server, stop_server, summarize
+
+
+def seed(base_url: str, tickets: int) -> tuple:
+    """Créer un utilisateur et des tickets ; retourner (en-têtes, id de ticket)."""
+    suffix = uuid.uuid4().hex[:8]
+    user = {"email": f"bench-{suffix}@example.com", "username": f"bench_{suffix}", "password": "benchmark123"}
+    httpx.post(f"{base_url}/api/auth/register", json=user).raise_for_status()
+    token = httpx.post(
+        f"{base_url}/api/auth/login", json={"email": user["email"], "password": user["password"]}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    ticket_id = None
+    for i in range(tickets):
+        response = httpx.post(
+            f"{base_url}/api/tickets/",
+            json={"title": f"Ticket de charge {i}", "description": "Ticket créé par le benchmark."},
+            headers=headers,
+        )
+        ticket_id = response.json()["id"]
+        httpx.post(f"{base_url}/api/tickets/{ticket_id}/comments", json={"content": "Commentaire"}, headers=headers)
+    return headers, ticket_id
+
+
+async def run_load(base_url: str, paths, headers: dict, concurrency: int, duration: float) -> dict:
+    """Envoyer des requêtes en boucle depuis ``concurrency`` clients."""
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+
+    async def worker(client: httpx.AsyncClient, offset: int):
+        nonlocal errors
+        i = offset
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            response = await client.get(paths[i % len(paths)], headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+            i += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        started = time.monotonic()
+        await asyncio.gather(*(worker(client, n) for n in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    return summarize(latencies, errors, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--tickets", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = {}
+    for mode, use_async in (("sync", False), ("async", True)):
+        process = start_server(args.port, {"USE_ASYNC_DB": "true" if use_async else "false"})
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            headers, ticket_id = seed(base_url, args.tickets)
+            paths = ["/api/tickets/?limit=20", f"/api/tickets/{ticket_id}"]
+            results[mode] = asyncio.run(
+                run_load(base_url, paths, headers, args.concurrency, args.duration)
+            )
+        finally:
+            stop_server(process)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Outils partagés par les benchmarks : serveur de test et statistiques."""
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+
+def percentile(samples, pct: float) -> float:
+    """Percentile (plus proche rang) d'une liste de latences."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    """Débit et percentiles (ms) d'une série de requêtes."""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def start_server(port: int, env: Optional[Dict[str, str]] = None, workers: int = 1) -> subprocess.Popen:
+    """Démarrer uvicorn dans un sous-processus et attendre /health."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        env=dict(os.environ, **(env or {})),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Le serveur s'est arrêté au démarrage")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return process
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Le serveur n'a pas démarré")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    process.wait()
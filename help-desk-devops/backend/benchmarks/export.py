@@ -0,0 +1,137 @@
+"""
+Débit et mémoire de l'export en masse des tickets (``GET /api/tickets/export``).
+
+Génère un jeu de données (``benchmarks.seed``), puis, pour chaque cas, démarre
+un serveur uvicorn neuf et lit la réponse en flux :
+
+- ``paginated`` : référence, la liste parcourue par pages de 100 (curseur) ;
+- ``ndjson``, ``csv``, ``csv_gzip`` : l'export, commentaires compris.
+
+Pour chaque cas : lignes/seconde, octets reçus et mémoire résidente du
+serveur avant la requête et au plus haut (``VmHWM``, Linux uniquement). Le pic
+doit rester stable quand ``--tickets`` augmente.
+
+Usage (depuis ``backend/``) :
+
+    python -m benchmarks.export --tickets 100000 --comments 200000
+    python -m benchmarks.export --database-url postgresql://... --tickets 1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import zlib
+from typing import Optional
+
+import httpx
+
+from benchmarks.common import start_server, stop_server
+from benchmarks.seed import seed_database
+
+CASES = {
+    "paginated": None,
+    "ndjson": {"format": "ndjson"},
+    "csv": {"format": "csv"},
+    "csv_gzip": {"format": "csv", "gzip": "true"},
+}
+
+
+def memory_mb(pid: int, field: str) -> Optional[float]:
+    """Champ mémoire (``VmRSS``, ``VmHWM``) d'un processus, en Mo ; ``None`` hors Linux."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith(field + ":"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def scrape_pages(client: httpx.Client, headers: dict) -> tuple:
+    """Parcourir la liste par pages de 100 ; retourner (lignes, octets)."""
+    rows = size = 0
+    cursor = ""
+    while cursor is not None:
+        response = client.get("/api/tickets/", params={"cursor": cursor, "limit": 100}, headers=headers)
+        response.raise_for_status()
+        page = response.json()
+        rows += len(page["items"])
+        size += len(response.content)
+        cursor = page["next_cursor"]
+    return rows, size
+
+
+def stream_export(client: httpx.Client, headers: dict, params: dict) -> tuple:
+    """Lire l'export en flux, sans le conserver ; retourner (lignes, octets reçus)."""
+    rows = size = 0
+    with client.stream("GET", "/api/tickets/export", params=params, headers=headers) as response:
+        response.raise_for_status()
+        gzipped = response.headers.get("content-encoding") == "gzip"
+        decompressor = zlib.decompressobj(31) if gzipped else None
+        for chunk in response.iter_raw():
+            size += len(chunk)
+            rows += (decompressor.decompress(chunk) if gzipped else chunk).count(b"\n")
+    # Ligne d'en-tête du CSV
+    return rows - (params["format"] == "csv"), size
+
+
+def run_case(port: int, headers: dict, params: Optional[dict]) -> dict:
+    process = start_server(port, {"STATS_RECONCILE_INTERVAL": "0"})
+    try:
+        before = memory_mb(process.pid, "VmRSS")
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=None) as client:
+            started = time.perf_counter()
+            if params is None:
+                rows, size = scrape_pages(client, headers)
+            else:
+                rows, size = stream_export(client, headers, params)
+            elapsed = time.perf_counter() - started
+        return {
+            "rows": rows,
+            "bytes": size,
+            "seconds": round(elapsed, 2),
+            "rows_per_sec": round(rows / elapsed) if elapsed else 0,
+            "rss_before_mb": before,
+            "peak_rss_mb": memory_mb(process.pid, "VmHWM"),
+        }
+    finally:
+        stop_server(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="Base jetable (défaut : SQLite temporaire)")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tickets", type=int, default=20000)
+    parser.add_argument("--comments", type=int, default=40000)
+    parser.add_argument("--cases", default=",".join(CASES))
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.cases.split(",") if name.strip()]
+    unknown = set(names) - set(CASES)
+    if unknown:
+        parser.error(f"cas inconnus : {', '.join(sorted(unknown))}")
+
+    database_url = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "export.db")
+    # Avant tout import de app : le serveur et le générateur partagent la base
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    from sqlalchemy import create_engine
+    from app.auth import create_access_token
+
+    engine = create_engine(database_url)
+    data = seed_database(engine, args.users, args.tickets, args.comments)
+    engine.dispose()
+    # Le premier utilisateur généré est administrateur
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(data.user_ids[0])})}"}
+
+    results = {name: run_case(args.port, headers, CASES[name]) for name in names}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
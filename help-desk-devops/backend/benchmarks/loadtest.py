@@ -0,0 +1,264 @@
+"""
+Test de charge reproductible de l'API, comparé à une référence JSON.
+
+Génère un jeu de données (``benchmarks.seed``), démarre uvicorn sur la même
+base, puis joue chaque scénario à concurrence fixe pendant une durée donnée :
+
+- ``dashboard`` : rafraîchissement de la liste (filtres et tris variés,
+  ``If-None-Match`` comme le tableau de bord) ;
+- ``detail`` : détail d'un ticket puis de ses commentaires ;
+- ``comments`` : rafale de commentaires sur quelques tickets ;
+- ``login`` : connexions successives (coût bcrypt compris).
+
+Le débit et les latences p50/p95/p99 de chaque scénario sont écrits en JSON.
+Avec ``--baseline``, le script échoue (code 1) si le débit baisse ou si le
+p95 augmente de plus de ``--threshold`` par rapport à la référence.
+
+Usage (depuis ``backend/``) :
+
+    # SQLite jetable, enregistrement de la référence
+    python -m benchmarks.loadtest --output baseline.json
+
+    # PostgreSQL jetable, comparaison à la référence
+    python -m benchmarks.loadtest --database-url postgresql://... \\
+        --baseline baseline.json --threshold 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.common import start_server, stop_server, summarize
+from benchmarks.seed import SEED_PASSWORD, seed_database
+
+# Statuts HTTP attendus (304 : liste inchangée)
+OK_STATUSES = (200, 201, 304)
+LIST_STATUSES = (None, "open", "in_progress", "resolved", "closed")
+LIST_SORTS = ("created_at", "updated_at", "priority")
+# Tickets visés par les rafales de commentaires
+HOT_TICKETS = 10
+
+
+@dataclass
+class LoadContext:
+    """Données générées, partagées par les scénarios."""
+    ticket_ids: List[int]
+    emails: List[str]
+    headers: List[dict]
+
+
+@dataclass
+class Worker:
+    """Client simulé : utilisateur, générateur aléatoire et ETags connus."""
+    rng: random.Random
+    headers: dict
+    etags: Dict[str, str] = field(default_factory=dict)
+
+
+Scenario = Callable[[httpx.AsyncClient, LoadContext, Worker], Awaitable[httpx.Response]]
+
+
+async def dashboard(client: httpx.AsyncClient, ctx: LoadContext, worker: Worker) -> httpx.Response:
+    params = {"limit": "20", "sort": worker.rng.choice(LIST_SORTS)}
+    status = worker.rng.choice(LIST_STATUSES)
+    if status:
+        params["status"] = status
+    key = json.dumps(params, sort_keys=True)
+    headers = dict(worker.headers)
+    if key in worker.etags:
+        headers["If-None-Match"] = worker.etags[key]
+    response = await client.get("/api/tickets/", params=params, headers=headers)
+    if "etag" in response.headers:
+        worker.etags[key] = response.headers["etag"]
+    return response
+
+
+async def detail(client: httpx.AsyncClient, ctx: LoadContext, worker: Worker) -> httpx.Response:
+    ticket_id = worker.rng.choice(ctx.ticket_ids)
+    response = await client.get(f"/api/tickets/{ticket_id}", headers=worker.headers)
+    if response.status_code != 200:
+        return response
+    return await client.get(f"/api/tickets/{ticket_id}/comments", headers=worker.headers)
+
+
+async def comments(client: httpx.AsyncClient, ctx: LoadContext, worker: Worker) -> httpx.Response:
+    ticket_id = worker.rng.choice(ctx.ticket_ids[:HOT_TICKETS])
+    return await client.post(
+        f"/api/tickets/{ticket_id}/comments",
+        json={"content": "Relance : toujours en attente."},
+        headers=worker.headers,
+    )
+
+
+async def login(client: httpx.AsyncClient, ctx: LoadContext, worker: Worker) -> httpx.Response:
+    return await client.post(
+        "/api/auth/login", json={"email": worker.rng.choice(ctx.emails), "password": SEED_PASSWORD}
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "dashboard": dashboard,
+    "detail": detail,
+    "comments": comments,
+    "login": login,
+}
+
+
+async def run_scenario(base_url: str, scenario: Scenario, ctx: LoadContext, concurrency: int,
+                       duration: float, warmup: float = 0.0, seed: int = 42) -> dict:
+    """Jouer un scénario depuis ``concurrency`` clients ; la chauffe n'est pas mesurée."""
+    latencies, errors = [], 0
+    # Répartition des réponses (« transport » : connexion échouée)
+    statuses: Counter = Counter()
+    started = time.monotonic()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def run(client: httpx.AsyncClient, worker: Worker):
+        nonlocal errors
+        while time.monotonic() < deadline:
+            request_started = time.perf_counter()
+            try:
+                response = await scenario(client, ctx, worker)
+                outcome = str(response.status_code)
+                failed = response.status_code not in OK_STATUSES
+            except httpx.TransportError:
+                outcome, failed = "transport", True
+            if time.monotonic() >= measure_from:
+                latencies.append(time.perf_counter() - request_started)
+                errors += failed
+                statuses[outcome] += 1
+
+    workers = [
+        Worker(random.Random(seed * 1000 + n), ctx.headers[n % len(ctx.headers)])
+        for n in range(concurrency)
+    ]
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        await asyncio.gather(*(run(client, worker) for worker in workers))
+    summary = summarize(latencies, errors, time.monotonic() - measure_from)
+    summary["statuses"] = dict(sorted(statuses.items()))
+    return summary
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Régressions par rapport à la référence (débit, p95, apparition d'erreurs)."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(name)
+        if reference is None:
+            continue
+        if current["rps"] < reference["rps"] * (1 - threshold):
+            regressions.append(f"{name}: débit {current['rps']} req/s < référence {reference['rps']}")
+        if current["p95_ms"] > reference["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms > référence {reference['p95_ms']}")
+        if current["errors"] and not reference["errors"]:
+            regressions.append(f"{name}: {current['errors']} erreur(s), aucune dans la référence")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="Base jetable (défaut : SQLite temporaire)")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--comments", type=int, default=5000)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=1, help="Workers uvicorn")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Fichier JSON des résultats (défaut : sortie standard)")
+    parser.add_argument("--baseline", help="Référence JSON à comparer")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Écart toléré (0.15 = 15 %%)")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"scénarios inconnus : {', '.join(sorted(unknown))}")
+
+    database_url = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "loadtest.db")
+    # Avant tout import de app : le serveur et le générateur partagent la base
+    os.environ["DATABASE_URL"] = database_url
+    # Le scénario login enchaîne les connexions depuis une seule adresse
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+    from sqlalchemy import create_engine
+    from app.auth import create_access_token
+
+    engine = create_engine(database_url)
+    data = seed_database(engine, args.users, args.tickets, args.comments, args.seed)
+    dialect = engine.dialect.name
+    engine.dispose()
+
+    ctx = LoadContext(
+        ticket_ids=data.ticket_ids,
+        emails=data.emails,
+        headers=[
+            {"Authorization": f"Bearer {create_access_token(data={'sub': str(user_id)})}"}
+            for user_id in data.user_ids
+        ],
+    )
+    # Pas de réconciliation des compteurs pendant la mesure
+    process = start_server(args.port, {"STATS_RECONCILE_INTERVAL": "0"}, args.workers)
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        scenarios = {
+            name: asyncio.run(run_scenario(
+                base_url, SCENARIOS[name], ctx, args.concurrency, args.duration, args.warmup, args.seed
+            ))
+            for name in names
+        }
+    finally:
+        stop_server(process)
+
+    results = {
+        "config": {
+            "database": dialect,
+            "users": args.users,
+            "tickets": args.tickets,
+            "comments": args.comments,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "workers": args.workers,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "recorded_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        },
+        "scenarios": scenarios,
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        for key in ("database", "concurrency", "workers"):
+            if baseline.get("config", {}).get(key) != results["config"][key]:
+                print(f"Attention : {key} diffère de la référence", file=sys.stderr)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"RÉGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Générer un jeu de données reproductible pour les tests de charge.
+
+Les tables sont recréées par les migrations, puis les utilisateurs, tickets et commentaires
+sont insérés par lots (INSERT executemany) à partir d'une graine : deux
+exécutions avec les mêmes paramètres produisent les mêmes données. À
+n'utiliser que sur une base jetable.
+
+Usage (depuis ``backend/``) :
+
+    DATABASE_URL=postgresql://... python -m benchmarks.seed \\
+        --users 200 --tickets 20000 --comments 50000
+"""
+import argparse
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List
+
+# Mot de passe commun des utilisateurs générés (scénario de connexion)
+SEED_PASSWORD = "loadtest123"
+# Lignes par INSERT executemany
+CHUNK_SIZE = 5000
+# Période couverte par les dates de création
+HISTORY_DAYS = 90
+
+WORDS = (
+    "imprimante", "réseau", "wifi", "vpn", "messagerie", "écran", "clavier", "serveur",
+    "sauvegarde", "licence", "mot de passe", "badge", "téléphone", "disque", "mise à jour",
+)
+
+
+@dataclass
+class SeedResult:
+    """Identifiants et emails générés, pour les scénarios."""
+    user_ids: List[int]
+    emails: List[str]
+    ticket_ids: List[int]
+    comments: int
+
+
+def _chunks(rows: list):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        yield rows[start:start + CHUNK_SIZE]
+
+
+def seed_database(engine, users: int, tickets: int, comments: int, seed: int = 42) -> SeedResult:
+    """Recréer les tables et insérer le jeu de données."""
+    # Imports différés : l'appelant fixe DATABASE_URL avant d'importer app
+    from alembic import command
+    from sqlalchemy import insert, select, text
+    from sqlalchemy.orm import Session
+    from app.auth import hash_password
+    from app.database import Base
+    from app.migrate import alembic_config
+    from app.models import Comment, Ticket, TicketPriority, TicketStatus, User
+    from app.stats import reconcile_counters
+
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    Base.metadata.drop_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        command.upgrade(alembic_config(connection), "head")
+
+    # Un seul hachage : le coût bcrypt reste celui de BCRYPT_ROUNDS à la connexion
+    hashed_password = hash_password(SEED_PASSWORD)
+    emails = [f"loadtest{n}@example.com" for n in range(users)]
+    with Session(engine) as db:
+        db.execute(insert(User), [
+            {
+                "email": email,
+                "username": f"loadtest{n}",
+                "full_name": f"Utilisateur {n}",
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "is_admin": n == 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for n, email in enumerate(emails)
+        ])
+        user_ids = db.scalars(select(User.id).order_by(User.id)).all()
+
+        statuses, priorities = list(TicketStatus), list(TicketPriority)
+        ticket_rows = []
+        for n in range(tickets):
+            created_at = now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+            status = rng.choices(statuses, weights=(4, 3, 2, 1))[0]
+            ticket_rows.append({
+                "title": f"{rng.choice(WORDS).capitalize()} en panne #{n}",
+                "description": " ".join(rng.choice(WORDS) for _ in range(12)),
+                "status": status,
+                "priority": rng.choices(priorities, weights=(3, 4, 2, 1))[0],
+                "creator_id": rng.choice(user_ids),
+                "assigned_to_id": rng.choice(user_ids) if rng.random() < 0.6 else None,
+                "created_at": created_at,
+                "updated_at": created_at,
+                "resolved_at": created_at if status == TicketStatus.RESOLVED else None,
+            })
+        for chunk in _chunks(ticket_rows):
+            db.execute(insert(Ticket), chunk)
+        ticket_ids = db.scalars(select(Ticket.id).order_by(Ticket.id)).all()
+
+        comment_rows = [
+            {
+                "content": " ".join(rng.choice(WORDS) for _ in range(8)),
+                "ticket_id": rng.choice(ticket_ids),
+                "author_id": rng.choice(user_ids),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for _ in range(comments if ticket_ids else 0)
+        ]
+        for chunk in _chunks(comment_rows):
+            db.execute(insert(Comment), chunk)
+        db.commit()
+
+        # Les INSERT en masse ne passent pas par les compteurs incrémentaux
+        reconcile_counters(db)
+
+    return SeedResult(list(user_ids), emails, list(ticket_ids), len(comment_rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--comments", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from app.database import engine
+
+    result = seed_database(engine, args.users, args.tickets, args.comments, args.seed)
+    print(
+        f"{len(result.user_ids)} utilisateurs, {len(result.ticket_ids)} tickets, "
+        f"{result.comments} commentaires"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Coût de sérialisation par requête des schémas de réponse.
+
+Compare, pour des objets ORM déjà chargés (sans base ni HTTP) :
+
+- ``fastapi`` : chemin par défaut (validation du ``response_model``,
+  conversion en dictionnaires, ``JSONResponse`` de la bibliothèque standard) ;
+- ``orjson`` : même validation et conversion, encodage par orjson
+  (``default_response_class`` seul) ;
+- ``fast_json`` : chemin ``FAST_JSON`` d'``app.responses`` (une validation,
+  encodage direct en octets par pydantic-core).
+
+Usage (depuis ``backend/``) :
+
+    python -m benchmarks.serialization --comments 50 --page 100
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+
+from app.models import Comment, Ticket, TicketPriority, TicketStatus, User
+from app.schemas import CommentResponse, TicketListResponse, TicketResponse, TokenResponse
+
+
+def _user(n: int, now: datetime) -> User:
+    return User(
+        id=n, email=f"agent{n}@example.com", username=f"agent{n}", full_name=f"Agent {n}",
+        hashed_password="-", is_active=True, is_admin=False, created_at=now, updated_at=now,
+    )
+
+
+def _ticket(n: int, comments: int, now: datetime) -> Ticket:
+    creator, assignee = _user(2 * n, now), _user(2 * n + 1, now)
+    return Ticket(
+        id=n, title=f"Imprimante en panne #{n}", description="L'imprimante ne répond plus. " * 10,
+        status=TicketStatus.OPEN, priority=TicketPriority.HIGH,
+        creator_id=creator.id, assigned_to_id=assignee.id, creator=creator, assigned_to=assignee,
+        created_at=now, updated_at=now, resolved_at=None,
+        comments=[
+            Comment(id=i, content="Relance : toujours en attente.", ticket_id=n, author_id=assignee.id,
+                    author=assignee, created_at=now, updated_at=now)
+            for i in range(comments)
+        ],
+    )
+
+
+def cases(comments: int, page: int) -> Dict[str, tuple]:
+    """Réponses typiques : (response_model, contenu renvoyé par la route)."""
+    now = datetime.utcnow().replace(microsecond=0)
+    detail = _ticket(1, comments, now)
+    return {
+        "ticket_detail": (TicketResponse, detail),
+        "comments": (List[CommentResponse], detail.comments),
+        "ticket_list": (List[TicketListResponse], [_ticket(n, 0, now) for n in range(page)]),
+        "login": (TokenResponse, TokenResponse(access_token="x" * 160, user=detail.creator)),
+    }
+
+
+def encoders(model, content) -> Dict[str, Callable[[], bytes]]:
+    """Les trois chemins de sérialisation d'un même contenu."""
+    field = create_response_field(name="response", type_=model)
+    adapter = TypeAdapter(model)
+
+    def fastapi():
+        value, _ = field.validate(content, {}, loc=("response",))
+        return JSONResponse(field.serialize(value, by_alias=True)).body
+
+    def orjson():
+        value, _ = field.validate(content, {}, loc=("response",))
+        return ORJSONResponse(field.serialize(value, by_alias=True)).body
+
+    def fast_json():
+        return adapter.dump_json(adapter.validate_python(content), by_alias=True)
+
+    return {"fastapi": fastapi, "orjson": orjson, "fast_json": fast_json}
+
+
+def measure(encode: Callable[[], bytes], duration: float) -> float:
+    """Durée moyenne (µs) d'un encodage, répété pendant ``duration`` secondes."""
+    encode()
+    runs, started = 0, time.perf_counter()
+    while time.perf_counter() - started < duration:
+        encode()
+        runs += 1
+    return (time.perf_counter() - started) / runs * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--comments", type=int, default=50, help="Commentaires du ticket détaillé")
+    parser.add_argument("--page", type=int, default=100, help="Tickets de la page de liste")
+    parser.add_argument("--duration", type=float, default=1.0, help="Secondes par mesure")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (model, content) in cases(args.comments, args.page).items():
+        paths = encoders(model, content)
+        # Même contenu JSON quel que soit le chemin
+        bodies = {json.loads(encode()) == json.loads(paths["fastapi"]()) for encode in paths.values()}
+        assert bodies == {True}, f"{name}: contenus différents"
+        timings = {path: round(measure(encode, args.duration), 1) for path, encode in paths.items()}
+        results[name] = {
+            "bytes": len(paths["fast_json"]()),
+            "us": timings,
+            "speedup": round(timings["fastapi"] / timings["fast_json"], 2),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
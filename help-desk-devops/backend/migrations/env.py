@@ -0,0 +1,62 @@
+"""
+Environnement Alembic : migrations sur la base de DATABASE_URL.
+
+Une connexion peut être fournie par l'appelant (``config.attributes``),
+par exemple par les tests ou ``app.migrate``.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlalchemy.engine import make_url
+
+from app.database import DATABASE_URL, Base
+from app.migrate import include_for_dialect
+import app.models  # noqa: F401  (enregistre les tables dans Base.metadata)
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def _configure(dialect_name: str, **kwargs) -> None:
+    context.configure(
+        target_metadata=target_metadata,
+        compare_type=True,
+        include_object=include_for_dialect(dialect_name),
+        # ALTER TABLE limité sous SQLite : recréation de la table
+        render_as_batch=True,
+        **kwargs,
+    )
+
+
+def run_migrations_offline() -> None:
+    """Générer le SQL des migrations sans connexion (``alembic upgrade --sql``)."""
+    url = make_url(config.get_main_option("sqlalchemy.url") or DATABASE_URL)
+    _configure(url.get_backend_name(), url=url, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection.dialect.name, connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_engine(config.get_main_option("sqlalchemy.url") or DATABASE_URL, poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        _configure(connection.dialect.name, connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,100 @@
+"""Schéma initial : utilisateurs, tickets et commentaires.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 14:30:22
+
+Reproduit exactement le schéma que créait ``create_all`` au démarrage :
+une base créée ainsi se marque avec ``alembic stamp 0001``, puis se met à
+jour normalement (``python -m app.migrate``).
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+STATUSES = ("OPEN", "IN_PROGRESS", "RESOLVED", "CLOSED")
+PRIORITIES = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+
+def _enum(name: str, values) -> sa.Enum:
+    # Types PostgreSQL partagés par deux tables : créés une seule fois dans upgrade()
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql"
+    )
+
+
+def _timestamps():
+    return [sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True)]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        postgresql.ENUM(*STATUSES, name="ticketstatus").create(op.get_bind(), checkfirst=True)
+        postgresql.ENUM(*PRIORITIES, name="ticketpriority").create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("username", sa.String(length=100), nullable=False),
+        sa.Column("full_name", sa.String(length=255), nullable=True),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_admin", sa.Boolean(), nullable=True),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "tickets",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("status", _enum("ticketstatus", STATUSES), nullable=True),
+        sa.Column("priority", _enum("ticketpriority", PRIORITIES), nullable=True),
+        sa.Column("creator_id", sa.Integer(), nullable=False),
+        sa.Column("assigned_to_id", sa.Integer(), nullable=True),
+        *_timestamps(),
+        sa.Column("resolved_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["assigned_to_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["creator_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_tickets_id", "tickets", ["id"])
+    op.create_index("ix_tickets_status", "tickets", ["status"])
+    op.create_index("ix_tickets_priority", "tickets", ["priority"])
+    op.create_index("ix_tickets_created_at", "tickets", ["created_at"])
+
+    op.create_table(
+        "comments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("ticket_id", sa.Integer(), nullable=False),
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["author_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["ticket_id"], ["tickets.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_comments_id", "comments", ["id"])
+    op.create_index("ix_comments_created_at", "comments", ["created_at"])
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    op.drop_table("comments")
+    op.drop_table("tickets")
+    op.drop_table("users")
+    if dialect == "postgresql":
+        op.execute("DROP TYPE IF EXISTS ticketpriority")
+        op.execute("DROP TYPE IF EXISTS ticketstatus")
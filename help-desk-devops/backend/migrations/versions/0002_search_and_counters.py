@@ -0,0 +1,138 @@
+"""Recherche plein texte, index de liste et compteurs de statistiques.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 14:48:09
+
+Sur une base existante (marquée ``0001``), les vecteurs de recherche des
+tickets sont calculés et les compteurs remplis à partir des tickets
+présents, comme le ferait ``app.stats.reconcile_counters``.
+"""
+import os
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+SEARCH_CONFIG = os.getenv("SEARCH_CONFIG", "french")
+STATUSES = ("OPEN", "IN_PROGRESS", "RESOLVED", "CLOSED")
+PRIORITIES = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+PRIORITY_RANK_SQL = (
+    "CASE priority WHEN 'LOW' THEN 0 WHEN 'MEDIUM' THEN 1 "
+    "WHEN 'HIGH' THEN 2 WHEN 'CRITICAL' THEN 3 END"
+)
+
+TICKET_INDEXES = (
+    ("ix_tickets_status_created_at_id", ["status", "created_at", "id"]),
+    ("ix_tickets_created_at_id", ["created_at", "id"]),
+    ("ix_tickets_updated_at_id", ["updated_at", "id"]),
+    ("ix_tickets_status_updated_at_id", ["status", "updated_at", "id"]),
+    ("ix_tickets_priority_id", ["priority", "id"]),
+    ("ix_tickets_status_priority_created_at_id", ["status", "priority", "created_at", "id"]),
+    ("ix_tickets_assigned_status_created_at_id", ["assigned_to_id", "status", "created_at", "id"]),
+    ("ix_tickets_creator_created_at_id", ["creator_id", "created_at", "id"]),
+)
+
+
+def _enum(name: str, values) -> sa.Enum:
+    # Types PostgreSQL créés par 0001
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql"
+    )
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    op.add_column(
+        "tickets",
+        sa.Column(
+            "search_vector", postgresql.TSVECTOR().with_variant(sa.Text(), "sqlite"), nullable=True
+        ),
+    )
+    for name, columns in TICKET_INDEXES:
+        op.create_index(name, "tickets", columns)
+    if dialect == "sqlite":
+        op.create_index("ix_tickets_priority_rank_id", "tickets", [sa.text(PRIORITY_RANK_SQL), "id"])
+    if dialect == "postgresql":
+        op.create_index(
+            "ix_tickets_search_vector", "tickets", ["search_vector"], postgresql_using="gin"
+        )
+
+    op.create_table(
+        "ticket_counters",
+        sa.Column("status", _enum("ticketstatus", STATUSES), nullable=False),
+        sa.Column("priority", _enum("ticketpriority", PRIORITIES), nullable=False),
+        sa.Column("assigned_to_id", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("status", "priority", "assigned_to_id"),
+    )
+    # Valeurs par défaut des colonnes de tickets, comme app.stats.counter_key
+    op.execute("""
+INSERT INTO ticket_counters (status, priority, assigned_to_id, count)
+SELECT coalesce(status, 'OPEN'), coalesce(priority, 'MEDIUM'), coalesce(assigned_to_id, 0), count(*)
+FROM tickets
+GROUP BY coalesce(status, 'OPEN'), coalesce(priority, 'MEDIUM'), coalesce(assigned_to_id, 0)
+""")
+
+    if dialect == "postgresql":
+        op.execute(f"""
+CREATE OR REPLACE FUNCTION tickets_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'B') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+            (SELECT string_agg(content, ' ') FROM comments WHERE ticket_id = NEW.id), ''
+        )), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tickets_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON tickets
+    FOR EACH ROW EXECUTE FUNCTION tickets_search_vector_update();
+""")
+        op.execute(f"""
+CREATE OR REPLACE FUNCTION comments_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE tickets
+        SET search_vector = coalesce(search_vector, ''::tsvector) ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', NEW.content), 'C')
+        WHERE id = NEW.ticket_id;
+    ELSE
+        -- Recalcul complet via le trigger des tickets
+        UPDATE tickets SET title = title WHERE id = OLD.ticket_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER comments_search_vector_trigger
+    AFTER INSERT OR UPDATE OF content OR DELETE ON comments
+    FOR EACH ROW EXECUTE FUNCTION comments_search_vector_update();
+""")
+        # Vecteurs des tickets existants, calculés par le trigger
+        op.execute("UPDATE tickets SET title = title")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS comments_search_vector_trigger ON comments")
+        op.execute("DROP TRIGGER IF EXISTS tickets_search_vector_trigger ON tickets")
+        op.execute("DROP FUNCTION IF EXISTS comments_search_vector_update()")
+        op.execute("DROP FUNCTION IF EXISTS tickets_search_vector_update()")
+        op.drop_index("ix_tickets_search_vector", table_name="tickets")
+    if dialect == "sqlite":
+        op.drop_index("ix_tickets_priority_rank_id", table_name="tickets")
+    op.drop_table("ticket_counters")
+    for name, _ in TICKET_INDEXES:
+        op.drop_index(name, table_name="tickets")
+    with op.batch_alter_table("tickets") as batch:
+        batch.drop_column("search_vector")
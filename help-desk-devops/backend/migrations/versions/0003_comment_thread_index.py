@@ -0,0 +1,22 @@
+"""Index du fil de commentaires d'un ticket (ticket_id, created_at, id).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 15:05:41
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_comments_ticket_created_at_id", "comments", ["ticket_id", "created_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_comments_ticket_created_at_id", table_name="comments")
@@ -0,0 +1,29 @@
+"""Seaux de jetons partagés de la limitation de débit.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 15:42:09
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("ix_rate_limit_buckets_updated_at", "rate_limit_buckets", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rate_limit_buckets_updated_at", table_name="rate_limit_buckets")
+    op.drop_table("rate_limit_buckets")
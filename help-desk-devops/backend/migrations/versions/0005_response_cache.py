@@ -0,0 +1,40 @@
+"""Cache partagé des réponses et compteurs de version.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 17:05:31
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Contenu reconstructible : pas de journalisation WAL sous PostgreSQL
+    unlogged = ["UNLOGGED"] if op.get_bind().dialect.name == "postgresql" else []
+    op.create_table(
+        "response_cache_entries",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("body", sa.LargeBinary(), nullable=False),
+        sa.Column("headers", sa.Text(), nullable=False),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+        prefixes=unlogged,
+    )
+    op.create_index("ix_response_cache_entries_expires_at", "response_cache_entries", ["expires_at"])
+    op.create_table(
+        "response_cache_versions",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("response_cache_versions")
+    op.drop_index("ix_response_cache_entries_expires_at", table_name="response_cache_entries")
+    op.drop_table("response_cache_entries")
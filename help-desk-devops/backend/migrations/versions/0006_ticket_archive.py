@@ -0,0 +1,98 @@
+"""Archives des tickets clos, partitionnées par mois sous PostgreSQL.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 18:12:47
+
+Les partitions mensuelles sont créées par l'archivage (``app.archive``) au
+fur et à mesure ; la partition par défaut ne reçoit rien en temps normal.
+
+Sous SQLite, ``tickets`` passe en AUTOINCREMENT : sans cela, l'identifiant
+le plus élevé, une fois archivé, serait réattribué à un nouveau ticket.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+PRIORITY_RANK_SQL = (
+    "CASE priority WHEN 'LOW' THEN 0 WHEN 'MEDIUM' THEN 1 "
+    "WHEN 'HIGH' THEN 2 WHEN 'CRITICAL' THEN 3 END"
+)
+
+STATUSES = ("OPEN", "IN_PROGRESS", "RESOLVED", "CLOSED")
+PRIORITIES = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+
+def _enum(name: str, values) -> sa.Enum:
+    # Types PostgreSQL créés par 0001
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), "postgresql"
+    )
+
+
+def _sqlite_autoincrement(enabled: bool) -> None:
+    # Table recréée : l'index d'expression n'est pas reflété
+    op.drop_index("ix_tickets_priority_rank_id", table_name="tickets")
+    with op.batch_alter_table("tickets", recreate="always", table_kwargs={"sqlite_autoincrement": enabled}):
+        pass
+    op.create_index("ix_tickets_priority_rank_id", "tickets", [sa.text(PRIORITY_RANK_SQL), "id"])
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tickets_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("status", _enum("ticketstatus", STATUSES), nullable=False),
+        sa.Column("priority", _enum("ticketpriority", PRIORITIES), nullable=False),
+        sa.Column("creator_id", sa.Integer(), nullable=False),
+        sa.Column("assigned_to_id", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("resolved_at", sa.DateTime(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["assigned_to_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["creator_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index("ix_tickets_archive_id", "tickets_archive", ["id"])
+
+    op.create_table(
+        "comments_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("ticket_created_at", sa.DateTime(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("ticket_id", sa.Integer(), nullable=False),
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["author_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id", "ticket_created_at"),
+        postgresql_partition_by="RANGE (ticket_created_at)",
+    )
+    op.create_index(
+        "ix_comments_archive_ticket_created_at_id", "comments_archive", ["ticket_id", "created_at", "id"]
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE TABLE tickets_archive_default PARTITION OF tickets_archive DEFAULT")
+        op.execute("CREATE TABLE comments_archive_default PARTITION OF comments_archive DEFAULT")
+    elif op.get_bind().dialect.name == "sqlite":
+        _sqlite_autoincrement(True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        _sqlite_autoincrement(False)
+    # Les partitions sont supprimées avec leur table parente
+    op.drop_index("ix_comments_archive_ticket_created_at_id", table_name="comments_archive")
+    op.drop_table("comments_archive")
+    op.drop_index("ix_tickets_archive_id", table_name="tickets_archive")
+    op.drop_table("tickets_archive")
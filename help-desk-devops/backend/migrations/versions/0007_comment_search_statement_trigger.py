@@ -0,0 +1,100 @@
+"""Recherche : recalcul une fois par ticket à la modification de commentaires.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 19:40:12
+
+Sous PostgreSQL, la modification et la suppression de commentaires passent
+d'un trigger par ligne à un trigger par requête (tables de transition) :
+chaque ticket touché n'est recalculé qu'une fois, et pas du tout s'il est
+supprimé dans la même transaction (``helpdesk.deleting_tickets``).
+"""
+import os
+
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+SEARCH_CONFIG = os.getenv("SEARCH_CONFIG", "french")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS comments_search_vector_trigger ON comments")
+    op.execute(f"""
+CREATE OR REPLACE FUNCTION comments_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    UPDATE tickets
+    SET search_vector = coalesce(search_vector, ''::tsvector) ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', NEW.content), 'C')
+    WHERE id = NEW.ticket_id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION comments_search_vector_refresh() RETURNS trigger AS $$
+BEGIN
+    -- Recalcul complet via le trigger des tickets, une fois par ticket
+    IF TG_OP = 'DELETE' THEN
+        UPDATE tickets SET title = title
+        WHERE id IN (SELECT ticket_id FROM old_comments)
+        AND id <> ALL (string_to_array(
+            coalesce(current_setting('helpdesk.deleting_tickets', true), ''), ','
+        )::integer[]);
+    ELSE
+        UPDATE tickets SET title = title
+        WHERE id IN (
+            SELECT unnest(ARRAY[o.ticket_id, n.ticket_id])
+            FROM old_comments o JOIN new_comments n USING (id)
+            WHERE o.content IS DISTINCT FROM n.content OR o.ticket_id <> n.ticket_id
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER comments_search_vector_trigger
+    AFTER INSERT ON comments
+    FOR EACH ROW EXECUTE FUNCTION comments_search_vector_update();
+
+CREATE TRIGGER comments_search_vector_delete_trigger
+    AFTER DELETE ON comments REFERENCING OLD TABLE AS old_comments
+    FOR EACH STATEMENT EXECUTE FUNCTION comments_search_vector_refresh();
+
+CREATE TRIGGER comments_search_vector_change_trigger
+    AFTER UPDATE ON comments REFERENCING OLD TABLE AS old_comments NEW TABLE AS new_comments
+    FOR EACH STATEMENT EXECUTE FUNCTION comments_search_vector_refresh();
+""")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS comments_search_vector_change_trigger ON comments")
+    op.execute("DROP TRIGGER IF EXISTS comments_search_vector_delete_trigger ON comments")
+    op.execute("DROP TRIGGER IF EXISTS comments_search_vector_trigger ON comments")
+    op.execute("DROP FUNCTION IF EXISTS comments_search_vector_refresh()")
+    op.execute(f"""
+CREATE OR REPLACE FUNCTION comments_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE tickets
+        SET search_vector = coalesce(search_vector, ''::tsvector) ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', NEW.content), 'C')
+        WHERE id = NEW.ticket_id;
+    ELSE
+        -- Recalcul complet via le trigger des tickets
+        UPDATE tickets SET title = title WHERE id = OLD.ticket_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER comments_search_vector_trigger
+    AFTER INSERT OR UPDATE OF content OR DELETE ON comments
+    FOR EACH ROW EXECUTE FUNCTION comments_search_vector_update();
+""")
@@ -0,0 +1,88 @@
+"""Fixtures communes pour les tests."""
+import itertools
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Base SQLite jetable si aucune base n'est fournie (la CI fournit PostgreSQL)
+os.environ.setdefault(
+    "DATABASE_URL",
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(), "helpdesk_test.db"),
+)
+# Coût bcrypt minimal pour des tests rapides
+os.environ.setdefault("BCRYPT_ROUNDS", "5")
+# Tous les tests partagent l'adresse du client de test : limites activées au cas par cas
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import pytest
+from sqlalchemy import event
+
+from app.auth import create_access_token, hash_password
+from app.database import SessionLocal, engine
+from app.migrate import upgrade
+from app.models import User
+
+# Schéma créé par les migrations, comme en production
+upgrade()
+
+TEST_PASSWORD = "password123"
+TEST_PASSWORD_HASH = hash_password(TEST_PASSWORD)
+
+_sequence = itertools.count()
+
+
+@pytest.fixture
+def db():
+    """Session de base de données pour préparer les données de test."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """Fabrique d'utilisateurs uniques."""
+    def _make_user(is_admin: bool = False, is_active: bool = True) -> User:
+        n = next(_sequence)
+        user = User(
+            email=f"user{n}-{os.getpid()}@example.com",
+            username=f"user{n}_{os.getpid()}",
+            full_name=f"User {n}",
+            hashed_password=TEST_PASSWORD_HASH,
+            is_active=is_active,
+            is_admin=is_admin,
+        )
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+    return _make_user
+
+
+@pytest.fixture
+def auth_headers():
+    """En-têtes d'authentification pour un utilisateur."""
+    def _auth_headers(user: User) -> dict:
+        token = create_access_token(data={"sub": str(user.id)})
+        return {"Authorization": f"Bearer {token}"}
+    return _auth_headers
+
+
+@pytest.fixture
+def count_queries():
+    """Compter les requêtes SQL exécutées dans un bloc."""
+    @contextmanager
+    def _count_queries():
+        statements = []
+
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    return _count_queries
@@ -0,0 +1,95 @@
+"""Tests de l'archivage des tickets clos."""
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from app import archive, queries
+from app.main import app
+from app.models import ArchivedComment, ArchivedTicket, Comment, Ticket, TicketStatus
+from app.stats import reconcile_counters
+
+client = TestClient(app)
+
+
+def _ticket(db, user_id: int, status: TicketStatus, age_days: int, comments: int = 0) -> int:
+    """Créer un ticket dont la dernière modification date de ``age_days`` jours."""
+    ticket = Ticket(title="Poste lent", description="Le poste met dix minutes à démarrer.",
+                    status=status, creator_id=user_id, assigned_to_id=user_id)
+    db.add(ticket)
+    db.flush()
+    start = datetime(2023, 3, 1, 9, 0, 0)
+    db.add_all(
+        Comment(content=f"Relance {i}", ticket_id=ticket.id, author_id=user_id,
+                created_at=start + timedelta(minutes=i))
+        for i in range(comments)
+    )
+    db.commit()
+    # Hors ORM : onupdate remplacerait la date
+    db.execute(
+        update(Ticket).where(Ticket.id == ticket.id)
+        .values(updated_at=datetime.utcnow() - timedelta(days=age_days)),
+        execution_options={"synchronize_session": False},
+    )
+    db.commit()
+    return ticket.id
+
+
+def test_archives_only_old_closed_tickets(db, make_user):
+    """Seuls les tickets clos inactifs depuis le délai sont déplacés, commentaires compris."""
+    user = make_user()
+    old_closed = _ticket(db, user.id, TicketStatus.CLOSED, 400, comments=3)
+    old_resolved = _ticket(db, user.id, TicketStatus.RESOLVED, 400)
+    recent_closed = _ticket(db, user.id, TicketStatus.CLOSED, 10)
+    old_open = _ticket(db, user.id, TicketStatus.OPEN, 400)
+
+    assert archive.archive_closed_tickets(older_than_days=365, batch_size=1, pause=0) >= 2
+
+    remaining = {ticket_id for (ticket_id,) in db.query(Ticket.id).filter(
+        Ticket.id.in_([old_closed, old_resolved, recent_closed, old_open]))}
+    assert remaining == {recent_closed, old_open}
+    archived = {ticket.id for ticket in db.query(ArchivedTicket).filter(
+        ArchivedTicket.id.in_([old_closed, old_resolved]))}
+    assert archived == {old_closed, old_resolved}
+    assert db.query(Comment).filter(Comment.ticket_id == old_closed).count() == 0
+    assert db.query(ArchivedComment).filter(ArchivedComment.ticket_id == old_closed).count() == 3
+
+
+def test_archived_ticket_reads_are_transparent(monkeypatch, db, make_user, auth_headers):
+    """Détail et commentaires d'un ticket archivé restent identiques ; la liste l'ignore."""
+    monkeypatch.setattr(queries, "TICKET_COMMENTS_LIMIT", 2)
+    user = make_user()
+    headers = auth_headers(user)
+    ticket_id = _ticket(db, user.id, TicketStatus.CLOSED, 400, comments=3)
+    before = client.get(f"/api/tickets/{ticket_id}", headers=headers)
+    page_before = client.get(
+        f"/api/tickets/{ticket_id}/comments", params={"cursor": before.json()["comments_next_cursor"]}, headers=headers
+    ).json()
+
+    archive.archive_closed_tickets(older_than_days=365, pause=0)
+
+    after = client.get(f"/api/tickets/{ticket_id}", headers=headers)
+    assert after.status_code == 200
+    assert after.json() == before.json()
+    assert after.headers["ETag"] == before.headers["ETag"]
+    response = client.get(f"/api/tickets/{ticket_id}", headers={**headers, "If-None-Match": after.headers["ETag"]})
+    assert response.status_code == 304
+
+    page_after = client.get(
+        f"/api/tickets/{ticket_id}/comments", params={"cursor": after.json()["comments_next_cursor"]}, headers=headers
+    ).json()
+    assert page_after == page_before
+    assert [comment["content"] for comment in page_after["items"]] == ["Relance 2"]
+
+    listed = client.get("/api/tickets/", params={"creator_id": user.id}, headers=headers).json()
+    assert ticket_id not in [ticket["id"] for ticket in listed]
+
+
+def test_stats_count_archived_tickets(db, make_user, auth_headers):
+    """Les statistiques sont inchangées par l'archivage et la réconciliation."""
+    user = make_user()
+    headers = auth_headers(user)
+    _ticket(db, user.id, TicketStatus.CLOSED, 400)
+    before = client.get("/api/tickets/stats", headers=headers).json()
+
+    archive.archive_closed_tickets(older_than_days=365, pause=0)
+    assert client.get("/api/tickets/stats", headers=headers).json() == before
+    assert reconcile_counters(db) == 0
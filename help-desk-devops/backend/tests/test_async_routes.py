@@ -0,0 +1,91 @@
+"""Tests de la pile asynchrone (AsyncSession + routes async)."""
+import json
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.main import app as sync_app  # noqa: F401  (création des tables)
+from app.routes import auth_async, tickets_async
+
+async_app = FastAPI()
+async_app.include_router(auth_async.router)
+async_app.include_router(tickets_async.router)
+
+client = TestClient(async_app)
+
+
+def test_async_login(make_user):
+    """La connexion fonctionne via la session asynchrone."""
+    user = make_user()
+    response = client.post(
+        "/api/auth/login", json={"email": user.email, "password": "password123"}
+    )
+    assert response.status_code == 200
+    assert response.json()["user"]["id"] == user.id
+
+    response = client.post(
+        "/api/auth/login", json={"email": user.email, "password": "wrongpassword"}
+    )
+    assert response.status_code == 401
+
+
+def test_async_ticket_lifecycle(make_user, auth_headers):
+    """Création, lecture, mise à jour, commentaire et suppression en asynchrone."""
+    user = make_user()
+    headers = auth_headers(user)
+
+    response = client.post(
+        "/api/tickets/",
+        json={"title": "Écran noir", "description": "L'écran reste noir au démarrage."},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    ticket_id = response.json()["id"]
+
+    response = client.post(
+        f"/api/tickets/{ticket_id}/comments", json={"content": "Câble vérifié"}, headers=headers
+    )
+    assert response.status_code == 201
+
+    response = client.put(
+        f"/api/tickets/{ticket_id}", json={"status": "resolved"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["resolved_at"] is not None
+
+    response = client.get(f"/api/tickets/{ticket_id}", headers=headers)
+    assert response.status_code == 200
+    assert [c["content"] for c in response.json()["comments"]] == ["Câble vérifié"]
+
+    etag = response.headers["ETag"]
+    response = client.get(f"/api/tickets/{ticket_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = client.get("/api/tickets/", params={"cursor": "", "limit": 100}, headers=headers)
+    assert ticket_id in {item["id"] for item in response.json()["items"]}
+
+    response = client.get("/api/tickets/stats", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["by_status"]["resolved"] >= 1
+
+    response = client.delete(f"/api/tickets/{ticket_id}", headers=headers)
+    assert response.status_code == 204
+    response = client.get(f"/api/tickets/{ticket_id}/comments", headers=headers)
+    assert response.status_code == 404
+
+
+def test_async_export_comments(make_user, auth_headers):
+    """L'export NDJSON est lu en flux par la session asynchrone."""
+    headers = auth_headers(make_user())
+    ticket_id = client.post(
+        "/api/tickets/",
+        json={"title": "Clavier HS", "description": "Plusieurs touches ne répondent plus."},
+        headers=headers,
+    ).json()["id"]
+    for content in ("Premier", "Second"):
+        client.post(f"/api/tickets/{ticket_id}/comments", json={"content": content}, headers=headers)
+
+    response = client.get(f"/api/tickets/{ticket_id}/comments/export", headers=headers)
+    assert response.status_code == 200
+    assert [line["content"] for line in map(json.loads, response.text.splitlines())] == ["Premier", "Second"]
+
+    page = client.get(f"/api/tickets/{ticket_id}/comments", params={"cursor": "", "limit": 1}, headers=headers).json()
+    assert len(page["items"]) == 1 and page["next_cursor"]
@@ -0,0 +1,90 @@
+"""Tests des opérations par lot sur les tickets."""
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models import Ticket, TicketStatus
+from app.stats import reconcile_counters
+
+client = TestClient(app)
+
+
+def _ticket(n: int) -> dict:
+    return {"title": f"Alerte sonde {n}", "description": "Seuil CPU dépassé sur le nœud."}
+
+
+def test_batch_create_reports_per_item(make_user, auth_headers, count_queries):
+    """Les éléments valides sont insérés en une requête ; les invalides sont signalés."""
+    user = make_user()
+    headers = auth_headers(user)
+    # L'utilisateur courant est ensuite servi par le cache
+    assert client.get("/api/tickets/stats", headers=headers).status_code == 200
+    items = [_ticket(n) for n in range(50)]
+    items[3] = {"title": "x", "description": "Trop court"}
+
+    with count_queries() as statements:
+        response = client.post("/api/tickets/batch", json={"items": items}, headers=headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (49, 1)
+    assert body["results"][3]["status"] == 422
+    assert body["results"][3]["detail"][0]["loc"] == ["title"]
+    assert [r["status"] for i, r in enumerate(body["results"]) if i != 3] == [201] * 49
+
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT INTO TICKETS")]
+    assert len(inserts) == 1
+
+    ids = [r["id"] for r in body["results"] if r["id"] is not None]
+    assert len(set(ids)) == 49
+    listed = client.get("/api/tickets/", params={"creator_id": user.id, "limit": 100}, headers=headers)
+    assert {t["id"] for t in listed.json()} == set(ids)
+
+
+def test_batch_update_and_assign(db, make_user, auth_headers):
+    """Mises à jour par lot avec contrôle des permissions, puis assignation."""
+    owner, other, agent = make_user(), make_user(), make_user()
+    headers = auth_headers(owner)
+    created = client.post(
+        "/api/tickets/batch", json={"items": [_ticket(n) for n in range(3)]}, headers=headers
+    ).json()
+    ids = [r["id"] for r in created["results"]]
+    foreign = client.post("/api/tickets/", json=_ticket(9), headers=auth_headers(other)).json()["id"]
+
+    response = client.patch(
+        "/api/tickets/batch",
+        json={"items": [
+            {"id": ids[0], "status": "resolved"},
+            {"id": ids[1], "priority": "critical", "title": "Alerte critique"},
+            {"id": ids[1], "status": "closed"},
+            {"id": foreign, "status": "closed"},
+            {"id": 999999999, "status": "closed"},
+            {"id": ids[2], "assigned_to_id": 999999999},
+            {"id": ids[2], "status": "unknown"},
+        ]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == [200, 200, 422, 403, 404, 422, 422]
+
+    db.expire_all()
+    resolved = db.get(Ticket, ids[0])
+    assert resolved.status == TicketStatus.RESOLVED and resolved.resolved_at is not None
+    assert db.get(Ticket, ids[1]).title == "Alerte critique"
+    assert db.get(Ticket, foreign).status == TicketStatus.OPEN
+
+    response = client.post(
+        "/api/tickets/batch/assign",
+        json={"ticket_ids": ids, "assigned_to_id": agent.id},
+        headers=headers,
+    )
+    assert response.json()["succeeded"] == 3
+    db.expire_all()
+    assert {db.get(Ticket, ticket_id).assigned_to_id for ticket_id in ids} == {agent.id}
+
+    # Les compteurs de statistiques ont suivi les écritures par lot
+    assert reconcile_counters(db) == 0
+
+
+def test_batch_size_limit(make_user, auth_headers):
+    """Un lot vide ou trop grand est refusé en bloc."""
+    headers = auth_headers(make_user())
+    assert client.post("/api/tickets/batch", json={"items": []}, headers=headers).status_code == 422
@@ -0,0 +1,87 @@
+"""Tests du cache TTL/LRU et du cache des utilisateurs authentifiés."""
+import time
+from fastapi.testclient import TestClient
+from jose import jwt
+from app.auth import ALGORITHM, SECRET_KEY, Principal, principal_cache, token_cache
+from app.cache import TTLCache
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_ttl_cache_lru_eviction():
+    """Au-delà de maxsize, l'entrée la moins récemment lue est évincée."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_ttl_cache_expiry():
+    """Une entrée expirée n'est plus servie."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_current_user_served_from_cache(make_user, auth_headers, count_queries):
+    """La deuxième requête authentifiée ne relit pas l'utilisateur."""
+    headers = auth_headers(make_user())
+    client.get("/api/tickets/?limit=1", headers=headers)
+
+    with count_queries() as statements:
+        response = client.get("/api/tickets/?limit=1", headers=headers)
+    assert response.status_code == 200
+    assert len(statements) == 1
+
+
+def test_deactivation_invalidates_cache(db, make_user, auth_headers):
+    """Désactiver un utilisateur via l'ORM le retire du cache."""
+    user = make_user()
+    headers = auth_headers(user)
+    assert client.get("/api/tickets/?limit=1", headers=headers).status_code == 200
+    assert principal_cache.get(user.id) is not None
+
+    user.is_active = False
+    db.commit()
+    assert principal_cache.get(user.id) is None
+    assert client.get("/api/tickets/?limit=1", headers=headers).status_code == 403
+
+
+def test_cache_invalidated_again_after_commit(db, make_user):
+    """Une entrée remise en cache entre le flush et le commit est retirée au commit."""
+    user = make_user()
+    user.is_active = False
+    db.flush()
+    # Requête concurrente : relit la ligne encore validée (active)
+    principal_cache.set(user.id, Principal(id=user.id, is_active=True, is_admin=False))
+    db.commit()
+    assert principal_cache.get(user.id) is None
+
+
+def test_token_without_exp_or_numeric_sub(make_user):
+    """Token signé sans exp : accepté ; sub non numérique : 401, pas 500."""
+    user = make_user()
+    token = jwt.encode({"sub": str(user.id)}, SECRET_KEY, algorithm=ALGORITHM)
+    response = client.get("/api/tickets/?limit=1", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+
+    token = jwt.encode({"sub": "admin", "exp": time.time() + 60}, SECRET_KEY, algorithm=ALGORITHM)
+    response = client.get("/api/tickets/?limit=1", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+
+def test_health_cache_counters():
+    """Les compteurs des caches sont exposés."""
+    response = client.get("/health/cache")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["principals"]["maxsize"] == principal_cache.maxsize
+    assert body["tokens"]["maxsize"] == token_cache.maxsize
+    assert {"hits", "misses", "evictions"} <= set(body["principals"])
@@ -0,0 +1,106 @@
+"""Tests de la pagination et de l'export des commentaires d'un ticket."""
+import json
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from app import queries
+from app.main import app
+from app.models import Comment, Ticket
+
+client = TestClient(app)
+
+
+def _thread(db, user_id: int, count: int) -> tuple:
+    """Créer un ticket et ``count`` commentaires (deux par instant, pour le départage par id)."""
+    ticket = Ticket(title="Incident messagerie", description="Messagerie indisponible.", creator_id=user_id)
+    db.add(ticket)
+    db.flush()
+    start = datetime(2024, 1, 1, 8, 0, 0)
+    comments = [
+        Comment(content=f"Point {i}", ticket_id=ticket.id, author_id=user_id,
+                created_at=start + timedelta(minutes=i // 2))
+        for i in range(count)
+    ]
+    db.add_all(comments)
+    db.commit()
+    return ticket.id, [comment.id for comment in comments]
+
+
+def test_comments_cursor_pagination(db, make_user, auth_headers):
+    """Les pages suivent l'ordre chronologique, sans doublon ni oubli."""
+    user = make_user()
+    headers = auth_headers(user)
+    ticket_id, comment_ids = _thread(db, user.id, 7)
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        response = client.get(
+            f"/api/tickets/{ticket_id}/comments", params={"cursor": cursor, "limit": 3}, headers=headers
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 3
+        seen.extend(comment["id"] for comment in page["items"])
+        cursor = page["next_cursor"]
+    assert seen == comment_ids
+
+    # Sans curseur : liste des premiers commentaires
+    response = client.get(f"/api/tickets/{ticket_id}/comments", params={"limit": 2}, headers=headers)
+    assert [comment["id"] for comment in response.json()] == comment_ids[:2]
+
+    response = client.get(f"/api/tickets/{ticket_id}/comments", params={"cursor": "invalide"}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_ticket_detail_caps_comments(monkeypatch, db, make_user, auth_headers):
+    """Le détail n'intègre que les premiers commentaires, avec le total et la suite."""
+    monkeypatch.setattr(queries, "TICKET_COMMENTS_LIMIT", 3)
+    user = make_user()
+    headers = auth_headers(user)
+    ticket_id, comment_ids = _thread(db, user.id, 7)
+
+    ticket = client.get(f"/api/tickets/{ticket_id}", headers=headers).json()
+    assert [comment["id"] for comment in ticket["comments"]] == comment_ids[:3]
+    assert ticket["comment_count"] == 7
+
+    page = client.get(
+        f"/api/tickets/{ticket_id}/comments",
+        params={"cursor": ticket["comments_next_cursor"], "limit": 10},
+        headers=headers,
+    ).json()
+    assert [comment["id"] for comment in page["items"]] == comment_ids[3:]
+    assert page["next_cursor"] is None
+
+
+def test_comments_pages_have_distinct_etags(db, make_user, auth_headers):
+    """Chaque page a son ETag : une page en cache ne valide pas la suivante."""
+    user = make_user()
+    headers = auth_headers(user)
+    ticket_id, _ = _thread(db, user.id, 4)
+    url = f"/api/tickets/{ticket_id}/comments"
+
+    first = client.get(url, params={"cursor": "", "limit": 2}, headers=headers)
+    second = client.get(url, params={"cursor": first.json()["next_cursor"], "limit": 2}, headers=headers)
+    assert first.headers["ETag"] != second.headers["ETag"]
+
+    response = client.get(
+        url, params={"cursor": "", "limit": 2}, headers={**headers, "If-None-Match": first.headers["ETag"]}
+    )
+    assert response.status_code == 304
+
+
+def test_export_comments_ndjson(monkeypatch, db, make_user, auth_headers):
+    """L'export renvoie tout le fil en NDJSON, lu par lots."""
+    monkeypatch.setattr(queries, "EXPORT_BATCH_SIZE", 2)
+    user = make_user()
+    headers = auth_headers(user)
+    ticket_id, comment_ids = _thread(db, user.id, 5)
+
+    response = client.get(f"/api/tickets/{ticket_id}/comments/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [comment["id"] for comment in lines] == comment_ids
+    assert lines[0]["author"]["id"] == user.id
+
+    response = client.get("/api/tickets/999999999/comments/export", headers=headers)
+    assert response.status_code == 404
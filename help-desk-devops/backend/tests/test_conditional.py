@@ -0,0 +1,104 @@
+"""Tests des requêtes conditionnelles (ETag, Last-Modified)."""
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def _create_ticket(headers) -> int:
+    response = client.post(
+        "/api/tickets/",
+        json={"title": "Badge", "description": "Badge d'accès refusé"},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_ticket_etag_revalidation(make_user, auth_headers, count_queries):
+    """Un ticket inchangé est répondu en 304 par une seule requête agrégée."""
+    headers = auth_headers(make_user())
+    ticket_id = _create_ticket(headers)
+
+    response = client.get(f"/api/tickets/{ticket_id}", headers=headers)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    with count_queries() as statements:
+        response = client.get(f"/api/tickets/{ticket_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    assert len(statements) == 1
+    assert "users" not in statements[0]
+
+    # Un nouveau commentaire change la version
+    client.post(f"/api/tickets/{ticket_id}/comments", json={"content": "Badge réactivé"}, headers=headers)
+    response = client.get(f"/api/tickets/{ticket_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()["comments"]) == 1
+
+    # Une modification du ticket aussi
+    etag = response.headers["ETag"]
+    client.put(f"/api/tickets/{ticket_id}", json={"status": "resolved"}, headers=headers)
+    response = client.get(f"/api/tickets/{ticket_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+
+
+def test_comments_etag(make_user, auth_headers):
+    """Les commentaires ont leur propre ETag, distinct de celui du ticket."""
+    headers = auth_headers(make_user())
+    ticket_id = _create_ticket(headers)
+    client.post(f"/api/tickets/{ticket_id}/comments", json={"content": "Vu"}, headers=headers)
+
+    etag = client.get(f"/api/tickets/{ticket_id}/comments", headers=headers).headers["ETag"]
+    assert etag != client.get(f"/api/tickets/{ticket_id}", headers=headers).headers["ETag"]
+
+    response = client.get(
+        f"/api/tickets/{ticket_id}/comments", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    response = client.get("/api/tickets/999999999/comments", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 404
+
+
+def test_list_validators(make_user, auth_headers):
+    """La liste porte un ETag honoré en 304 ; If-Modified-Since seul ne donne pas de 304."""
+    user = make_user()
+    headers = auth_headers(user)
+    _create_ticket(headers)
+    params = {"creator_id": user.id}
+
+    response = client.get("/api/tickets/", params=params, headers=headers)
+    etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+
+    response = client.get("/api/tickets/", params=params, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = client.get(
+        "/api/tickets/", params=params, headers={**headers, "If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 200
+
+    # Un nouveau ticket change la page
+    _create_ticket(headers)
+    response = client.get("/api/tickets/", params=params, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+def test_list_if_modified_since_after_delete(make_user, auth_headers):
+    """Supprimer un ticket qui n'est pas le plus récent change la page : pas de 304 sur If-Modified-Since."""
+    user = make_user()
+    headers = auth_headers(user)
+    older = _create_ticket(headers)
+    _create_ticket(headers)
+    params = {"creator_id": user.id}
+    last_modified = client.get("/api/tickets/", params=params, headers=headers).headers["Last-Modified"]
+
+    assert client.delete(f"/api/tickets/{older}", headers=headers).status_code == 204
+    response = client.get("/api/tickets/", params=params, headers={**headers, "If-Modified-Since": last_modified})
+    assert response.status_code == 200
+    assert older not in {ticket["id"] for ticket in response.json()}
@@ -0,0 +1,88 @@
+"""Tests du flux des changements de tickets."""
+import asyncio
+import json
+from fastapi.testclient import TestClient
+from app.events import broker, stream_events
+from app.main import app
+
+client = TestClient(app)
+
+
+class _ConnectedRequest:
+    """Requête factice dont le client reste connecté."""
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+async def _next_event(subscriber) -> dict:
+    return json.loads(await asyncio.wait_for(subscriber.queue.get(), timeout=5))
+
+
+def test_write_routes_publish_events(make_user, auth_headers):
+    """Création, modification, commentaire et suppression publient un événement."""
+    headers = auth_headers(make_user())
+
+    async def scenario():
+        subscriber = broker.subscribe()
+        try:
+            response = await asyncio.to_thread(
+                client.post, "/api/tickets/",
+                json={"title": "Wifi en panne", "description": "Plus aucun accès réseau"}, headers=headers,
+            )
+            assert response.status_code == 201, response.text
+            ticket_id = response.json()["id"]
+            event = await _next_event(subscriber)
+            assert event["type"] == "ticket.created"
+            assert event["ticket"]["id"] == ticket_id
+            assert event["ticket"]["creator"]["id"] == response.json()["creator_id"]
+
+            await asyncio.to_thread(
+                client.put, f"/api/tickets/{ticket_id}", json={"status": "in_progress"}, headers=headers
+            )
+            event = await _next_event(subscriber)
+            assert (event["type"], event["ticket"]["status"]) == ("ticket.updated", "in_progress")
+
+            await asyncio.to_thread(
+                client.post, f"/api/tickets/{ticket_id}/comments", json={"content": "Borne redémarrée"},
+                headers=headers,
+            )
+            event = await _next_event(subscriber)
+            assert (event["type"], event["ticket_id"]) == ("comment.created", ticket_id)
+            assert "content" not in event
+
+            await asyncio.to_thread(client.delete, f"/api/tickets/{ticket_id}", headers=headers)
+            assert await _next_event(subscriber) == {"type": "ticket.deleted", "ticket_id": ticket_id}
+        finally:
+            broker.unsubscribe(subscriber)
+
+    asyncio.run(scenario())
+
+
+def test_stream_messages():
+    """Le flux émet les événements en SSE, des keepalives et un resync en cas de retard."""
+    async def scenario():
+        subscriber = broker.subscribe()
+        messages = stream_events(_ConnectedRequest(), subscriber, keepalive=0.05)
+        assert (await messages.__anext__()).startswith("retry:")
+
+        broker.dispatch('{"type":"ticket.deleted","ticket_id":1}')
+        assert await messages.__anext__() == 'data: {"type":"ticket.deleted","ticket_id":1}\n\n'
+        assert await messages.__anext__() == ": keepalive\n\n"
+
+        for _ in range(subscriber.queue.maxsize + 1):
+            broker.dispatch('{"type":"ticket.deleted","ticket_id":2}')
+        await asyncio.sleep(0)
+        assert await messages.__anext__() == 'data: {"type":"resync"}\n\n'
+        assert subscriber.queue.empty()
+
+        await messages.aclose()
+        assert broker.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_stream_requires_authentication():
+    """Le flux est réservé aux utilisateurs authentifiés."""
+    response = client.get("/api/tickets/stream")
+    assert response.status_code == 403
@@ -0,0 +1,109 @@
+"""Tests de l'export en masse des tickets."""
+import csv
+import gzip
+import io
+import json
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app import export
+from app.main import app
+from app.models import Comment, Ticket, TicketPriority, TicketStatus
+from app.routes import auth_async, tickets_async
+
+client = TestClient(app)
+
+async_app = FastAPI()
+async_app.include_router(auth_async.router)
+async_app.include_router(tickets_async.router)
+async_client = TestClient(async_app)
+
+
+def _tickets(db, user_id: int) -> list:
+    """Trois tickets du même créateur, le premier avec deux commentaires."""
+    tickets = [
+        Ticket(title="Imprimante", description="Bourrage papier, encore.", creator_id=user_id,
+               priority=TicketPriority.HIGH),
+        Ticket(title="Messagerie", description="Les pièces jointes n'arrivent pas.", creator_id=user_id),
+        Ticket(title="VPN", description="Coupures, toutes les heures.", creator_id=user_id,
+               status=TicketStatus.CLOSED),
+    ]
+    db.add_all(tickets)
+    db.flush()
+    db.add_all([
+        Comment(content="Papier changé", ticket_id=tickets[0].id, author_id=user_id),
+        Comment(content='Toujours "bloqué", ligne 2\nsuite', ticket_id=tickets[0].id, author_id=user_id),
+    ])
+    db.commit()
+    return [ticket.id for ticket in tickets]
+
+
+def test_export_ndjson_with_filters(monkeypatch, db, make_user, auth_headers):
+    """Les filtres et le tri de la liste s'appliquent ; les commentaires sont imbriqués."""
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+    user, admin = make_user(), make_user(is_admin=True)
+    first, second, closed = _tickets(db, user.id)
+
+    response = client.get(
+        "/api/tickets/export",
+        params={"creator_id": user.id, "status": "open", "order": "asc"},
+        headers=auth_headers(admin),
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [first, second]
+    assert lines[0]["priority"] == "high"
+    assert [comment["content"] for comment in lines[0]["comments"]] == [
+        "Papier changé", 'Toujours "bloqué", ligne 2\nsuite'
+    ]
+    assert lines[1]["comments"] == []
+
+    response = client.get(
+        "/api/tickets/export", params={"creator_id": user.id, "comments": False}, headers=auth_headers(admin)
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [closed, second, first]
+    assert all(line["comments"] == [] for line in lines)
+
+
+def test_export_csv_gzip(db, make_user, auth_headers):
+    """CSV compressé : une ligne par commentaire, une ligne vide de commentaire sinon."""
+    user, admin = make_user(), make_user(is_admin=True)
+    first, second, closed = _tickets(db, user.id)
+
+    response = client.get(
+        "/api/tickets/export",
+        params={"format": "csv", "gzip": True, "creator_id": user.id, "order": "asc"},
+        headers=auth_headers(admin),
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-disposition"] == 'attachment; filename="tickets.csv"'
+    # Décompressé par httpx selon Content-Encoding
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(int(row["id"]), row["comment_content"]) for row in rows] == [
+        (first, "Papier changé"),
+        (first, 'Toujours "bloqué", ligne 2\nsuite'),
+        (second, ""),
+        (closed, ""),
+    ]
+    assert rows[3]["status"] == "closed"
+    assert gzip.decompress(b"".join(export.gzip_stream([b"a,b\n", b"", b"c,d\n"]))) == b"a,b\nc,d\n"
+
+
+def test_export_requires_admin(make_user, auth_headers):
+    """Un agent non administrateur reçoit 403, sur les deux piles."""
+    headers = auth_headers(make_user())
+    assert client.get("/api/tickets/export", headers=headers).status_code == 403
+    assert async_client.get("/api/tickets/export", headers=headers).status_code == 403
+
+
+def test_async_export(db, make_user, auth_headers):
+    """La pile asynchrone produit le même export."""
+    user, admin = make_user(), make_user(is_admin=True)
+    _tickets(db, user.id)
+    params = {"creator_id": user.id, "format": "csv"}
+    expected = client.get("/api/tickets/export", params=params, headers=auth_headers(admin)).text
+    response = async_client.get("/api/tickets/export", params={**params, "gzip": True}, headers=auth_headers(admin))
+    assert response.status_code == 200
+    assert response.text == expected
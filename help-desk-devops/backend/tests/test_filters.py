@@ -0,0 +1,177 @@
+"""Tests des filtres et tris de la liste des tickets, et de leurs index."""
+import itertools
+from datetime import datetime, timedelta
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.database import engine
+from app.main import app
+from app.models import Ticket, TicketPriority, TicketStatus
+
+client = TestClient(app)
+
+SORTS = ["created_at", "updated_at", "priority"]
+
+
+@pytest.fixture
+def seeded(db, make_user):
+    """Tickets variés pour un créateur et un assigné dédiés."""
+    creator, assignee = make_user(), make_user()
+    base = datetime(2023, 6, 1)
+    specs = [
+        (TicketStatus.OPEN, TicketPriority.HIGH, assignee.id, 0),
+        (TicketStatus.OPEN, TicketPriority.LOW, None, 1),
+        (TicketStatus.IN_PROGRESS, TicketPriority.CRITICAL, assignee.id, 2),
+        (TicketStatus.CLOSED, TicketPriority.MEDIUM, None, 3),
+        (TicketStatus.OPEN, TicketPriority.CRITICAL, None, 4),
+    ]
+    ids = []
+    for status, priority, assigned_to_id, day in specs:
+        ticket = Ticket(
+            title=f"Ticket {status.value} {priority.value}",
+            description="Ticket de test des filtres.",
+            status=status,
+            priority=priority,
+            creator_id=creator.id,
+            assigned_to_id=assigned_to_id,
+            created_at=base + timedelta(days=day),
+            updated_at=base + timedelta(days=10 - day),
+        )
+        db.add(ticket)
+        db.flush()
+        ids.append(ticket.id)
+    db.commit()
+    return {"creator": creator, "assignee": assignee, "ids": ids}
+
+
+def _list(headers, **params):
+    response = client.get("/api/tickets/", params={"limit": 100, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_combined_filters(seeded, auth_headers):
+    """Les filtres se combinent."""
+    headers = auth_headers(seeded["creator"])
+    creator_id, ids = seeded["creator"].id, seeded["ids"]
+
+    items = _list(headers, creator_id=creator_id, status="open")
+    assert {item["id"] for item in items} == {ids[0], ids[1], ids[4]}
+
+    items = _list(headers, creator_id=creator_id, status="open", unassigned=True)
+    assert {item["id"] for item in items} == {ids[1], ids[4]}
+
+    items = _list(headers, assigned_to_id=seeded["assignee"].id, priority="critical")
+    assert [item["id"] for item in items] == [ids[2]]
+
+    items = _list(
+        headers, creator_id=creator_id,
+        created_after="2023-06-02T00:00:00", created_before="2023-06-04T00:00:00",
+    )
+    assert {item["id"] for item in items} == {ids[1], ids[2]}
+
+    items = _list(headers, creator_id=creator_id, updated_after="2023-06-10T00:00:00")
+    assert {item["id"] for item in items} == {ids[0], ids[1]}
+
+
+def test_sort_by_priority_and_updated_at(seeded, auth_headers):
+    """Tri métier des priorités et tri par date de mise à jour, en mode curseur."""
+    headers = auth_headers(seeded["creator"])
+    creator_id, ids = seeded["creator"].id, seeded["ids"]
+
+    page = _list(headers, creator_id=creator_id, sort="priority", order="asc", cursor="")
+    assert [item["priority"] for item in page["items"]] == ["low", "medium", "high", "critical", "critical"]
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = _list(headers, creator_id=creator_id, sort="priority", limit=2, cursor=cursor)
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+    assert seen == [ids[4], ids[2], ids[0], ids[3], ids[1]]
+
+    items = _list(headers, creator_id=creator_id, sort="updated_at", order="asc")
+    assert [item["id"] for item in items] == list(reversed(ids))
+
+
+def test_invalid_filter_combination(make_user, auth_headers):
+    """unassigned et assigned_to_id sont exclusifs."""
+    response = client.get(
+        "/api/tickets/", params={"unassigned": True, "assigned_to_id": 1},
+        headers=auth_headers(make_user()),
+    )
+    assert response.status_code == 400
+
+
+def _filter_combinations(user_id: int):
+    filters = {
+        "status": {"status": "open"},
+        "priority": {"priority": "high"},
+        "assigned": {"assigned_to_id": user_id},
+        "unassigned": {"unassigned": True},
+        "creator": {"creator_id": user_id},
+        "created": {"created_after": "2023-01-01T00:00:00", "created_before": "2024-01-01T00:00:00"},
+        "updated": {"updated_after": "2023-01-01T00:00:00"},
+    }
+    for size in range(3):
+        for names in itertools.combinations(filters, size):
+            if {"assigned", "unassigned"} <= set(names):
+                continue
+            params = {}
+            for name in names:
+                params.update(filters[name])
+            yield names, params
+
+
+def _explain(connection, statement, parameters) -> list:
+    """Plan d'exécution d'une requête, sous forme de lignes de texte."""
+    if connection.dialect.name == "postgresql":
+        # Sur une petite table, PostgreSQL préfère toujours le parcours
+        # séquentiel : on vérifie qu'un chemin par index existe.
+        connection.exec_driver_sql("SET enable_seqscan = off")
+        try:
+            rows = connection.exec_driver_sql("EXPLAIN " + statement, parameters).all()
+        finally:
+            connection.exec_driver_sql("SET enable_seqscan = on")
+        return [row[0] for row in rows]
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    return [row[-1] for row in rows]
+
+
+def _is_sequential_scan(plan: list) -> bool:
+    """
+    Parcours complet de ``tickets`` : Seq Scan (PostgreSQL), ou SCAN (SQLite)
+    sans index ou sur un index qui ne sert pas le tri (tri en B-tree temporaire).
+    """
+    lines = [line.strip() for line in plan]
+    if any("Seq Scan on tickets" in line for line in lines):
+        return True
+    scans = [line for line in lines if line.startswith("SCAN tickets")]
+    sorts_afterwards = any(line.startswith("USE TEMP B-TREE FOR ORDER BY") for line in lines)
+    return any("USING" not in line or sorts_afterwards for line in scans)
+
+
+def test_filter_combinations_use_indexes(seeded, auth_headers):
+    """Aucune combinaison de filtres et de tris ne parcourt toute la table."""
+    headers = auth_headers(seeded["creator"])
+    captured = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM tickets" in statement:
+            captured.append((statement, parameters))
+
+    failures = []
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        for names, params in _filter_combinations(seeded["assignee"].id):
+            for sort in SORTS:
+                captured.clear()
+                _list(headers, cursor="", sort=sort, **params)
+                statement, parameters = captured[-1]
+                with engine.connect() as connection:
+                    plan = _explain(connection, statement, parameters)
+                if _is_sequential_scan(plan):
+                    failures.append((names, sort, plan))
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+    assert not failures, "\n".join(f"{names} sort={sort}: {plan}" for names, sort, plan in failures)
@@ -0,0 +1,48 @@
+"""Tests du hachage des mots de passe dans le pool de processus."""
+import threading
+import uuid
+from fastapi.testclient import TestClient
+from passlib.hash import bcrypt
+from app import hashing
+from app.main import app
+from app.models import User
+
+client = TestClient(app)
+
+
+def test_register_and_login_use_hashing_pool():
+    """Enregistrement puis connexion avec un hachage calculé dans le pool."""
+    suffix = uuid.uuid4().hex[:8]
+    user = {"email": f"pool-{suffix}@example.com", "username": f"pool_{suffix}", "password": "password123"}
+    assert client.post("/api/auth/register", json=user).status_code == 201
+    response = client.post(
+        "/api/auth/login", json={"email": user["email"], "password": user["password"]}
+    )
+    assert response.status_code == 200
+
+
+def test_login_rehashes_stale_cost(db, make_user):
+    """Un hachage de coût obsolète est recalculé à la connexion."""
+    user = make_user()
+    user.hashed_password = bcrypt.using(rounds=4).hash("password123")
+    db.commit()
+    assert hashing.needs_rehash(user.hashed_password)
+
+    response = client.post("/api/auth/login", json={"email": user.email, "password": "password123"})
+    assert response.status_code == 200
+
+    db.expire_all()
+    refreshed = db.get(User, user.id)
+    assert not hashing.needs_rehash(refreshed.hashed_password)
+    assert hashing.pwd_context.verify("password123", refreshed.hashed_password)
+
+
+def test_login_rejected_when_hashing_queue_full(make_user, monkeypatch):
+    """File pleine : 429 avec Retry-After, sans calcul bcrypt."""
+    user = make_user()
+    monkeypatch.setattr(hashing, "_slots", threading.BoundedSemaphore(1))
+    hashing._slots.acquire()
+
+    response = client.post("/api/auth/login", json={"email": user.email, "password": "password123"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(hashing.HASH_RETRY_AFTER)
@@ -1,6 +1,10 @@
 """Tests pour la santé de l'application."""
+import sqlite3
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import exc
 from app.main import app
+from app.database import InstrumentedQueuePool, engine, pool_status
 
 client = TestClient(app)
 
@@ -17,3 +21,45 @@ def test_root():
     response = client.get("/")
     assert response.status_code == 200
     assert "message" in response.json()
+
+
+def test_health_db_pool_metrics():
+    """Le endpoint de santé DB expose les métriques du pool."""
+    client.get("/")
+    response = client.get("/health/db")
+    assert response.status_code == 200
+    pool = response.json()["pool"]
+    for key in ("size", "checked_out", "idle", "overflow", "checkouts", "wait_seconds_total"):
+        assert key in pool
+    assert pool["checked_out"] >= 0
+
+
+def test_pool_checkout_accounting():
+    """Chaque emprunt de connexion est compté et son attente mesurée."""
+    before = pool_status()
+    with engine.connect():
+        during = pool_status()
+    assert during["checked_out"] == before["checked_out"] + 1
+    assert during["checkouts"] == before["checkouts"] + 1
+    assert during["wait_seconds_total"] >= before["wait_seconds_total"]
+
+
+def test_pool_failures_not_counted_as_checkouts():
+    """Délai d'attente et erreur de connexion comptés à part, sans emprunt ni attente."""
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.01)
+    connection = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    connection.close()
+
+    def unreachable():
+        raise sqlite3.OperationalError("connection refused")
+
+    broken = InstrumentedQueuePool(unreachable, pool_size=1, max_overflow=0)
+    with pytest.raises(sqlite3.OperationalError):
+        broken.connect()
+
+    stats, broken_stats = pool.stats(), broken.stats()
+    assert (stats["checkouts"], stats["timeouts"], stats["connect_errors"]) == (1, 1, 0)
+    assert (broken_stats["checkouts"], broken_stats["timeouts"], broken_stats["connect_errors"]) == (0, 0, 1)
+    assert broken_stats["wait_seconds_total"] == 0
@@ -0,0 +1,197 @@
+"""Tests de l'import en masse."""
+import csv
+import json
+import uuid
+from datetime import datetime
+import pytest
+from sqlalchemy import inspect, select, text
+from app import importer
+from app.database import engine
+from app.importer import Importer
+from app.models import Comment, Ticket, TicketPriority, TicketStatus, User
+from app.stats import reconcile_counters
+
+
+@pytest.fixture
+def legacy(tmp_path, make_user):
+    """Export d'un système existant : un utilisateur déjà connu, deux nouveaux."""
+    known = make_user()
+    tag = uuid.uuid4().hex[:8]
+    users = tmp_path / "users.csv"
+    with open(users, "w", newline="") as output:
+        writer = csv.writer(output)
+        writer.writerow(["email", "username", "full_name", "is_admin", "created_at"])
+        writer.writerow([f"Alice-{tag}@Legacy.example", f"alice_{tag}", "Alice", "false", "2019-03-01T08:00:00"])
+        writer.writerow([f"bob-{tag}@legacy.example", f"bob_{tag}", "Bob", "true", ""])
+        writer.writerow(["", f"nobody_{tag}", "Sans email", "", ""])
+
+    tickets = tmp_path / "tickets.ndjson"
+    tickets.write_text("\n".join([
+        json.dumps({"id": f"{tag}-1", "title": "Imprimante", "description": "Bourrage papier",
+                    "status": "closed", "priority": "HIGH", "creator": f"alice-{tag}@legacy.example",
+                    "assignee": f"bob_{tag}", "created_at": "2019-03-02T09:00:00+01:00",
+                    "resolved_at": "2019-03-03T10:00:00"}),
+        json.dumps({"id": f"{tag}-2", "title": "Messagerie", "description": "Quota plein",
+                    "creator": known.username, "assignee": "inconnu"}),
+        json.dumps({"id": f"{tag}-3", "title": "Orphelin", "description": "Créateur inconnu",
+                    "creator": "inconnu"}),
+        "{pas du json",
+        json.dumps({"id": f"{tag}-4", "title": "Statut", "description": "Statut invalide",
+                    "status": "archived", "creator": known.email}),
+    ]) + "\n")
+
+    comments = tmp_path / "comments.csv"
+    with open(comments, "w", newline="") as output:
+        writer = csv.writer(output)
+        writer.writerow(["ticket", "author", "content", "created_at"])
+        writer.writerow([f"{tag}-1", f"bob_{tag}", "Papier changé", "2019-03-02T10:00:00"])
+        writer.writerow([f"{tag}-1", known.email, "Merci", "2019-03-02T11:00:00"])
+        writer.writerow([f"{tag}-3", known.email, "Ticket ignoré", ""])
+        writer.writerow([f"{tag}-2", "inconnu", "Auteur inconnu", ""])
+    return {"tag": tag, "known": known,
+            "paths": {"users": str(users), "tickets": str(tickets), "comments": str(comments)}}
+
+
+def test_import_maps_references(db, legacy):
+    """Utilisateurs, tickets et commentaires importés, références résolues par email ou nom."""
+    counts = Importer(db, batch_size=2).run(legacy["paths"])
+    tag, known = legacy["tag"], legacy["known"]
+
+    assert counts["users.staged"] == 2 and counts["users.rejected"] == 1
+    assert counts["tickets.rejected"] == 2 and counts["tickets.imported"] == 2
+    assert counts["tickets.skipped"] == 1
+    assert counts["comments.imported"] == counts["comments.skipped"] == 2
+    assert counts["users.skipped"] == 0
+
+    alice = db.scalar(select(User).where(User.username == f"alice_{tag}"))
+    bob = db.scalar(select(User).where(User.username == f"bob_{tag}"))
+    assert alice.email == f"alice-{tag}@legacy.example" and not alice.is_admin
+    assert alice.created_at == datetime(2019, 3, 1, 8, 0)
+    assert bob.is_admin
+
+    printer = db.scalar(select(Ticket).where(Ticket.creator_id == alice.id))
+    assert printer.status == TicketStatus.CLOSED and printer.priority == TicketPriority.HIGH
+    assert printer.assigned_to_id == bob.id
+    assert printer.created_at == datetime(2019, 3, 2, 8, 0)
+    assert printer.updated_at == printer.created_at
+    comments = db.scalars(select(Comment).where(Comment.ticket_id == printer.id).order_by(Comment.created_at)).all()
+    assert [(comment.content, comment.author_id) for comment in comments] == [
+        ("Papier changé", bob.id), ("Merci", known.id)
+    ]
+
+    mail = db.scalar(select(Ticket).where(Ticket.creator_id == known.id, Ticket.title == "Messagerie"))
+    assert mail.assigned_to_id is None and mail.status == TicketStatus.OPEN
+    assert db.scalar(select(Ticket).where(Ticket.title == "Orphelin", Ticket.description == "Créateur inconnu")) is None
+
+    # Compteurs réconciliés, tables de transit supprimées
+    assert reconcile_counters(db) == 0
+    assert not {"import_tickets", "import_checkpoints"} & set(inspect(engine).get_table_names())
+
+
+def test_import_resumes_after_interruption(monkeypatch, db, legacy):
+    """Une tranche interrompue est annulée avec son point de reprise, puis rejouée une seule fois."""
+    save = Importer._save
+    calls = {"count": 0}
+
+    def failing_save(self, step, position, done=False):
+        if step == "move:comments" and not done:
+            calls["count"] += 1
+            if calls["count"] == 2:
+                raise RuntimeError("coupure")
+        save(self, step, position, done)
+
+    monkeypatch.setattr(Importer, "_save", failing_save)
+    with pytest.raises(RuntimeError):
+        Importer(db, batch_size=1).run(legacy["paths"])
+    db.rollback()
+    assert "import_checkpoints" in inspect(engine).get_table_names()
+
+    counts = Importer(db, batch_size=1).run(legacy["paths"])
+    assert counts["users.staged"] == counts["tickets.staged"] == 0
+    tag = legacy["tag"]
+    alice = db.scalar(select(User).where(User.username == f"alice_{tag}"))
+    printer = db.scalar(select(Ticket).where(Ticket.creator_id == alice.id))
+    contents = db.scalars(select(Comment.content).where(Comment.ticket_id == printer.id)).all()
+    assert sorted(contents) == ["Merci", "Papier changé"]
+    assert db.scalar(select(Ticket.id).where(Ticket.creator_id == alice.id).where(Ticket.id != printer.id)) is None
+
+
+@pytest.mark.parametrize("batch_size", [1, 50])
+def test_import_rejects_duplicates(db, tmp_path, batch_size):
+    """Doublons (dans un lot ou d'un lot à l'autre) et champs trop longs écartés, sans interrompre l'import."""
+    tag = uuid.uuid4().hex[:8]
+    users = tmp_path / "users.csv"
+    with open(users, "w", newline="") as output:
+        writer = csv.writer(output)
+        writer.writerow(["email", "username"])
+        writer.writerow([f"a-{tag}@x.io", f"a_{tag}"])
+        writer.writerow([f"A-{tag}@x.io", f"a2_{tag}"])
+        writer.writerow([f"b-{tag}@x.io", f"a_{tag}"])
+        writer.writerow([f"c-{tag}@x.io", "c" * 101])
+    tickets = tmp_path / "tickets.ndjson"
+    tickets.write_text("\n".join(
+        json.dumps({"id": f"{tag}-1", "title": title, "description": "-", "creator": f"a_{tag}"})
+        for title in ("Premier", "Second")
+    ) + "\n")
+
+    counts = Importer(db, batch_size=batch_size).run({"users": str(users), "tickets": str(tickets)})
+    assert counts["users.staged"] == 1 and counts["users.rejected"] == 3
+    assert counts["tickets.imported"] == 1 and counts["tickets.rejected"] == 1
+    user = db.scalar(select(User).where(User.email == f"a-{tag}@x.io"))
+    assert user.username == f"a_{tag}"
+    assert db.scalars(select(Ticket.title).where(Ticket.creator_id == user.id)).all() == ["Premier"]
+
+
+def test_import_resumes_after_staging_loss(monkeypatch, db, legacy):
+    """Tables de transit vidées (UNLOGGED après un arrêt brutal) : rechargées, mêmes identifiants, sans doublon."""
+    save = Importer._save
+
+    def failing_save(self, step, position, done=False):
+        if step == "move:comments" and not done:
+            raise RuntimeError("coupure")
+        save(self, step, position, done)
+
+    monkeypatch.setattr(Importer, "_save", failing_save)
+    with pytest.raises(RuntimeError):
+        Importer(db, batch_size=1).run(legacy["paths"])
+    db.rollback()
+    monkeypatch.setattr(Importer, "_save", save)
+    for table in ("import_users", "import_tickets", "import_comments"):
+        db.execute(text(f"DELETE FROM {table}"))
+    db.commit()
+
+    counts = Importer(db, batch_size=1).run(legacy["paths"])
+    assert counts["tickets.staged"] == 3 and counts["tickets.imported"] == 0
+    tag = legacy["tag"]
+    alice = db.scalar(select(User).where(User.username == f"alice_{tag}"))
+    printer = db.scalar(select(Ticket).where(Ticket.creator_id == alice.id))
+    contents = db.scalars(select(Comment.content).where(Comment.ticket_id == printer.id)).all()
+    assert sorted(contents) == ["Merci", "Papier changé"]
+
+
+def test_resume_requires_same_files(db, legacy, tmp_path):
+    """Reprendre avec un autre fichier est refusé ; --reset abandonne l'import."""
+    first = Importer(db)
+    first.prepare()
+    first.stage("users", legacy["paths"]["users"])
+    other = tmp_path / "other.csv"
+    other.write_text("email,username\nx@example.com,x\n")
+    with pytest.raises(ValueError):
+        Importer(db).stage("users", str(other))
+    db.rollback()
+    importer.drop_staging(db)
+    assert "import_users" not in inspect(engine).get_table_names()
+
+
+@pytest.mark.filterwarnings("ignore:Skipped unsupported reflection")
+def test_defer_indexes(db, legacy):
+    """Les index différés sont reconstruits à l'identique."""
+    def indexes():
+        inspector = inspect(engine)
+        return sorted(
+            (index["name"], repr(index)) for table in ("tickets", "comments") for index in inspector.get_indexes(table)
+        )
+
+    before = indexes()
+    Importer(db, batch_size=2).run(legacy["paths"], defer_indexes=True)
+    assert indexes() == before
@@ -0,0 +1,43 @@
+"""Tests du générateur de données et de la comparaison des tests de charge."""
+from sqlalchemy import create_engine, func, select
+from benchmarks.common import summarize
+from benchmarks.loadtest import compare_to_baseline
+from benchmarks.seed import seed_database
+from app.models import Comment, Ticket, TicketCounter
+
+
+def test_seed_is_reproducible(tmp_path):
+    """Deux générations avec la même graine produisent les mêmes tickets."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    snapshots = []
+    for _ in range(2):
+        result = seed_database(engine, users=5, tickets=40, comments=60, seed=7)
+        with engine.connect() as conn:
+            snapshots.append(conn.execute(
+                select(Ticket.title, Ticket.status, Ticket.priority, Ticket.creator_id, Ticket.assigned_to_id)
+                .order_by(Ticket.id)
+            ).all())
+            assert conn.scalar(select(func.count()).select_from(Comment)) == 60
+            # Les compteurs de statistiques sont cohérents avec les tickets insérés
+            assert conn.scalar(select(func.sum(TicketCounter.count))) == 40
+    assert (len(result.user_ids), len(result.ticket_ids)) == (5, 40)
+    assert snapshots[0] == snapshots[1]
+    engine.dispose()
+
+
+def test_compare_to_baseline():
+    """Baisse de débit, hausse du p95 et nouvelles erreurs sont signalées au-delà du seuil."""
+    reference = summarize([0.010] * 90 + [0.050] * 10, errors=0, elapsed=1.0)
+    assert (reference["rps"], reference["p50_ms"], reference["p95_ms"]) == (100.0, 10.0, 50.0)
+    baseline = {"scenarios": {"detail": reference}}
+
+    within = {"scenarios": {"detail": {**reference, "rps": 90.0, "p95_ms": 55.0}}}
+    assert compare_to_baseline(within, baseline, threshold=0.15) == []
+
+    slower = {"scenarios": {"detail": {**reference, "rps": 80.0, "p95_ms": 60.0, "errors": 2}}}
+    regressions = compare_to_baseline(slower, baseline, threshold=0.15)
+    assert len(regressions) == 3
+    assert all(regression.startswith("detail:") for regression in regressions)
+
+    # Un scénario absent de la référence n'est pas comparé
+    assert compare_to_baseline({"scenarios": {"login": reference}}, baseline, threshold=0.15) == []
@@ -0,0 +1,39 @@
+"""Tests des métriques Prometheus."""
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def _sample(text: str, prefix: str) -> float:
+    """Valeur de la première ligne de métrique commençant par ``prefix``."""
+    line = next(line for line in text.splitlines() if line.startswith(prefix))
+    return float(line.rsplit(" ", 1)[1])
+
+
+def test_metrics_by_route_template(make_user, auth_headers):
+    """Les requêtes sont étiquetées par gabarit de route, avec leurs requêtes SQL."""
+    headers = auth_headers(make_user())
+    ticket_id = client.post(
+        "/api/tickets/", json={"title": "Imprimante HS", "description": "Bourrage papier"}, headers=headers
+    ).json()["id"]
+    assert client.get(f"/api/tickets/{ticket_id}", headers=headers).status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+
+    labels = 'method="GET",route="/api/tickets/{ticket_id}"'
+    assert f'http_requests_total{{{labels},status="200"}}' in text
+    assert f"/api/tickets/{ticket_id}\"" not in text
+    assert _sample(text, f"http_request_sql_statements_count{{{labels}}}") >= 1
+    assert _sample(text, f"http_request_sql_statements_sum{{{labels}}}") >= 1
+    assert _sample(text, f"http_response_size_bytes_sum{{{labels}}}") > 0
+
+
+def test_metrics_unmatched_route():
+    """Les chemins inconnus partagent une seule étiquette."""
+    client.get("/nulle-part/123")
+    text = client.get("/metrics").text
+    assert 'route="<unmatched>",status="404"' in text
@@ -0,0 +1,53 @@
+"""Tests des migrations du schéma."""
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from app.database import Base
+from app.migrate import alembic_config, current_revision, head_revision, include_for_dialect
+
+
+def test_migrations_match_models(tmp_path):
+    """La dernière migration produit exactement le schéma des modèles, et se défait."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "head")
+    with engine.connect() as connection:
+        assert current_revision(connection) == head_revision()
+        context = MigrationContext.configure(connection, opts={
+            "compare_type": True, "include_object": include_for_dialect(connection.dialect.name),
+        })
+        assert compare_metadata(context, Base.metadata) == []
+        # Index d'expression, non comparé par l'autogénération
+        assert connection.scalar(text(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'index' AND name = 'ix_tickets_priority_rank_id'"
+        )) == 1
+
+    with engine.begin() as connection:
+        command.downgrade(alembic_config(connection), "base")
+    assert set(inspect(engine).get_table_names()) <= {"alembic_version"}
+    engine.dispose()
+
+
+def test_stamped_legacy_database_upgrades(tmp_path):
+    """Une base au schéma initial (create_all d'avant) passe à la dernière révision, compteurs remplis."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "0001")
+        assert not {"ticket_counters", "tickets_archive"} & set(inspect(connection).get_table_names())
+        assert "search_vector" not in {column["name"] for column in inspect(connection).get_columns("tickets")}
+        connection.execute(text(
+            "INSERT INTO users (id, email, username, hashed_password) VALUES (1, 'a@example.com', 'a', 'x')"
+        ))
+        connection.execute(text(
+            "INSERT INTO tickets (title, description, status, priority, creator_id, assigned_to_id) VALUES "
+            "('A', 'a', 'OPEN', 'HIGH', 1, NULL), ('B', 'b', 'OPEN', 'HIGH', 1, NULL), "
+            "('C', 'c', NULL, NULL, 1, 1)"
+        ))
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "head")
+        counters = set(connection.execute(text(
+            "SELECT status, priority, assigned_to_id, count FROM ticket_counters"
+        )).all())
+    assert counters == {("OPEN", "HIGH", 0, 2), ("OPEN", "MEDIUM", 1, 1)}
+    engine.dispose()
@@ -0,0 +1,89 @@
+"""Tests de la pagination par curseur des tickets."""
+from datetime import datetime
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models import Ticket, TicketStatus
+from app.pagination import encode_cursor, decode_cursor
+
+client = TestClient(app)
+
+
+def _seed(db, creator_id: int, count: int, status: TicketStatus = TicketStatus.OPEN) -> set:
+    """Créer des tickets partageant le même ``created_at`` pour tester le départage par id."""
+    created_at = datetime(2024, 1, 1, 12, 0, 0)
+    tickets = [
+        Ticket(
+            title=f"Ticket {i}",
+            description="Description suffisamment longue.",
+            creator_id=creator_id,
+            status=status,
+            created_at=created_at,
+        )
+        for i in range(count)
+    ]
+    db.add_all(tickets)
+    db.commit()
+    return {ticket.id for ticket in tickets}
+
+
+def test_cursor_roundtrip():
+    """Le curseur encode et décode la position."""
+    created_at = datetime(2024, 5, 17, 8, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def test_cursor_pages_are_stable_and_complete(db, make_user, auth_headers):
+    """Parcourir toutes les pages ne saute ni ne répète aucun ticket."""
+    user = make_user()
+    seeded = _seed(db, user.id, 23)
+    headers = auth_headers(user)
+
+    seen, cursor, pages = [], "", 0
+    while cursor is not None:
+        response = client.get("/api/tickets/", params={"cursor": cursor, "limit": 5}, headers=headers)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 5
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+        pages += 1
+
+    ids = [item["id"] for item in seen]
+    assert len(ids) == len(set(ids))
+    assert seeded <= set(ids)
+    keys = [(item["created_at"], item["id"]) for item in seen]
+    assert keys == sorted(keys, reverse=True)
+    assert pages >= 5
+
+
+def test_cursor_with_status_filter(db, make_user, auth_headers):
+    """Le filtre de statut s'applique en mode curseur."""
+    user = make_user()
+    closed = _seed(db, user.id, 3, status=TicketStatus.CLOSED)
+    response = client.get(
+        "/api/tickets/", params={"cursor": "", "status": "closed", "limit": 100},
+        headers=auth_headers(user),
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert closed <= {item["id"] for item in items}
+    assert all(item["status"] == "closed" for item in items)
+
+
+def test_invalid_cursor(make_user, auth_headers):
+    """Un curseur illisible est refusé."""
+    response = client.get("/api/tickets/", params={"cursor": "not-a-cursor"}, headers=auth_headers(make_user()))
+    assert response.status_code == 400
+
+
+def test_invalid_status(make_user, auth_headers):
+    """Un statut inconnu est refusé."""
+    response = client.get("/api/tickets/", params={"status": "unknown"}, headers=auth_headers(make_user()))
+    assert response.status_code == 400
+
+
+def test_skip_limit_compatibility(make_user, auth_headers):
+    """Sans curseur, la réponse reste une liste."""
+    response = client.get("/api/tickets/", params={"skip": 0, "limit": 3}, headers=auth_headers(make_user()))
+    assert response.status_code == 200
+    assert isinstance(response.json(), list)
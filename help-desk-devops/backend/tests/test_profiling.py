@@ -0,0 +1,64 @@
+"""Tests du journal des requêtes lentes et du profil SQL."""
+import logging
+from fastapi.testclient import TestClient
+from app import profiling
+from app.main import app
+
+client = TestClient(app)
+
+
+def _create_ticket(headers: dict) -> int:
+    response = client.post(
+        "/api/tickets/", json={"title": "Écran noir", "description": "Plus d'affichage"}, headers=headers
+    )
+    return response.json()["id"]
+
+
+def test_server_timing_for_admin_only(make_user, auth_headers):
+    """Le profil SQL n'est renvoyé qu'aux administrateurs qui le demandent."""
+    admin_headers = auth_headers(make_user(is_admin=True))
+    ticket_id = _create_ticket(admin_headers)
+
+    response = client.get(f"/api/tickets/{ticket_id}", headers={**admin_headers, "X-SQL-Profile": "1"})
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'sql-select-tickets;dur=' in timing
+    assert "app;dur=" in timing
+
+    assert "server-timing" not in client.get(f"/api/tickets/{ticket_id}", headers=admin_headers).headers
+
+    user_headers = auth_headers(make_user())
+    other_id = _create_ticket(user_headers)
+    response = client.get(f"/api/tickets/{other_id}", headers={**user_headers, "X-SQL-Profile": "1"})
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+def test_slow_query_log(monkeypatch, caplog, make_user, auth_headers):
+    """Une requête au-delà du seuil est journalisée avec sa route, ses paramètres et son plan."""
+    headers = auth_headers(make_user())
+    ticket_id = _create_ticket(headers)
+    monkeypatch.setattr(profiling, "SLOW_QUERY_SECONDS", 1e-9)
+
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        client.get(f"/api/tickets/{ticket_id}", headers=headers)
+
+    messages = [record.getMessage() for record in caplog.records if record.name == "app.sql.slow"]
+    ticket_select = next(m for m in messages if "FROM tickets" in m)
+    assert "route=/api/tickets/{ticket_id}" in ticket_select
+    assert "params=(int" in ticket_select
+    assert "\nPlan:\n" in ticket_select
+    assert str(ticket_id) not in ticket_select.split("\n", 1)[0]
+
+
+def test_statement_label_and_parameter_shape():
+    """Étiquettes Server-Timing et forme des paramètres journalisés."""
+    assert profiling.statement_label("SELECT tickets.id FROM tickets WHERE tickets.id = ?") == "select-tickets"
+    assert profiling.statement_label('INSERT INTO "ticket_counters" (status) VALUES (?)') == "insert-ticket_counters"
+    assert profiling.statement_label(
+        "SELECT tickets.id, (SELECT count(comments.id) FROM comments) AS n FROM tickets"
+    ) == "select-tickets"
+    assert profiling.statement_label("SELECT anon_1.id FROM (SELECT tickets.id FROM tickets) AS anon_1") == "select-tickets"
+    assert profiling.parameter_shape({"id": 1, "title": "x"}) == "{id: int, title: str}"
+    assert profiling.parameter_shape([(1, "a"), (2, "b")], executemany=True) == "2 x (int, str)"
@@ -0,0 +1,126 @@
+"""Tests du nombre de requêtes SQL par endpoint (absence de N+1)."""
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models import Ticket, Comment
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def seed_tickets(db, make_user):
+    """Créer des tickets avec des créateurs, assignés et commentaires distincts."""
+    def _seed(count: int, comments_per_ticket: int = 0) -> list:
+        ticket_ids = []
+        for _ in range(count):
+            creator, assignee = make_user(), make_user()
+            ticket = Ticket(
+                title="Imprimante en panne",
+                description="L'imprimante du deuxième étage ne répond plus.",
+                creator_id=creator.id,
+                assigned_to_id=assignee.id,
+            )
+            db.add(ticket)
+            db.flush()
+            for _ in range(comments_per_ticket):
+                db.add(Comment(content="Relance", ticket_id=ticket.id, author_id=make_user().id))
+            ticket_ids.append(ticket.id)
+        db.commit()
+        return ticket_ids
+    return _seed
+
+
+@pytest.mark.parametrize("count", [1, 15])
+def test_list_tickets_query_count(seed_tickets, make_user, auth_headers, count_queries, count):
+    """La liste coûte 2 requêtes : utilisateur courant + tickets joints."""
+    seed_tickets(count)
+    headers = auth_headers(make_user())
+
+    with count_queries() as statements:
+        response = client.get("/api/tickets/?limit=100", headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) >= count
+    assert len(statements) == 2
+
+
+def test_list_tickets_projection(seed_tickets, make_user, auth_headers, count_queries):
+    """La liste ne lit que les colonnes affichées : ni description ni profil complet."""
+    seed_tickets(3)
+    headers = auth_headers(make_user())
+
+    with count_queries() as statements:
+        page = client.get("/api/tickets/?cursor=&limit=2", headers=headers).json()
+
+    item = page["items"][0]
+    assert "description" not in item
+    assert set(item["creator"]) == {"id", "username", "full_name"}
+    assert set(item["assigned_to"]) == {"id", "username", "full_name"}
+    assert page["next_cursor"]
+    assert "tickets.description" not in statements[-1]
+    assert "hashed_password" not in statements[-1]
+
+
+@pytest.mark.parametrize("comments", [1, 15])
+def test_get_ticket_query_count(seed_tickets, make_user, auth_headers, count_queries, comments):
+    """Le détail coûte 3 requêtes : utilisateur, ticket joint, commentaires + auteurs."""
+    ticket_id = seed_tickets(1, comments_per_ticket=comments)[0]
+    headers = auth_headers(make_user())
+
+    with count_queries() as statements:
+        response = client.get(f"/api/tickets/{ticket_id}", headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json()["comments"]) == comments
+    assert len(statements) == 3
+
+
+@pytest.mark.parametrize("comments", [1, 15])
+def test_get_comments_query_count(seed_tickets, make_user, auth_headers, count_queries, comments):
+    """Les commentaires coûtent 3 requêtes : utilisateur, ticket, commentaires + auteurs."""
+    ticket_id = seed_tickets(1, comments_per_ticket=comments)[0]
+    headers = auth_headers(make_user())
+
+    with count_queries() as statements:
+        response = client.get(f"/api/tickets/{ticket_id}/comments", headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) == comments
+    assert len(statements) == 3
+
+
+def test_write_endpoints_query_count(seed_tickets, make_user, auth_headers, count_queries):
+    """Les écritures ne chargent pas les relations une par une."""
+    ticket_id = seed_tickets(1, comments_per_ticket=10)[0]
+    user = make_user(is_admin=True)
+    user_id = user.id
+    headers = auth_headers(user)
+
+    with count_queries() as statements:
+        response = client.post(
+            "/api/tickets/",
+            json={"title": "Nouveau poste", "description": "Installer un nouveau poste de travail."},
+            headers=headers,
+        )
+    assert response.status_code == 201
+    created = len(statements)
+
+    with count_queries() as statements:
+        response = client.put(
+            f"/api/tickets/{ticket_id}", json={"status": "in_progress"}, headers=headers
+        )
+    assert response.status_code == 200
+    assert len(response.json()["comments"]) == 10
+    updated = len(statements)
+
+    with count_queries() as statements:
+        response = client.post(
+            f"/api/tickets/{ticket_id}/comments", json={"content": "Pris en charge"}, headers=headers
+        )
+    assert response.status_code == 201
+    assert response.json()["author"]["id"] == user_id
+    commented = len(statements)
+
+    # Après la première requête, l'utilisateur courant est servi par le cache ;
+    # la création et la modification ajustent les compteurs (un upsert)
+    assert (created, updated, commented) == (6, 5, 4)
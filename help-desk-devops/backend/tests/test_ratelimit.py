@@ -0,0 +1,128 @@
+"""Tests de la limitation de débit (seaux de jetons)."""
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from app import ratelimit
+from app.database import engine
+from app.main import app
+from app.routes import auth
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Activer la limitation avec un stockage en mémoire neuf et des limites choisies."""
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(ratelimit, "_backend", ratelimit.MemoryBackend())
+    configured = {}
+    monkeypatch.setattr(ratelimit, "LIMITS", configured)
+    return configured
+
+
+def test_parse_limits():
+    """``RATE_LIMITS`` accepte plusieurs limites, ``off`` et rejette les périodes inconnues."""
+    parsed = ratelimit.parse_limits("auth.login:ip=10/minute, tickets.create_ticket:ip=off")
+    assert parsed == {"auth.login:ip": ratelimit.Rate(10, 60), "tickets.create_ticket:ip": None}
+    with pytest.raises(ValueError):
+        ratelimit.parse_rate("10/fortnight")
+
+
+@pytest.mark.parametrize("backend", [
+    ratelimit.MemoryBackend,
+    lambda: ratelimit.DatabaseBackend(engine),
+], ids=["memory", "database"])
+def test_bucket_burst_and_refill(backend):
+    """Une rafale de la capacité passe, puis un jeton par ``période / capacité``."""
+    store, rate, key = backend(), ratelimit.Rate(3, 60), "test:refill"
+    assert [store.take(key, rate, 1000.0) for _ in range(3)] == [0, 0, 0]
+    assert store.take(key, rate, 1000.0) == pytest.approx(20)
+    # Une requête refusée ne consomme rien : le délai continue de décroître
+    assert store.take(key, rate, 1010.0) == pytest.approx(10)
+    assert store.take(key, rate, 1020.0) == 0
+    assert store.take(key, rate, 1020.0) > 0
+    # Longue inactivité : le seau est plein, sans dépasser sa capacité
+    assert [store.take(key, rate, 5000.0) for _ in range(4)][-1] > 0
+
+
+def test_database_buckets_shared_between_workers():
+    """Deux workers partageant la table consomment le même seau, et les seaux inactifs sont purgés."""
+    first, second = ratelimit.DatabaseBackend(engine), ratelimit.DatabaseBackend(engine, purge_after=3600)
+    rate, key = ratelimit.Rate(2, 60), "test:shared"
+    assert first.take(key, rate, 2000.0) == 0
+    assert second.take(key, rate, 2000.0) == 0
+    assert first.take(key, rate, 2000.0) > 0
+
+    second.take("test:other", rate, 9000.0)
+    with engine.connect() as connection:
+        table = ratelimit.RateLimitBucket.__table__
+        keys = {row.key for row in connection.execute(table.select())}
+    assert key not in keys and "test:other" in keys
+
+
+def test_memory_backend_is_bounded():
+    """Le stockage en mémoire oublie les seaux les plus anciens."""
+    store, rate = ratelimit.MemoryBackend(maxsize=2), ratelimit.Rate(1, 60)
+    for key in ("a", "b", "c"):
+        store.take(key, rate, 0.0)
+    assert store.take("a", rate, 0.0) == 0
+    assert store.take("c", rate, 0.0) > 0
+
+
+def test_login_account_limit_skips_password_check(monkeypatch, limits, make_user):
+    """Au-delà de la limite par compte : 429 et Retry-After, sans vérification du mot de passe."""
+    limits["auth.login:account"] = ratelimit.Rate(2, 60)
+    user = make_user()
+    checks = []
+
+    async def verify(password, hashed):
+        checks.append(password)
+        return False
+
+    monkeypatch.setattr(auth, "verify_password_async", verify)
+    for _ in range(2):
+        response = client.post("/api/auth/login", json={"email": user.email, "password": "mauvais"})
+        assert response.status_code == 401
+
+    # Même compte, casse différente : même seau
+    response = client.post("/api/auth/login", json={"email": user.email.upper(), "password": "mauvais"})
+    assert response.status_code == 429
+    assert response.json()["detail"] == "Too many requests"
+    assert int(response.headers["Retry-After"]) == 30
+    assert len(checks) == 2
+
+    # Autre compte : seau distinct
+    response = client.post("/api/auth/login", json={"email": "autre@example.com", "password": "mauvais"})
+    assert response.status_code == 401
+
+
+def test_login_ip_limit(limits, make_user):
+    """La limite par adresse s'applique quel que soit le compte visé."""
+    limits["auth.login:ip"] = ratelimit.Rate(1, 60)
+    user = make_user()
+    assert client.post("/api/auth/login", json={"email": user.email, "password": "x"}).status_code == 401
+    response = client.post("/api/auth/login", json={"email": "autre@example.com", "password": "x"})
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+
+
+def test_route_limits_configured_per_route(limits):
+    """Seules les routes configurées sont limitées ; sans limite, aucune dépendance ajoutée."""
+    assert ratelimit.rate_limit_dependencies("tickets") == []
+    limits["tickets.create_ticket:ip"] = ratelimit.Rate(1, 60)
+    router = APIRouter(dependencies=ratelimit.rate_limit_dependencies("tickets"))
+
+    @router.post("/")
+    def create_ticket():
+        return {}
+
+    @router.get("/")
+    def list_tickets():
+        return []
+
+    limited_app = FastAPI()
+    limited_app.include_router(router)
+    limited_client = TestClient(limited_app)
+    assert limited_client.post("/").status_code == 200
+    assert limited_client.post("/").status_code == 429
+    assert all(limited_client.get("/").status_code == 200 for _ in range(3))
@@ -0,0 +1,120 @@
+"""Tests du routage des lectures vers les réplicas."""
+import os
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app import replicas
+from app.main import app
+from app.routes import auth_async, tickets_async
+
+client = TestClient(app)
+
+async_app = FastAPI()
+async_app.include_router(auth_async.router)
+async_app.include_router(tickets_async.router)
+async_client = TestClient(async_app)
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """Un réplica sur la base de test, dont les requêtes sont comptées."""
+    replica = replicas.Replica(os.environ["DATABASE_URL"])
+    monkeypatch.setattr(replicas, "REPLICAS", [replica])
+    monkeypatch.setattr(replicas, "recent_writers", replicas.TTLCache(maxsize=100, ttl=60))
+    replica.statements = []
+    engine = replica.sessionmaker.kw["bind"]
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        replica.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    yield replica
+    event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    engine.dispose()
+
+
+def _create_ticket(test_client, headers) -> int:
+    response = test_client.post(
+        "/api/tickets/",
+        json={"title": "VPN coupé", "description": "Le VPN se déconnecte toutes les minutes."},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_reads_use_replica_until_user_writes(replica, make_user, auth_headers):
+    """Les lectures vont au réplica ; après une écriture, l'auteur lit sur le primaire."""
+    reader, writer = make_user(), make_user()
+
+    assert client.get("/api/tickets/", headers=auth_headers(writer)).status_code == 200
+    assert replica.statements
+
+    replica.statements.clear()
+    ticket_id = _create_ticket(client, auth_headers(writer))
+    assert replica.statements == []
+
+    # L'auteur relit sa propre écriture sur le primaire
+    response = client.get(f"/api/tickets/{ticket_id}", headers=auth_headers(writer))
+    assert response.status_code == 200
+    assert replica.statements == []
+
+    # Les autres utilisateurs restent sur le réplica
+    response = client.get(f"/api/tickets/{ticket_id}/comments", headers=auth_headers(reader))
+    assert response.status_code == 200
+    assert replica.statements
+
+
+def test_lagging_replica_is_skipped(monkeypatch, replica, make_user, auth_headers):
+    """Un réplica trop en retard, ou injoignable, est écarté au profit du primaire."""
+    monkeypatch.setattr(replicas, "_measure", lambda session: replicas.REPLICA_MAX_LAG + 1)
+    headers = auth_headers(make_user())
+    assert client.get("/api/tickets/stats", headers=headers).status_code == 200
+    assert replica.statements == []
+    assert not replica.available
+
+    def unreachable(session):
+        raise ConnectionError("réplica arrêté")
+
+    monkeypatch.setattr(replicas, "_measure", unreachable)
+    monkeypatch.setattr(replica, "_checked_at", float("-inf"))
+    assert client.get("/api/tickets/stats", headers=headers).status_code == 200
+    assert replica.statements == []
+
+    # Retard mesuré à nouveau après l'intervalle : le réplica est réutilisé
+    monkeypatch.setattr(replicas, "_measure", lambda session: 0.0)
+    monkeypatch.setattr(replica, "_checked_at", float("-inf"))
+    assert client.get("/api/tickets/stats", headers=headers).status_code == 200
+    assert replica.statements
+
+
+def test_replicas_used_in_turn(monkeypatch, make_user):
+    """Les réplicas disponibles sont utilisés à tour de rôle."""
+    first, second = replicas.Replica("sqlite://"), replicas.Replica("sqlite://")
+    monkeypatch.setattr(replicas, "REPLICAS", [first, second])
+    principal = replicas.Principal.from_user(make_user())
+    chosen = {replicas.read_sessionmaker(principal) for _ in range(4)}
+    assert chosen == {first.sessionmaker, second.sessionmaker}
+
+
+def test_async_reads_use_replica_until_user_writes(replica, make_user, auth_headers):
+    """La pile asynchrone suit les mêmes règles de routage."""
+    async_replica_statements = []
+    engine = replica.async_sessionmaker.kw["bind"].sync_engine
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        async_replica_statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        headers = auth_headers(make_user())
+        assert async_client.get("/api/tickets/", headers=headers).status_code == 200
+        assert async_replica_statements
+
+        async_replica_statements.clear()
+        ticket_id = _create_ticket(async_client, headers)
+        assert async_client.get(f"/api/tickets/{ticket_id}", headers=headers).status_code == 200
+        assert async_replica_statements == []
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
@@ -0,0 +1,145 @@
+"""Tests du cache versionné des réponses de lecture."""
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app import response_cache as cache_module
+from app.database import engine
+from app.events import broker
+from app.main import app
+from app.response_cache import CachedResponse, DatabaseTier, ResponseCache
+from app.routes import tickets
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def response_cache(monkeypatch):
+    """Cache activé et vide, en mémoire seulement."""
+    cache = ResponseCache()
+    monkeypatch.setattr(cache_module, "RESPONSE_CACHE", True)
+    monkeypatch.setattr(cache_module, "response_cache", cache)
+    monkeypatch.setattr(tickets, "response_cache", cache)
+    return cache
+
+
+def _ticket_queries(statements) -> list:
+    return [statement for statement in statements if "FROM tickets" in statement]
+
+
+def test_list_served_from_cache_until_write(response_cache, make_user, auth_headers, count_queries):
+    """Une page identique est servie sans SQL ; une création la rend obsolète."""
+    headers = auth_headers(make_user())
+    params = {"status": "open", "limit": 100}
+    first = client.get("/api/tickets/", params=params, headers=headers)
+    assert first.status_code == 200
+
+    with count_queries() as statements:
+        # Paramètres équivalents dans un autre ordre : même entrée
+        second = client.get("/api/tickets/", params={"limit": 100, "status": "open"}, headers=headers)
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert _ticket_queries(statements) == []
+
+    response = client.get("/api/tickets/", params=params, headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 304
+
+    created = client.post(
+        "/api/tickets/", json={"title": "Wi-Fi lent", "description": "Débit très faible au 3e étage."}, headers=headers
+    ).json()
+    with count_queries() as statements:
+        third = client.get("/api/tickets/", params=params, headers=headers)
+    assert _ticket_queries(statements)
+    assert third.json()[0]["id"] == created["id"]
+    assert response_cache.stats()["hits"] == 2
+
+
+def test_detail_invalidated_by_comment(response_cache, make_user, auth_headers, count_queries):
+    """Le détail est servi depuis le cache jusqu'au prochain commentaire du ticket."""
+    headers = auth_headers(make_user())
+    ticket_id = client.post(
+        "/api/tickets/", json={"title": "Badge refusé", "description": "Le badge ne fonctionne plus."}, headers=headers
+    ).json()["id"]
+    other_id = client.post(
+        "/api/tickets/", json={"title": "Souris HS", "description": "La souris ne répond plus."}, headers=headers
+    ).json()["id"]
+    first = client.get(f"/api/tickets/{ticket_id}", headers=headers)
+    client.get(f"/api/tickets/{other_id}", headers=headers)
+
+    with count_queries() as statements:
+        cached = client.get(f"/api/tickets/{ticket_id}", headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert cached.status_code == 304
+    assert _ticket_queries(statements) == []
+
+    client.post(f"/api/tickets/{ticket_id}/comments", json={"content": "Badge remplacé"}, headers=headers)
+    detail = client.get(f"/api/tickets/{ticket_id}", headers=headers)
+    assert [comment["content"] for comment in detail.json()["comments"]] == ["Badge remplacé"]
+    assert detail.headers["ETag"] != first.headers["ETag"]
+
+    # Les autres tickets restent en cache
+    with count_queries() as statements:
+        assert client.get(f"/api/tickets/{other_id}", headers=headers).status_code == 200
+    assert _ticket_queries(statements) == []
+
+
+def test_batch_write_invalidates_everything(response_cache, make_user, auth_headers):
+    """Une opération par lot rend toutes les réponses obsolètes."""
+    headers = auth_headers(make_user())
+    ticket_id = client.post(
+        "/api/tickets/", json={"title": "Clavier", "description": "Touches qui collent."}, headers=headers
+    ).json()["id"]
+    assert client.get(f"/api/tickets/{ticket_id}", headers=headers).json()["priority"] == "medium"
+
+    response = client.patch(
+        "/api/tickets/batch", json={"items": [{"id": ticket_id, "priority": "high"}]}, headers=headers
+    )
+    assert response.status_code == 200
+    assert client.get(f"/api/tickets/{ticket_id}", headers=headers).json()["priority"] == "high"
+
+
+def test_events_from_other_workers_bump_versions(response_cache):
+    """Un événement relayé depuis un autre worker incrémente les versions locales."""
+    entry, slot = response_cache.lookup("ticket", (42,), "ticket:42")
+    response_cache.store(slot, CachedResponse(b"{}", {"ETag": 'W/"1"'}))
+    assert response_cache.lookup("ticket", (42,), "ticket:42")[0] is not None
+
+    broker.dispatch(json.dumps({"type": "comment.created", "ticket_id": 42, "comment_id": 1, "author_id": 1}))
+    assert response_cache.lookup("ticket", (42,), "ticket:42")[0] is None
+
+
+def test_shared_tier_between_workers(monkeypatch):
+    """Deux workers partageant le niveau en base se servent mutuellement et voient les incréments."""
+    monkeypatch.setattr(cache_module, "RESPONSE_CACHE", True)
+    first, second = ResponseCache(shared=DatabaseTier(engine)), ResponseCache(shared=DatabaseTier(engine))
+    entry = CachedResponse(b'[{"id":7}]', {"ETag": 'W/"7"', "Cache-Control": "private, no-cache"})
+
+    _, slot = first.lookup("ticket", (7,), "ticket:7")
+    first.store(slot, entry)
+    assert second.lookup("ticket", (7,), "ticket:7")[0] == entry
+    assert second.stats()["shared_hits"] == 1
+
+    first.published(None, {"type": "ticket.updated", "ticket_id": 7})
+    assert second.lookup("ticket", (7,), "ticket:7")[0] is None
+
+
+def test_unreadable_shared_entry_is_a_miss(monkeypatch):
+    """Une entrée partagée illisible est traitée comme absente ; l'emplacement reste utilisable."""
+    monkeypatch.setattr(cache_module, "RESPONSE_CACHE", True)
+    tier = DatabaseTier(engine)
+    cache = ResponseCache(shared=tier)
+
+    def unreadable(key):
+        raise RuntimeError("ligne illisible")
+
+    monkeypatch.setattr(tier, "get", unreadable)
+    entry, slot = cache.lookup("ticket", (8,), "ticket:8")
+    assert entry is None and slot is not None
+    cached = CachedResponse(b"{}", {"ETag": 'W/"8"', "Cache-Control": "private, no-cache"})
+    cache.store(slot, cached)
+    assert cache.lookup("ticket", (8,), "ticket:8")[0] == cached
+
+
+def test_disabled(monkeypatch):
+    """Sans RESPONSE_CACHE, aucune consultation ni emplacement."""
+    monkeypatch.setattr(cache_module, "RESPONSE_CACHE", False)
+    assert cache_module.response_cache.lookup("tickets", (0, 10, None), "list") == (None, None)
@@ -0,0 +1,72 @@
+"""Tests de l'encodage JSON rapide (FAST_JSON)."""
+from typing import List
+from fastapi import APIRouter, FastAPI, status
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from app import responses
+from app.main import app
+from app.routes import tickets
+from app.schemas import CommentResponse, TicketResponse, UserResponse
+
+client = TestClient(app)
+
+
+def _fast_app(monkeypatch) -> FastAPI:
+    """Application dont les routes de tickets passent par le chemin rapide."""
+    monkeypatch.setattr(responses, "FAST_JSON", True)
+    router = APIRouter(prefix="/api/tickets", route_class=responses.FastJSONRoute)
+    router.add_api_route(
+        "/", tickets.create_ticket, methods=["POST"],
+        response_model=TicketResponse, status_code=status.HTTP_201_CREATED,
+    )
+    router.add_api_route("/{ticket_id}", tickets.get_ticket, methods=["GET"], response_model=TicketResponse)
+    router.add_api_route(
+        "/{ticket_id}/comments", tickets.get_comments, methods=["GET"],
+        response_model=List[CommentResponse],
+    )
+    fast_app = FastAPI()
+    fast_app.include_router(router)
+    return fast_app
+
+
+def test_fast_json_matches_default_encoding(monkeypatch, make_user, auth_headers):
+    """Statut, en-têtes et contenu sont ceux du chemin par défaut."""
+    fast_client = TestClient(_fast_app(monkeypatch))
+    headers = auth_headers(make_user())
+
+    response = fast_client.post(
+        "/api/tickets/",
+        json={"title": "Écran noir", "description": "L'écran reste noir au démarrage."},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    ticket_id = response.json()["id"]
+    client.post(f"/api/tickets/{ticket_id}/comments", json={"content": "Même souci ici"}, headers=headers)
+
+    for path in (f"/api/tickets/{ticket_id}", f"/api/tickets/{ticket_id}/comments"):
+        fast = fast_client.get(path, headers=headers)
+        default = client.get(path, headers=headers)
+        assert fast.status_code == default.status_code == 200
+        assert fast.json() == default.json()
+        assert fast.headers["etag"] == default.headers["etag"]
+
+        unchanged = fast_client.get(path, headers={**headers, "If-None-Match": fast.headers["etag"]})
+        assert unchanged.status_code == 304
+
+
+def test_fast_json_keeps_openapi_parameters(monkeypatch):
+    """Le paramètre ajouté pour les en-têtes n'apparaît pas dans le schéma OpenAPI."""
+    fast_app = _fast_app(monkeypatch)
+    assert all(getattr(route.endpoint, "fast_json", False) for route in fast_app.router.routes
+               if isinstance(route, APIRoute))
+    schema = fast_app.openapi()
+
+    parameters = schema["paths"]["/api/tickets/"]["post"].get("parameters", [])
+    assert all(parameter["name"] != "fast_json_response" for parameter in parameters)
+    assert "201" in schema["paths"]["/api/tickets/"]["post"]["responses"]
+
+
+def test_user_response_email_not_revalidated():
+    """L'email d'une réponse n'est pas revalidé, mais reste documenté comme email."""
+    assert UserResponse.model_json_schema()["properties"]["email"]["format"] == "email"
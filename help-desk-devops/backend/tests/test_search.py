@@ -0,0 +1,102 @@
+"""Tests de la recherche plein texte (repli SQLite hors PostgreSQL)."""
+import uuid
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models import Ticket, Comment
+
+client = TestClient(app)
+
+
+def _ticket(db, creator_id: int, title: str, description: str, comments=()) -> int:
+    ticket = Ticket(title=title, description=description, creator_id=creator_id)
+    db.add(ticket)
+    db.flush()
+    for content in comments:
+        db.add(Comment(content=content, ticket_id=ticket.id, author_id=creator_id))
+    db.commit()
+    return ticket.id
+
+
+def test_search_ranks_title_over_description_over_comments(db, make_user, auth_headers):
+    """Une correspondance dans le titre est mieux classée que dans un commentaire."""
+    word = f"zx{uuid.uuid4().hex[:8]}"
+    user = make_user()
+    in_comment = _ticket(db, user.id, "Écran noir", "L'écran reste noir.", comments=[f"Voir {word}"])
+    in_title = _ticket(db, user.id, f"Panne {word}", "Le serveur ne répond plus.")
+    in_description = _ticket(db, user.id, "Lenteurs", f"Le service {word} est lent.")
+
+    response = client.get("/api/tickets/search", params={"q": word}, headers=auth_headers(user))
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["ticket"]["id"] for item in items] == [in_title, in_description, in_comment]
+    assert f"<b>{word}</b>" in items[1]["headline"]
+    assert items[0]["ticket"]["creator"]["id"] == user.id
+
+
+def test_search_requires_all_terms(db, make_user, auth_headers):
+    """Tous les termes de la requête doivent apparaître."""
+    word = f"zx{uuid.uuid4().hex[:8]}"
+    user = make_user()
+    both = _ticket(db, user.id, f"VPN {word}", "Connexion VPN impossible depuis le site.")
+    _ticket(db, user.id, f"Imprimante {word}", "Bourrage papier récurrent.")
+
+    response = client.get("/api/tickets/search", params={"q": f"{word} vpn"}, headers=auth_headers(user))
+    assert [item["ticket"]["id"] for item in response.json()["items"]] == [both]
+
+
+def test_search_keyset_pagination(db, make_user, auth_headers):
+    """Les pages de résultats se suivent sans doublon."""
+    word = f"zx{uuid.uuid4().hex[:8]}"
+    user = make_user()
+    expected = {_ticket(db, user.id, f"Alerte {word} {i}", "Alerte de supervision.") for i in range(7)}
+    headers = auth_headers(user)
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": word, "limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/tickets/search", params=params, headers=headers).json()
+        seen += [item["ticket"]["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == expected
+
+
+def test_search_validation(make_user, auth_headers):
+    """Requête trop courte ou curseur invalide."""
+    headers = auth_headers(make_user())
+    assert client.get("/api/tickets/search", params={"q": "a"}, headers=headers).status_code == 422
+    response = client.get("/api/tickets/search", params={"q": "vpn", "cursor": "bad"}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_delete_ticket_removes_comments_in_one_statement(db, make_user, auth_headers, count_queries):
+    """Supprimer un ticket supprime ses commentaires en une requête (trigger de recherche par requête)."""
+    user = make_user()
+    ticket_id = _ticket(db, user.id, "Imprimante", "Bourrage.", comments=["Un", "Deux", "Trois"])
+
+    with count_queries() as statements:
+        response = client.delete(f"/api/tickets/{ticket_id}", headers=auth_headers(user))
+    assert response.status_code == 204
+    deletes = [statement for statement in statements if statement.startswith("DELETE FROM comments")]
+    assert len(deletes) == 1 and "comments.ticket_id IN" in deletes[0]
+    db.expire_all()
+    assert db.query(Comment).filter(Comment.ticket_id == ticket_id).count() == 0
+
+
+def test_search_headline_is_escaped(db, make_user, auth_headers):
+    """Le texte de l'extrait est échappé : seules les balises <b> ajoutées restent du HTML."""
+    word = f"zx{uuid.uuid4().hex[:8]}"
+    user = make_user()
+    _ticket(db, user.id, "Formulaire", f"<script>alert(1)</script> {word} & \x02<img src=x onerror=alert(1)>")
+
+    response = client.get("/api/tickets/search", params={"q": word}, headers=auth_headers(user))
+    headline = response.json()["items"][0]["headline"]
+    assert "<script>" not in headline and "<img" not in headline
+    assert headline == (
+        f"&lt;script&gt;alert(1)&lt;/script&gt; <b>{word}</b> &amp; &lt;img src=x onerror=alert(1)&gt;"
+    )
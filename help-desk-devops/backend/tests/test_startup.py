@@ -0,0 +1,62 @@
+"""Tests du démarrage : import sans accès à la base, readiness distincte de /health."""
+import json
+import os
+import subprocess
+import sys
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+# Budget import -> première réponse (secondes), suivi par la suite de tests
+STARTUP_BUDGET = float(os.getenv("STARTUP_BUDGET", "5"))
+
+STARTUP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+from app.main import app
+from app import database
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    health = client.get("/health").status_code
+    first_response = time.perf_counter() - started
+    engine_created = database._engine is not None
+    ready = client.get("/ready")
+print(json.dumps({
+    "first_response": first_response,
+    "health": health,
+    "engine_created": engine_created,
+    "ready": ready.status_code,
+    "ready_body": ready.json(),
+}))
+"""
+
+
+def test_startup_without_database(tmp_path, record_property):
+    """L'application répond à /health sans ouvrir de connexion ; /ready signale la base absente."""
+    env = dict(
+        os.environ,
+        # Répertoire inexistant : toute connexion échouerait
+        DATABASE_URL=f"sqlite:///{tmp_path / 'absent' / 'helpdesk.db'}",
+        STATS_RECONCILE_INTERVAL="0",
+    )
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT], cwd=backend, env=env,
+        capture_output=True, text=True, timeout=60, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    record_property("startup_first_response_seconds", round(result["first_response"], 3))
+
+    assert result["health"] == 200
+    assert result["engine_created"] is False
+    assert result["first_response"] < STARTUP_BUDGET
+    assert result["ready"] == 503
+    assert result["ready_body"]["database"] == "unreachable"
+
+
+def test_ready_when_migrated():
+    """La base de test est migrée : l'application est prête."""
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
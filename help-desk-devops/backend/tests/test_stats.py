@@ -0,0 +1,97 @@
+"""Tests des statistiques agrégées et de leurs compteurs."""
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from app.main import app
+from app.models import ArchivedTicket, Ticket, TicketCounter, TicketPriority, TicketStatus
+from app.stats import read_stats, reconcile_counters
+
+client = TestClient(app)
+
+
+def _stats(headers) -> dict:
+    response = client.get("/api/tickets/stats", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _open_count(stats: dict, assigned_to_id) -> int:
+    for entry in stats["open_by_assignee"]:
+        if entry["assigned_to_id"] == assigned_to_id:
+            return entry["count"]
+    return 0
+
+
+def test_counters_follow_ticket_writes(make_user, auth_headers):
+    """Création, modification et suppression ajustent les compteurs."""
+    user, agent = make_user(), make_user()
+    headers = auth_headers(user)
+    before = _stats(headers)
+
+    response = client.post(
+        "/api/tickets/",
+        json={"title": "Imprimante", "description": "Bourrage papier", "priority": "high"},
+        headers=headers,
+    )
+    ticket_id = response.json()["id"]
+    stats = _stats(headers)
+    assert stats["total"] == before["total"] + 1
+    assert stats["by_status_priority"]["open"]["high"] == before["by_status_priority"]["open"]["high"] + 1
+
+    client.put(
+        f"/api/tickets/{ticket_id}",
+        json={"status": "in_progress", "priority": "critical", "assigned_to_id": agent.id},
+        headers=headers,
+    )
+    stats = _stats(headers)
+    assert stats["total"] == before["total"] + 1
+    assert stats["by_status_priority"]["open"]["high"] == before["by_status_priority"]["open"]["high"]
+    assert stats["by_status"]["in_progress"] == before["by_status"]["in_progress"] + 1
+    assert stats["by_priority"]["critical"] == before["by_priority"]["critical"] + 1
+    assert _open_count(stats, agent.id) == 1
+
+    client.put(f"/api/tickets/{ticket_id}", json={"status": "resolved"}, headers=headers)
+    assert _open_count(_stats(headers), agent.id) == 0
+
+    client.delete(f"/api/tickets/{ticket_id}", headers=headers)
+    assert _stats(headers) == before
+
+
+def test_stats_read_only_counters(make_user, auth_headers, count_queries):
+    """La lecture des statistiques est une seule requête sur les compteurs."""
+    headers = auth_headers(make_user())
+    _stats(headers)
+
+    with count_queries() as statements:
+        _stats(headers)
+
+    assert len(statements) == 1
+    assert "ticket_counters" in statements[0]
+    assert "FROM tickets" not in statements[0]
+
+
+def test_reconciliation_corrects_drift(db, make_user):
+    """La réconciliation corrige les compteurs faussés par une écriture hors ORM."""
+    user = make_user()
+    db.add(Ticket(title="Écran", description="Écran noir", creator_id=user.id))
+    db.commit()
+    reconcile_counters(db)
+
+    counter = db.get(TicketCounter, (TicketStatus.OPEN, TicketPriority.MEDIUM, 0))
+    counter.count += 5
+    db.add(TicketCounter(status=TicketStatus.CLOSED, priority=TicketPriority.LOW, assigned_to_id=user.id, count=3))
+    db.commit()
+
+    assert reconcile_counters(db) >= 2
+    assert reconcile_counters(db) == 0
+
+    stats = read_stats(db)
+    assert stats["total"] == (
+        db.scalar(select(func.count()).select_from(Ticket))
+        + db.scalar(select(func.count()).select_from(ArchivedTicket))
+    )
+    open_medium = db.scalar(
+        select(func.count()).select_from(Ticket).where(
+            Ticket.status == TicketStatus.OPEN, Ticket.priority == TicketPriority.MEDIUM
+        )
+    )
+    assert stats["by_status_priority"][TicketStatus.OPEN][TicketPriority.MEDIUM] == open_medium
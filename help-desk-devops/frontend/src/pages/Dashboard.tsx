@@ -13,6 +13,7 @@ export const Dashboard: React.FC = () => {
   const logout = useAuthStore((state) => state.logout);
   const tickets = useTicketStore((state) => state.tickets);
   const fetchTickets = useTicketStore((state) => state.fetchTickets);
+  const connectEvents = useTicketStore((state) => state.connectEvents);
   const isLoading = useTicketStore((state) => state.isLoading);
   const error = useTicketStore((state) => state.error);
 
@@ -26,6 +27,12 @@ export const Dashboard: React.FC = () => {
     fetchTickets(0, 10, statusFilter || undefined);
   }, [user, navigate, statusFilter, fetchTickets]);
 
+  // Mise à jour en direct de la liste (au lieu de la recharger)
+  useEffect(() => {
+    if (!user) return;
+    return connectEvents();
+  }, [user, connectEvents]);
+
   const handleLogout = () => {
     logout();
     navigate("/login");
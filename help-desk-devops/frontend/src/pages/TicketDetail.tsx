@@ -15,6 +15,7 @@ export const TicketDetail: React.FC = () => {
   const currentTicket = useTicketStore((state) => state.currentTicket);
   const fetchTicket = useTicketStore((state) => state.fetchTicket);
   const updateTicket = useTicketStore((state) => state.updateTicket);
+  const connectEvents = useTicketStore((state) => state.connectEvents);
   const isLoading = useTicketStore((state) => state.isLoading);
 
   const [newComment, setNewComment] = useState("");
@@ -34,6 +35,12 @@ export const TicketDetail: React.FC = () => {
     }
   }, [user, ticketId, navigate, fetchTicket]);
 
+  // Changements et commentaires des autres utilisateurs en direct
+  useEffect(() => {
+    if (!user) return;
+    return connectEvents();
+  }, [user, connectEvents]);
+
   useEffect(() => {
     if (currentTicket) {
       setComments(currentTicket.comments);
@@ -7,18 +7,35 @@ import {
   TokenResponse,
   Ticket,
   TicketListItem,
+  TicketPage,
+  TicketFilters,
+  TicketSearchPage,
+  TicketStats,
+  TicketEvent,
+  BatchResult,
   TicketCreateRequest,
   TicketUpdateRequest,
   Comment,
+  CommentPage,
   CommentCreateRequest,
   User,
 } from "../types";
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
 
+// Nombre de réponses conservées pour les requêtes conditionnelles
+const VALIDATED_CACHE_SIZE = 100;
+
+interface ValidatedResponse {
+  etag?: string;
+  lastModified?: string;
+  data: unknown;
+}
+
 class ApiClient {
   private client: AxiosInstance;
   private token: string | null = null;
+  private validated = new Map<string, ValidatedResponse>();
 
   constructor() {
     this.client = axios.create({
@@ -59,10 +76,43 @@ class ApiClient {
 
   logout(): void {
     this.token = null;
+    this.validated.clear();
     localStorage.removeItem("access_token");
     localStorage.removeItem("user");
   }
 
+  /**
+   * GET conditionnel : renvoie les validateurs (ETag, Last-Modified) de la
+   * dernière réponse et réutilise ses données sur une réponse 304.
+   */
+  private async getValidated<T>(url: string, params?: Record<string, any>): Promise<T> {
+    const key = this.client.getUri({ url, params });
+    const cached = this.validated.get(key);
+    const headers: Record<string, string> = {};
+    if (cached?.etag) headers["If-None-Match"] = cached.etag;
+    if (cached?.lastModified) headers["If-Modified-Since"] = cached.lastModified;
+
+    const response = await this.client.get<T>(url, {
+      params,
+      headers,
+      validateStatus: (status) => (status >= 200 && status < 300) || (status === 304 && !!cached),
+    });
+    if (response.status === 304 && cached) {
+      return cached.data as T;
+    }
+
+    const etag = response.headers["etag"];
+    const lastModified = response.headers["last-modified"];
+    this.validated.delete(key);
+    if (etag || lastModified) {
+      this.validated.set(key, { etag, lastModified, data: response.data });
+      if (this.validated.size > VALIDATED_CACHE_SIZE) {
+        this.validated.delete(this.validated.keys().next().value as string);
+      }
+    }
+    return response.data;
+  }
+
   // ============ Authentification ============
 
   async login(credentials: LoginRequest): Promise<TokenResponse> {
@@ -89,18 +139,95 @@ class ApiClient {
     return response.data;
   }
 
-  async getTickets(skip: number = 0, limit: number = 10, status?: string): Promise<TicketListItem[]> {
-    const params: Record<string, any> = { skip, limit };
+  async createTicketsBatch(items: TicketCreateRequest[]): Promise<BatchResult> {
+    const response = await this.client.post<BatchResult>("/api/tickets/batch", { items });
+    return response.data;
+  }
+
+  async updateTicketsBatch(items: (TicketUpdateRequest & { id: number })[]): Promise<BatchResult> {
+    const response = await this.client.patch<BatchResult>("/api/tickets/batch", { items });
+    return response.data;
+  }
+
+  async assignTicketsBatch(ticketIds: number[], assignedToId: number): Promise<BatchResult> {
+    const response = await this.client.post<BatchResult>("/api/tickets/batch/assign", {
+      ticket_ids: ticketIds,
+      assigned_to_id: assignedToId,
+    });
+    return response.data;
+  }
+
+  async getTickets(
+    skip: number = 0,
+    limit: number = 10,
+    status?: string,
+    filters: TicketFilters = {}
+  ): Promise<TicketListItem[]> {
+    const params: Record<string, any> = { ...filters, skip, limit };
     if (status) params.status = status;
-    const response = await this.client.get<TicketListItem[]>("/api/tickets/", { params });
+    return this.getValidated<TicketListItem[]>("/api/tickets/", params);
+  }
+
+  async getTicketPage(
+    cursor: string = "",
+    limit: number = 10,
+    status?: string,
+    filters: TicketFilters = {}
+  ): Promise<TicketPage> {
+    const params: Record<string, any> = { ...filters, cursor, limit };
+    if (status) params.status = status;
+    return this.getValidated<TicketPage>("/api/tickets/", params);
+  }
+
+  async searchTickets(q: string, cursor?: string, limit: number = 10): Promise<TicketSearchPage> {
+    const params: Record<string, any> = { q, limit };
+    if (cursor) params.cursor = cursor;
+    const response = await this.client.get<TicketSearchPage>("/api/tickets/search", { params });
     return response.data;
   }
 
-  async getTicket(ticketId: number): Promise<Ticket> {
-    const response = await this.client.get<Ticket>(`/api/tickets/${ticketId}`);
+  async getTicketStats(): Promise<TicketStats> {
+    const response = await this.client.get<TicketStats>("/api/tickets/stats");
     return response.data;
   }
 
+  /**
+   * Écouter le flux des changements (SSE). fetch est utilisé plutôt
+   * qu'EventSource pour transmettre le token dans l'en-tête Authorization.
+   * La promesse se termine à la fin du flux ou à l'annulation de `signal`.
+   */
+  async streamTicketEvents(onEvent: (event: TicketEvent) => void, signal: AbortSignal): Promise<void> {
+    const response = await fetch(`${API_BASE_URL}/api/tickets/stream`, {
+      headers: { Authorization: `Bearer ${this.token}`, Accept: "text/event-stream" },
+      signal,
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Event stream failed with status ${response.status}`);
+    }
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = "";
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += value;
+      const messages = buffer.split("\n\n");
+      buffer = messages.pop() ?? "";
+      for (const message of messages) {
+        const data = message
+          .split("\n")
+          .filter((line) => line.startsWith("data:"))
+          .map((line) => line.slice(5).trim())
+          .join("\n");
+        if (data) onEvent(JSON.parse(data) as TicketEvent);
+      }
+    }
+  }
+
+  async getTicket(ticketId: number): Promise<Ticket> {
+    return this.getValidated<Ticket>(`/api/tickets/${ticketId}`);
+  }
+
   async updateTicket(ticketId: number, ticketData: TicketUpdateRequest): Promise<Ticket> {
     const response = await this.client.put<Ticket>(`/api/tickets/${ticketId}`, ticketData);
     return response.data;
@@ -121,8 +248,15 @@ class ApiClient {
   }
 
   async getComments(ticketId: number): Promise<Comment[]> {
-    const response = await this.client.get<Comment[]>(`/api/tickets/${ticketId}/comments`);
-    return response.data;
+    return this.getValidated<Comment[]>(`/api/tickets/${ticketId}/comments`);
+  }
+
+  async getCommentsPage(
+    ticketId: number,
+    cursor: string = "",
+    limit: number = 100
+  ): Promise<CommentPage> {
+    return this.getValidated<CommentPage>(`/api/tickets/${ticketId}/comments`, { cursor, limit });
   }
 
   // ============ Santé ============
@@ -2,7 +2,7 @@
  * Store Zustand pour la gestion d'état de l'application.
  */
 import { create } from "zustand";
-import { User, Ticket, TicketListItem } from "../types";
+import { User, Ticket, TicketListItem, TicketEvent } from "../types";
 import { apiClient } from "./api";
 
 interface AuthStore {
@@ -19,12 +19,15 @@ interface TicketStore {
   currentTicket: Ticket | null;
   isLoading: boolean;
   error: string | null;
+  listQuery: { skip: number; limit: number; status?: string };
   fetchTickets: (skip?: number, limit?: number, status?: string) => Promise<void>;
   fetchTicket: (ticketId: number) => Promise<void>;
   createTicket: (title: string, description: string, priority: string) => Promise<void>;
   updateTicket: (ticketId: number, data: any) => Promise<void>;
   deleteTicket: (ticketId: number) => Promise<void>;
   clearError: () => void;
+  applyEvent: (event: TicketEvent) => void;
+  connectEvents: () => () => void;
 }
 
 // Store d'authentification
@@ -60,15 +63,34 @@ export const useAuthStore = create<AuthStore>((set) => ({
   },
 }));
 
+// Délai avant reconnexion au flux des changements (ms)
+const EVENTS_RETRY_DELAY = 3000;
+
+/**
+ * Insérer ou remplacer un ticket dans la liste affichée, ou l'en retirer
+ * s'il ne correspond plus au filtre de statut.
+ */
+const upsertListItem = (
+  tickets: TicketListItem[],
+  item: TicketListItem,
+  status?: string
+): TicketListItem[] => {
+  const others = tickets.filter((ticket) => ticket.id !== item.id);
+  if (status && item.status !== status) return others;
+  if (others.length === tickets.length) return [item, ...tickets];
+  return tickets.map((ticket) => (ticket.id === item.id ? item : ticket));
+};
+
 // Store des tickets
-export const useTicketStore = create<TicketStore>((set) => ({
+export const useTicketStore = create<TicketStore>((set, get) => ({
   tickets: [],
   currentTicket: null,
   isLoading: false,
   error: null,
+  listQuery: { skip: 0, limit: 10 },
 
   fetchTickets: async (skip = 0, limit = 10, status?: string) => {
-    set({ isLoading: true, error: null });
+    set({ isLoading: true, error: null, listQuery: { skip, limit, status } });
     try {
       const tickets = await apiClient.getTickets(skip, limit, status);
       set({ tickets });
@@ -94,10 +116,9 @@ export const useTicketStore = create<TicketStore>((set) => ({
   createTicket: async (title: string, description: string, priority: string) => {
     set({ isLoading: true, error: null });
     try {
-      await apiClient.createTicket({ title, description, priority: priority as any });
-      // Rafraîchir la liste des tickets
-      const tickets = await apiClient.getTickets();
-      set({ tickets });
+      const ticket = await apiClient.createTicket({ title, description, priority: priority as any });
+      // Mise à jour locale ; les autres navigateurs reçoivent l'événement
+      set({ tickets: upsertListItem(get().tickets, ticket, get().listQuery.status) });
     } catch (error: any) {
       set({ error: error.message || "Failed to create ticket" });
       throw error;
@@ -110,10 +131,10 @@ export const useTicketStore = create<TicketStore>((set) => ({
     set({ isLoading: true, error: null });
     try {
       const updatedTicket = await apiClient.updateTicket(ticketId, data);
-      set({ currentTicket: updatedTicket });
-      // Rafraîchir la liste
-      const tickets = await apiClient.getTickets();
-      set({ tickets });
+      set({
+        currentTicket: updatedTicket,
+        tickets: upsertListItem(get().tickets, updatedTicket, get().listQuery.status),
+      });
     } catch (error: any) {
       set({ error: error.message || "Failed to update ticket" });
       throw error;
@@ -126,8 +147,10 @@ export const useTicketStore = create<TicketStore>((set) => ({
     set({ isLoading: true, error: null });
     try {
       await apiClient.deleteTicket(ticketId);
-      const tickets = await apiClient.getTickets();
-      set({ tickets, currentTicket: null });
+      set({
+        tickets: get().tickets.filter((ticket) => ticket.id !== ticketId),
+        currentTicket: null,
+      });
     } catch (error: any) {
       set({ error: error.message || "Failed to delete ticket" });
       throw error;
@@ -137,4 +160,60 @@ export const useTicketStore = create<TicketStore>((set) => ({
   },
 
   clearError: () => set({ error: null }),
+
+  applyEvent: (event: TicketEvent) => {
+    const { tickets, currentTicket, listQuery } = get();
+    switch (event.type) {
+      case "ticket.created":
+      case "ticket.updated":
+        if (!event.ticket) {
+          // Événement tronqué : relire la liste
+          get().fetchTickets(listQuery.skip, listQuery.limit, listQuery.status);
+          return;
+        }
+        set({ tickets: upsertListItem(tickets, event.ticket, listQuery.status) });
+        if (currentTicket?.id === event.ticket_id) {
+          set({ currentTicket: { ...currentTicket, ...event.ticket } });
+        }
+        return;
+      case "ticket.deleted":
+        set({ tickets: tickets.filter((ticket) => ticket.id !== event.ticket_id) });
+        if (currentTicket?.id === event.ticket_id) {
+          set({ currentTicket: null });
+        }
+        return;
+      case "comment.created":
+        if (currentTicket?.id === event.ticket_id) {
+          apiClient.getComments(event.ticket_id).then((comments) => {
+            const latest = get().currentTicket;
+            if (latest?.id === event.ticket_id) {
+              set({ currentTicket: { ...latest, comments } });
+            }
+          });
+        }
+        return;
+      case "tickets.changed":
+      case "resync":
+        get().fetchTickets(listQuery.skip, listQuery.limit, listQuery.status);
+        return;
+    }
+  },
+
+  connectEvents: () => {
+    const controller = new AbortController();
+    const listen = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          await apiClient.streamTicketEvents(get().applyEvent, controller.signal);
+        } catch (error) {
+          if (controller.signal.aborted) return;
+        }
+        await new Promise((resolve) => setTimeout(resolve, EVENTS_RETRY_DELAY));
+        // Des événements ont pu être manqués pendant la coupure
+        if (!controller.signal.aborted) get().applyEvent({ type: "resync" });
+      }
+    };
+    listen();
+    return () => controller.abort();
+  },
 }));
@@ -27,6 +27,12 @@ export interface User {
   updated_at: string;
 }
 
+export interface UserSummary {
+  id: number;
+  username: string;
+  full_name?: string;
+}
+
 export interface Ticket {
   id: number;
   title: string;
@@ -40,7 +46,10 @@ export interface Ticket {
   resolved_at?: string;
   creator: User;
   assigned_to?: User;
+  // Premiers commentaires seulement ; la suite via getCommentsPage
   comments: Comment[];
+  comment_count: number;
+  comments_next_cursor: string | null;
 }
 
 export interface TicketListItem {
@@ -52,8 +61,58 @@ export interface TicketListItem {
   assigned_to_id?: number;
   created_at: string;
   updated_at: string;
-  creator: User;
-  assigned_to?: User;
+  creator: UserSummary;
+  assigned_to?: UserSummary;
+}
+
+export interface TicketPage {
+  items: TicketListItem[];
+  next_cursor: string | null;
+}
+
+export interface TicketFilters {
+  priority?: TicketPriority;
+  assigned_to_id?: number;
+  unassigned?: boolean;
+  creator_id?: number;
+  created_after?: string;
+  created_before?: string;
+  updated_after?: string;
+  updated_before?: string;
+  sort?: "created_at" | "updated_at" | "priority";
+  order?: "asc" | "desc";
+}
+
+export interface TicketSearchHit {
+  ticket: TicketListItem;
+  rank: number;
+  headline?: string;
+}
+
+export interface TicketSearchPage {
+  items: TicketSearchHit[];
+  next_cursor: string | null;
+}
+
+export interface TicketStats {
+  total: number;
+  by_status: Record<TicketStatus, number>;
+  by_priority: Record<TicketPriority, number>;
+  by_status_priority: Record<TicketStatus, Record<TicketPriority, number>>;
+  open_by_assignee: { assigned_to_id: number | null; count: number }[];
+}
+
+export type TicketEvent =
+  | { type: "ticket.created" | "ticket.updated"; ticket_id: number; ticket?: TicketListItem }
+  | { type: "ticket.deleted"; ticket_id: number }
+  | { type: "comment.created"; ticket_id: number; comment_id: number; author_id: number }
+  | { type: "tickets.changed"; count: number }
+  | { type: "resync" };
+
+export interface BatchResult {
+  succeeded: number;
+  failed: number;
+  results: { index: number; id: number | null; status: number; detail?: unknown }[];
 }
 
 export interface Comment {
@@ -66,6 +125,11 @@ export interface Comment {
   author: User;
 }
 
+export interface CommentPage {
+  items: Comment[];
+  next_cursor: string | null;
+}
+
 export interface LoginRequest {
   email: string;
   password: string;